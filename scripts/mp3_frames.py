@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+"""Run video_creator.mp3_frames (this path is kept so existing commands keep working)."""
+
+from video_creator.mp3_frames import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""
+Helper scripts of the video-creator plugin, as one importable package.
+
+Command line (only the selected command's module is imported):
+
+    python -m video_creator prepare <project_folder> [...]  # images_batch.json / audios_batch.json
+    python -m video_creator srt <project_folder> [...]      # subtitles.srt
+    python -m video_creator verify <project_folder> [...]   # image check / missing_images.json
+
+Every other tool runs as python -m video_creator.<module>; the scripts/<module>.py
+wrappers keep the old paths working.
+
+In process, call the functions directly and use their return values
+instead of parsing printed output:
+
+    from video_creator.prepare_batch_data import prepare_batch_data, save_batch_data
+    from video_creator.generate_srt import generate_srt
+    from video_creator.verify_images import verify_images
+
+    result = prepare_batch_data(project_folder)   # dict: images_batch, audios_batch, stats, warnings
+    srt_path, entries, splits = generate_srt(project_folder)
+    report = verify_images(project_folder)        # dict: expected_count, actual_count, missing, ...
+
+Optional dependencies (mutagen, NumPy, Pillow) are imported only by the
+code paths that need them.
+"""
+
+__version__ = '1.0.3'
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Single command line entry point: python -m video_creator <command> [args].
+
+Commands:
+    prepare  Prepare images_batch.json / audios_batch.json (prepare_batch_data.py)
+    srt      Generate subtitles.srt (generate_srt.py)
+    verify   Verify images and write missing_images.json (verify_images.py)
+    worker   Serve the commands above as JSON-RPC lines over stdio (worker.py)
+
+Arguments after the command are the same as the corresponding script's.
+Only the selected command's module (and what it needs) is imported, so
+startup stays fast.
+
+Usage:
+    python -m video_creator <command> [args]
+    python -m video_creator <command> --help
+
+Example:
+    python -m video_creator prepare ./my_project --stream
+    python -m video_creator srt ./my_project --max-words 10
+    python -m video_creator verify ./my_project --deep
+    python -m video_creator worker  # keeps project state warm between requests
+"""
+
+import importlib
+import sys
+
+from . import __version__
+
+PROG = 'python -m video_creator'
+
+# Command -> (module, summary)
+COMMANDS = {
+    'prepare': ('prepare_batch_data', 'Prepare images_batch.json / audios_batch.json'),
+    'srt': ('generate_srt', 'Generate subtitles.srt with smart splitting'),
+    'verify': ('verify_images', 'Verify images and write missing_images.json'),
+    'worker': ('worker', 'Serve verify/prepare/srt as JSON-RPC lines on stdin/stdout'),
+}
+
+
+def print_usage(file=None):
+    print(f"Usage: {PROG} <command> [args]", file=file)
+    print(file=file)
+    print("Commands:", file=file)
+    for command, (_, summary) in COMMANDS.items():
+        print(f"  {command:<8} {summary}", file=file)
+    print(file=file)
+    print(f"Run '{PROG} <command> --help' for the command's options.", file=file)
+
+
+def main(argv: list[str] = None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        sys.exit(0 if argv else 1)
+    if argv[0] == '--version':
+        print(f"video_creator {__version__}")
+        return
+
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"Error: Unknown command: {command} (choose from {', '.join(COMMANDS)})")
+        sys.exit(1)
+
+    module = importlib.import_module(f".{COMMANDS[command][0]}", __package__)
+    module.main(argv[1:], prog=f"{PROG} {command}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Content-addressed asset cache shared across projects.
+
+Channel projects keep regenerating the same intro/outro lines and recurring
+prompts. Generated files are stored once in a shared cache directory, keyed
+by a hash of everything that determines their content:
+
+- audio:  (text, voice_id, speed, format)
+- images: (prompt, model, resolution, image slot)
+
+A cache hit is reflinked (copy-on-write clone, where the filesystem supports
+it) or copied into the project's audio_XXX.mp3 / image_XXX_YY.png slot, so a
+hit costs no API call. Hardlinking saves the copy but is opt-in (hardlink=True,
+--cache-hardlink): the project file then shares the cached object, and any
+tool or user that rewrites it in place changes it for every project. To catch
+that, each hit first compares the object's size and mtime with the index; a
+changed object is evicted and the lookup counts as a miss.
+
+The cache is bounded by size: when it grows past max_bytes, the least
+recently used objects are evicted. Hit/miss/eviction counters are kept in
+the index so they can be inspected across runs.
+
+Several runs (in different projects) may use the cache at once. Each run
+records what it stored, used and evicted; save() takes an exclusive lock on
+index.lock, re-reads index.json, merges those changes into it, evicts down
+to max_bytes over the merged index and only then replaces the file, so no
+run's entries or counters are lost.
+
+Layout:
+    <cache_dir>/index.json              {version, entries, stats}; an entry is
+                                        {ext, size, mtime_ns, last_used}
+    <cache_dir>/index.lock              held while index.json is rewritten
+    <cache_dir>/objects/ab/abcdef....mp3
+
+The cache directory defaults to $VIDEO_CREATOR_CACHE, or
+~/.cache/video-creator/assets.
+
+Usage:
+    python asset_cache.py stats [--cache-dir DIR]
+    python asset_cache.py prune --max-size 2G [--cache-dir DIR]
+    python asset_cache.py clear [--cache-dir DIR]
+"""
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialized between processes
+    fcntl = None
+
+CACHE_VERSION = 1
+INDEX_FILENAME = 'index.json'
+LOCK_FILENAME = 'index.lock'
+DEFAULT_MAX_BYTES = 5 * 1024 ** 3
+
+# Linux ioctl that clones file extents (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+
+def default_cache_dir() -> str:
+    """Cache directory from $VIDEO_CREATOR_CACHE or ~/.cache/video-creator/assets."""
+    return os.environ.get('VIDEO_CREATOR_CACHE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'video-creator', 'assets'
+    )
+
+
+def _hash_key(kind: str, fields: dict) -> str:
+    encoded = json.dumps([kind, fields], ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def audio_key(text: str, voice_id: str, speed: float, audio_format: str) -> str:
+    """Cache key of a TTS clip."""
+    return _hash_key('audio', {
+        'text': text, 'voice_id': voice_id, 'speed': float(speed), 'format': audio_format
+    })
+
+
+def image_key(prompt: str, model: str, resolution: str, slot: int, image_count: int) -> str:
+    """
+    Cache key of one generated image.
+
+    Args:
+        prompt: Scene prompt
+        model: Image model
+        resolution: Image resolution, e.g. 2048x2048
+        slot: 1-based image position within the scene
+        image_count: Images generated for the prompt
+    """
+    return _hash_key('image', {
+        'prompt': prompt, 'model': model, 'resolution': resolution,
+        'slot': slot, 'image_count': image_count
+    })
+
+
+def parse_size(value: str) -> int:
+    """Parse a size such as 500M or 2G into bytes."""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    value = value.strip().upper().rstrip('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def link_or_copy(src: str, dst: str, hardlink: bool = False) -> str:
+    """
+    Place src at dst without duplicating data where possible (atomic replace).
+
+    Tries a reflink (FICLONE), then a plain copy; with hardlink, a hardlink
+    first (dst then shares src's data, including later in-place writes).
+
+    Returns:
+        'hardlink', 'reflink' or 'copy'
+    """
+    tmp_path = f"{dst}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        method = None
+        if hardlink:
+            try:
+                os.link(src, tmp_path)
+                method = 'hardlink'
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                    raise
+        if method is None:
+            method = _clone_or_copy(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return method
+
+
+def _clone_or_copy(src: str, dst: str) -> str:
+    try:
+        import fcntl
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return 'reflink'
+    except (ImportError, OSError):
+        shutil.copyfile(src, dst)
+        return 'copy'
+
+
+class AssetCache:
+    """
+    Shared content-addressed store for generated audio and images.
+
+    Usage:
+        cache = AssetCache()
+        if not cache.fetch(key, project_path):
+            data = generate(...)
+            cache.store(key, data, '.mp3')
+        cache.save()
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 hardlink: bool = False):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.objects_dir = os.path.join(self.cache_dir, 'objects')
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+        self.lock_path = os.path.join(self.cache_dir, LOCK_FILENAME)
+        self.max_bytes = max_bytes
+        self.hardlink = hardlink
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self.entries, stats = self._read_index()
+        self.stats.update(stats)
+        self._reset_changes()
+
+    def _read_index(self) -> tuple[dict, dict]:
+        """(entries, stats) from index.json; empty if missing or unreadable."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+            return data.get('entries', {}), data.get('stats', {})
+        return {}, {}
+
+    def _reset_changes(self):
+        """Forget this run's changes (after they have been saved)."""
+        self._touched = {}      # key -> entry stored or used by this run
+        self._removed = set()   # keys evicted (or found missing) by this run
+        self._counts = {key: 0 for key in self.stats}
+        self._cleared = False
+        self._dirty = False
+
+    def _count(self, name: str, n: int = 1):
+        self.stats[name] += n
+        self._counts[name] += n
+        self._dirty = True
+
+    def _lock(self):
+        """Exclusive lock on index.lock (released when the file is closed)."""
+        f = open(self.lock_path, 'a')
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return f
+
+    def object_path(self, key: str, ext: str) -> str:
+        return os.path.join(self.objects_dir, key[:2], key + ext)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        """
+        Link a cached object into a project slot.
+
+        Args:
+            key: Cache key from audio_key() / image_key()
+            dest_path: Project file to create or replace
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            path = self.object_path(key, entry['ext'])
+            try:
+                stat = os.stat(path)
+                if stat.st_size != entry['size'] or stat.st_mtime_ns != entry.get('mtime_ns', stat.st_mtime_ns):
+                    # Rewritten in place through a hardlinked project file
+                    os.remove(path)
+                    raise FileNotFoundError(path)
+                link_or_copy(path, dest_path, self.hardlink)
+            except FileNotFoundError:
+                # Object changed or removed behind our back (e.g. another process evicted it)
+                del self.entries[key]
+                self._touched.pop(key, None)
+                self._removed.add(key)
+                entry = None
+
+        if entry is None:
+            self._count('misses')
+            return False
+
+        entry['last_used'] = time.time()
+        self._touched[key] = entry
+        self._count('hits')
+        return True
+
+    def store(self, key: str, data: bytes, ext: str):
+        """
+        Add a generated file to the cache, evicting old objects if needed.
+
+        Args:
+            key: Cache key from audio_key() / image_key()
+            data: File contents
+            ext: File extension including the dot, e.g. '.mp3'
+        """
+        if len(data) > self.max_bytes:
+            return
+
+        path = self.object_path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self.entries[key] = self._touched[key] = {
+            'ext': ext, 'size': len(data), 'mtime_ns': os.stat(path).st_mtime_ns, 'last_used': time.time()
+        }
+        self._removed.discard(key)
+        self._count('stores')
+        self.evict()
+
+    def evict(self, max_bytes: int = None) -> int:
+        """
+        Remove least recently used objects until the cache fits max_bytes.
+
+        Returns:
+            Number of evicted objects
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total = self.total_bytes
+        evicted = 0
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(self.object_path(key, entry['ext']))
+            except FileNotFoundError:
+                pass
+            del self.entries[key]
+            self._touched.pop(key, None)
+            self._removed.add(key)
+            total -= entry['size']
+            evicted += 1
+
+        if evicted:
+            self._count('evictions', evicted)
+        return evicted
+
+    def clear(self):
+        """Remove every cached object and reset the statistics."""
+        shutil.rmtree(self.objects_dir, ignore_errors=True)
+        self.entries = {}
+        self.stats = {key: 0 for key in self.stats}
+        self._reset_changes()
+        self._cleared = True
+        self._dirty = True
+
+    def _merge(self, entries: dict, stats: dict) -> tuple[dict, dict]:
+        """Apply this run's changes to the index as another run left it."""
+        if self._cleared:
+            entries, stats = {}, {}
+        for key in self._removed:
+            entries.pop(key, None)
+        for key, entry in self._touched.items():
+            current = entries.get(key)
+            if current is not None:
+                current['last_used'] = max(current.get('last_used', 0), entry['last_used'])
+                # Both runs stored the object: keep the mtime of the last write
+                if current.get('mtime_ns') != entry.get('mtime_ns'):
+                    try:
+                        mtime_ns = os.stat(self.object_path(key, entry['ext'])).st_mtime_ns
+                    except FileNotFoundError:
+                        mtime_ns = None
+                    if mtime_ns == entry.get('mtime_ns'):
+                        current['mtime_ns'] = mtime_ns
+            elif os.path.exists(self.object_path(key, entry['ext'])):
+                # Not evicted by another run in the meantime
+                entries[key] = entry
+        merged_stats = {key: stats.get(key, 0) + self._counts[key] for key in self.stats}
+        return entries, merged_stats
+
+    def save(self):
+        """
+        Merge this run's changes into index.json and evict down to max_bytes.
+
+        The index is re-read and replaced (atomically) under an exclusive
+        lock, so runs in other projects that share the cache keep their
+        entries and counters.
+        """
+        if not self._dirty:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._lock():
+            self.entries, self.stats = self._merge(*self._read_index())
+            self._reset_changes()
+            # Other runs' stores count towards the limit too
+            self.evict()
+
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self.entries, 'stats': self.stats}, f)
+            os.replace(tmp_path, self.index_path)
+            self._reset_changes()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Inspect or prune the shared audio/image asset cache.'
+    )
+    parser.add_argument('action', choices=['stats', 'prune', 'clear'])
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help='Cache directory (default: $VIDEO_CREATOR_CACHE or ~/.cache/video-creator/assets)'
+    )
+    parser.add_argument(
+        '--max-size',
+        type=parse_size,
+        default=DEFAULT_MAX_BYTES,
+        help='Size limit for prune, e.g. 500M or 2G (default: 5G)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        cache = AssetCache(args.cache_dir, args.max_size)
+
+        if args.action == 'prune':
+            print(f"Evicted {cache.evict()} object(s)")
+        elif args.action == 'clear':
+            cache.clear()
+            print("Cache cleared")
+
+        cache.save()
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    stats = cache.stats
+    lookups = stats['hits'] + stats['misses']
+    hit_rate = f"{stats['hits'] / lookups:.1%}" if lookups else 'n/a'
+    print(f"Cache directory: {cache.cache_dir}")
+    print(f"Objects: {len(cache.entries)} ({cache.total_bytes / 1024 ** 2:.1f} MB "
+          f"of {cache.max_bytes / 1024 ** 2:.0f} MB)")
+    print(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {hit_rate}")
+    print(f"Stores: {stats['stores']}  Evictions: {stats['evictions']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Shared audio duration probing with a persistent per-project cache.
+
+Both prepare_batch_data.py and generate_srt.py need the exact duration of
+every audio file. Probing is the slowest part of a draft build, so results
+are kept in a sidecar index (<project_folder>/.audio_durations.json) keyed by
+the file's path relative to the project folder. Each record stores the file
+size and mtime it was probed at; a record is reused only while both still
+match, so regenerated audio files are re-probed automatically.
+
+probe_durations() resolves a whole list of files up front on a thread pool,
+which hides per-file I/O latency on network-mounted project folders.
+
+MP3 files are read with the built-in frame-header reader (mp3_frames.py).
+mutagen is only imported for other formats, or MP3s the reader can't parse.
+
+Requirements:
+    pip install mutagen  (optional, only needed for non-MP3 audio)
+"""
+
+import itertools
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .mp3_frames import read_mp3_duration
+from .profiling import span
+
+CACHE_FILENAME = '.audio_durations.json'
+CACHE_VERSION = 1
+DEFAULT_WORKERS = 8
+DEFAULT_WINDOW = 256
+
+
+def probe_audio_duration(audio_path: str) -> float:
+    """
+    Read audio duration in seconds directly from the file.
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Duration in seconds
+    """
+    ext = Path(audio_path).suffix.lower()
+
+    if ext == '.mp3':
+        with span('read_mp3_frames', 'file', file=os.path.basename(audio_path)):
+            duration = read_mp3_duration(audio_path)
+        if duration is not None:
+            return duration
+
+    with span('probe_mutagen', 'file', file=os.path.basename(audio_path)):
+        return probe_with_mutagen(audio_path)
+
+
+def probe_with_mutagen(audio_path: str) -> float:
+    """
+    Read audio duration in seconds using mutagen (imported on first use).
+
+    Args:
+        audio_path: Path to the audio file
+
+    Returns:
+        Duration in seconds
+    """
+    try:
+        from mutagen import File
+    except ImportError:
+        raise ImportError(
+            f"mutagen library is required to read {os.path.basename(audio_path)}. "
+            "Install with: pip install mutagen"
+        )
+
+    audio = File(audio_path)
+    if audio is None:
+        raise ValueError(f"Unsupported audio format: {Path(audio_path).suffix.lower()}")
+
+    return audio.info.length
+
+
+class DurationCache:
+    """
+    Sidecar duration index for one project folder.
+
+    Usage:
+        cache = DurationCache(project_folder)
+        seconds = cache.get_duration(audio_path)
+        cache.save()
+    """
+
+    def __init__(self, project_folder: str):
+        self.project_folder = os.path.abspath(project_folder)
+        self.cache_path = os.path.join(self.project_folder, CACHE_FILENAME)
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Load the sidecar index, ignoring missing or unreadable files."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+            self.entries = data.get('entries', {})
+
+    def _key(self, audio_path: str) -> str:
+        """Cache key: path relative to the project folder when possible."""
+        abs_path = os.path.abspath(audio_path)
+        try:
+            return os.path.relpath(abs_path, self.project_folder)
+        except ValueError:
+            # Different drive on Windows
+            return abs_path
+
+    def lookup(self, audio_path: str, stat: os.stat_result = None) -> float:
+        """
+        Return the cached duration for a file, or None if absent or stale.
+
+        Args:
+            audio_path: Path to the audio file
+            stat: Optional pre-computed os.stat() result for the file
+
+        Returns:
+            Duration in seconds, or None on a cache miss
+        """
+        if stat is None:
+            stat = os.stat(audio_path)
+        entry = self.entries.get(self._key(audio_path))
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['duration']
+        return None
+
+    def store(self, audio_path: str, duration: float, stat: os.stat_result = None):
+        """Record a freshly probed duration for a file."""
+        if stat is None:
+            stat = os.stat(audio_path)
+        self.entries[self._key(audio_path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'duration': duration
+        }
+        self._dirty = True
+
+    def get_duration(self, audio_path: str) -> float:
+        """
+        Get audio duration in seconds, probing the file only on a cache miss.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            Duration in seconds
+        """
+        stat = os.stat(audio_path)
+        duration = self.lookup(audio_path, stat)
+        if duration is not None:
+            self.hits += 1
+            return duration
+
+        self.misses += 1
+        duration = probe_audio_duration(audio_path)
+        self.store(audio_path, duration, stat)
+        return duration
+
+    def save(self):
+        """Write the index back to disk if anything changed (atomic replace)."""
+        if not self._dirty:
+            return
+
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # A read-only project folder must not break the build
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._dirty = False
+
+
+def probe_durations(audio_paths: list[str], cache: DurationCache = None,
+                    workers: int = DEFAULT_WORKERS,
+                    stats: list[os.stat_result] = None) -> list[float]:
+    """
+    Resolve durations for many audio files concurrently.
+
+    Cache lookups and probes run on a thread pool; the cache itself is only
+    updated from the calling thread. Results keep the order of audio_paths.
+
+    Args:
+        audio_paths: Audio file paths, in timeline order
+        cache: Optional project duration cache to read from and update
+        workers: Maximum number of concurrent probes (1 = sequential)
+        stats: Optional os.stat() results aligned with audio_paths (e.g. from
+            a ProjectIndex scan), so files are not stat'ed a second time
+
+    Returns:
+        List of durations in seconds, aligned with audio_paths
+    """
+    known_stats = dict(zip(audio_paths, stats)) if stats is not None else {}
+
+    def resolve(audio_path):
+        stat = known_stats.get(audio_path) or os.stat(audio_path)
+        if cache is not None:
+            duration = cache.lookup(audio_path, stat)
+            if duration is not None:
+                return duration, stat, True
+        return probe_audio_duration(audio_path), stat, False
+
+    with span('probe_durations', files=len(audio_paths)):
+        if workers <= 1 or len(audio_paths) <= 1:
+            results = map(resolve, audio_paths)
+            return _collect(audio_paths, results, cache)
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return _collect(audio_paths, executor.map(resolve, audio_paths), cache)
+
+
+def _collect(audio_paths, results, cache) -> list[float]:
+    """Gather ordered probe results and record misses in the cache."""
+    durations = []
+    for audio_path, (duration, stat, hit) in zip(audio_paths, results):
+        if cache is not None:
+            if hit:
+                cache.hits += 1
+            else:
+                cache.misses += 1
+                cache.store(audio_path, duration, stat)
+        durations.append(duration)
+    return durations
+
+
+def resolve_durations(project_folder: str, audio_entries: list, use_cache: bool = True,
+                      workers: int = DEFAULT_WORKERS, cache: DurationCache = None) -> list[float]:
+    """
+    Resolve durations (seconds) for scene audio files, in order.
+
+    Args:
+        project_folder: Path to the project folder (location of the duration cache)
+        audio_entries: Scene audio FileEntry objects from a project_index scan
+        use_cache: Read/write the project's audio duration cache (default: True)
+        workers: Concurrent audio duration probes (default: 8)
+        cache: Optional already loaded duration cache (e.g. kept by worker.py);
+            used instead of loading the sidecar file, and saved afterwards
+
+    Returns:
+        List of durations aligned with audio_entries
+    """
+    if cache is None and use_cache:
+        with span('load_duration_cache'):
+            cache = DurationCache(project_folder)
+    durations = probe_durations(
+        [entry.path for entry in audio_entries], cache, workers,
+        stats=[entry.stat for entry in audio_entries]
+    )
+    if cache is not None:
+        with span('save_duration_cache'):
+            cache.save()
+    return durations
+
+
+def iter_durations(audio_entries: Iterable, cache: DurationCache = None,
+                   workers: int = DEFAULT_WORKERS, window: int = DEFAULT_WINDOW) -> Iterator[float]:
+    """
+    Lazily resolve durations in fixed-size windows (bounded-memory mode).
+
+    Each window of files is probed concurrently with probe_durations(); the
+    next window is only probed once the consumer has used up the current one.
+
+    Args:
+        audio_entries: Scene audio FileEntry objects, in timeline order
+        cache: Optional project duration cache to read from and update
+        workers: Maximum number of concurrent probes
+        window: Files probed per batch
+
+    Yields:
+        Durations in seconds, aligned with audio_entries
+    """
+    entries = iter(audio_entries)
+    while True:
+        batch = list(itertools.islice(entries, window))
+        if not batch:
+            return
+        yield from probe_durations(
+            [entry.path for entry in batch], cache, workers,
+            stats=[entry.stat for entry in batch]
+        )
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Split images_batch.json / audios_batch.json into size-bounded pages.
+
+A single add_image_batch call with hundreds of entries can time out, and a
+failure means resending everything. Pages hold at most --max-items entries
+and at most --max-bytes of compact JSON (a single larger entry gets a page
+of its own), and are written to <output_dir>/batch_pages/:
+
+    images_batch.001.json, images_batch.002.json, ..., audios_batch.001.json, ...
+
+batch_pages.json records, for every page in sending order (image pages
+first, then audio pages), its file, the item range [start, end) in the
+full batch file, its size, a SHA-256 of its bytes and whether it has been
+added to the draft. Send pages in order and mark each one with --done; after
+a failure, --next names the first page still to send. Regenerating the
+pages keeps the completed mark of every page whose range and checksum are
+unchanged.
+
+Usage:
+    python batch_pages.py <output_dir> [--max-items 100] [--max-bytes 262144]
+    python batch_pages.py <output_dir> --next
+    python batch_pages.py <output_dir> --done images_batch.001.json
+    python batch_pages.py <output_dir> --reset
+
+Example:
+    python prepare_batch_data.py ./my_project --pages  # writes the pages too
+    python batch_pages.py ./my_project --max-items 50
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Iterable, Iterator
+
+from .json_stream import iter_json_array
+
+PAGES_FOLDER = 'batch_pages'
+MANIFEST_FILENAME = 'batch_pages.json'
+MANIFEST_VERSION = 1
+DEFAULT_MAX_ITEMS = 100
+DEFAULT_MAX_BYTES = 256 * 1024
+
+# Sending order and source file of each batch kind
+BATCH_FILES = (
+    ('images', 'images_batch.json'),
+    ('audios', 'audios_batch.json'),
+)
+
+
+def iter_pages(items: Iterable, max_items: int = DEFAULT_MAX_ITEMS,
+               max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[tuple[int, list[str]]]:
+    """
+    Group items into pages bounded by count and serialized size.
+
+    Args:
+        items: Batch entries (any iterable, consumed lazily)
+        max_items: Maximum entries per page
+        max_bytes: Maximum bytes of a page's compact JSON array
+
+    Yields:
+        (start, encoded_items): index of the page's first item and the
+        compact JSON encoding of each of its items
+    """
+    page = []
+    size = 2  # '[' and ']'
+    start = 0
+    for index, item in enumerate(items):
+        encoded = json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+        item_size = len(encoded.encode('utf-8')) + (1 if page else 0)
+        if page and (len(page) >= max_items or size + item_size > max_bytes):
+            yield start, page
+            page, size, start = [], 2, index
+            item_size -= 1
+        page.append(encoded)
+        size += item_size
+    if page:
+        yield start, page
+
+
+def write_page(path: str, encoded_items: list[str]) -> tuple[int, str]:
+    """
+    Write one page as a compact JSON array (atomic replace).
+
+    Returns:
+        Tuple of (size in bytes, SHA-256 hex digest of the written bytes)
+    """
+    data = ('[' + ','.join(encoded_items) + ']').encode('utf-8')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(output_dir: str) -> dict:
+    """Load batch_pages.json, or None if missing, unreadable or of another version."""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if isinstance(manifest, dict) and manifest.get('version') == MANIFEST_VERSION:
+        return manifest
+    return None
+
+
+def save_manifest(output_dir: str, manifest: dict) -> str:
+    """Write batch_pages.json (atomic replace) and return its path."""
+    path = os.path.join(output_dir, MANIFEST_FILENAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_batch_pages(output_dir: str, batches: dict = None, max_items: int = DEFAULT_MAX_ITEMS,
+                      max_bytes: int = DEFAULT_MAX_BYTES) -> dict:
+    """
+    Page the batch data and write the pages and batch_pages.json.
+
+    Args:
+        output_dir: Folder holding images_batch.json / audios_batch.json
+        batches: Optional {'images': entries, 'audios': entries}; missing
+            kinds are read incrementally from the batch files in output_dir
+        max_items: Maximum entries per page
+        max_bytes: Maximum bytes per page
+
+    Returns:
+        The manifest dict
+    """
+    if max_items < 1 or max_bytes < 1:
+        raise ValueError("Page limits must be positive")
+
+    pages_dir = os.path.join(output_dir, PAGES_FOLDER)
+    os.makedirs(pages_dir, exist_ok=True)
+
+    previous = load_manifest(output_dir) or {'pages': []}
+    completed = {
+        (page['file'], page['start'], page['end'], page['sha256'])
+        for page in previous['pages'] if page.get('completed')
+    }
+
+    pages = []
+    for kind, filename in BATCH_FILES:
+        items = (batches or {}).get(kind)
+        if items is None:
+            batch_path = os.path.join(output_dir, filename)
+            if not os.path.exists(batch_path):
+                continue
+            items = iter_json_array(batch_path)
+
+        base = os.path.splitext(filename)[0]
+        for number, (start, encoded_items) in enumerate(iter_pages(items, max_items, max_bytes), 1):
+            page_file = f"{base}.{number:03d}.json"
+            size, sha256 = write_page(os.path.join(pages_dir, page_file), encoded_items)
+            end = start + len(encoded_items)
+            pages.append({
+                'file': page_file,
+                'kind': kind,
+                'source': filename,
+                'start': start,
+                'end': end,
+                'items': len(encoded_items),
+                'bytes': size,
+                'sha256': sha256,
+                'completed': (page_file, start, end, sha256) in completed
+            })
+
+    # Remove pages left over from a longer previous run
+    current = {page['file'] for page in pages}
+    with os.scandir(pages_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.json') and entry.name not in current:
+                os.remove(entry.path)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'max_items': max_items,
+        'max_bytes': max_bytes,
+        'pages': pages
+    }
+    save_manifest(output_dir, manifest)
+    return manifest
+
+
+def page_checksum(output_dir: str, page: dict) -> str:
+    """SHA-256 of a page file as it is on disk now (None if missing)."""
+    try:
+        with open(os.path.join(output_dir, PAGES_FOLDER, page['file']), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def next_page(manifest: dict) -> dict:
+    """The first page not yet added to the draft, or None when all are done."""
+    return next((page for page in manifest['pages'] if not page['completed']), None)
+
+
+def mark_completed(output_dir: str, page_file: str) -> dict:
+    """
+    Mark a page as added to the draft.
+
+    Raises:
+        ValueError: If the page is unknown or its file no longer matches
+            the manifest checksum (the pages were regenerated or edited)
+    """
+    manifest = load_manifest(output_dir)
+    if manifest is None:
+        raise ValueError(f"No {MANIFEST_FILENAME} in: {output_dir}")
+    page_file = os.path.basename(page_file)
+    page = next((page for page in manifest['pages'] if page['file'] == page_file), None)
+    if page is None:
+        raise ValueError(f"Unknown page: {page_file}")
+    if page_checksum(output_dir, page) != page['sha256']:
+        raise ValueError(f"Checksum mismatch for {page_file}; regenerate the pages")
+    page['completed'] = True
+    save_manifest(output_dir, manifest)
+    return page
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Split images_batch.json / audios_batch.json into size-bounded pages with a resumable manifest.'
+    )
+    parser.add_argument(
+        'output_dir',
+        help='Folder holding images_batch.json / audios_batch.json (usually the project folder)'
+    )
+    parser.add_argument(
+        '--max-items',
+        type=int,
+        default=DEFAULT_MAX_ITEMS,
+        help=f'Maximum entries per page (default: {DEFAULT_MAX_ITEMS})'
+    )
+    parser.add_argument(
+        '--max-bytes',
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help=f'Maximum bytes of JSON per page (default: {DEFAULT_MAX_BYTES})'
+    )
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        '--next',
+        action='store_true',
+        help='Print the first page not yet marked as added (after a failure: where to resume)'
+    )
+    action.add_argument(
+        '--done',
+        metavar='PAGE',
+        default=None,
+        help='Mark a page as added to the draft (checks its checksum first)'
+    )
+    action.add_argument(
+        '--reset',
+        action='store_true',
+        help='Clear all completed marks (for a new draft)'
+    )
+
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.output_dir):
+        print(f"Error: Folder not found: {args.output_dir}")
+        sys.exit(1)
+
+    try:
+        if args.done:
+            page = mark_completed(args.output_dir, args.done)
+            print(f"Completed: {page['file']} (items {page['start']}-{page['end'] - 1})")
+            manifest = load_manifest(args.output_dir)
+        elif args.next or args.reset:
+            manifest = load_manifest(args.output_dir)
+            if manifest is None:
+                raise ValueError(f"No {MANIFEST_FILENAME} in: {args.output_dir}")
+            if args.reset:
+                for page in manifest['pages']:
+                    page['completed'] = False
+                save_manifest(args.output_dir, manifest)
+                print(f"Reset {len(manifest['pages'])} page(s)")
+        else:
+            manifest = write_batch_pages(args.output_dir, max_items=args.max_items, max_bytes=args.max_bytes)
+            print(f"Pages: {len(manifest['pages'])} (max {args.max_items} items / {args.max_bytes} bytes)")
+            for page in manifest['pages']:
+                status = 'done' if page['completed'] else 'todo'
+                print(f"  [{status}] {page['file']}: items {page['start']}-{page['end'] - 1}, {page['bytes']} bytes")
+            print()
+            print(f"Manifest saved: {os.path.join(args.output_dir, MANIFEST_FILENAME)}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    page = next_page(manifest)
+    if args.next or args.done:
+        if page is None:
+            print("All pages completed")
+        else:
+            print(f"Next page: {os.path.join(os.path.abspath(args.output_dir), PAGES_FOLDER, page['file'])} "
+                  f"({page['kind']}, items {page['start']}-{page['end'] - 1})")
+
+
+if __name__ == '__main__':
+    main()
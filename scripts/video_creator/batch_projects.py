@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Run the preparation, SRT and verification scripts over many projects.
+
+Takes a root directory (every sub-folder with a script_output.json is a
+project; the root itself if it has one) or a glob pattern, and processes
+the projects on a process pool with a bounded number of workers. Each
+project runs in isolation: an error is recorded for that project and the
+others carry on.
+
+Tasks per project (--tasks, default all three, in this order):
+
+- prepare: images_batch.json / audios_batch.json (prepare_batch_data.py)
+- srt:     subtitles.srt (generate_srt.py)
+- verify:  image check and missing_images.json (verify_images.py)
+
+At the end one aggregate report lists every project with its scene,
+image and audio totals, missing assets, timeline duration and run time.
+The exit status is 1 if any project failed or has missing assets.
+
+Usage:
+    python batch_projects.py <root_or_glob> [--tasks prepare,srt,verify] [--jobs N]
+
+Example:
+    python batch_projects.py ~/channels
+    python batch_projects.py "~/channels/*/episode_*" --jobs 8
+    python batch_projects.py ~/channels --tasks verify --deep --json
+"""
+
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TASKS = ('prepare', 'srt', 'verify')
+DEFAULT_JOBS = min(4, os.cpu_count() or 1)
+# Duration probes / image checks per project (each project has its own pool)
+DEFAULT_PROJECT_WORKERS = 4
+
+
+def find_projects(root_or_glob: str) -> list[str]:
+    """
+    Resolve a root directory or glob pattern to project folders.
+
+    Args:
+        root_or_glob: Directory containing project folders (or a project
+            folder itself), or a glob pattern matching project folders
+
+    Returns:
+        Sorted absolute paths of folders containing script_output.json
+    """
+    pattern = os.path.expanduser(root_or_glob)
+
+    if os.path.isdir(pattern):
+        if os.path.isfile(os.path.join(pattern, 'script_output.json')):
+            return [os.path.abspath(pattern)]
+        with os.scandir(pattern) as it:
+            candidates = [entry.path for entry in it if entry.is_dir()]
+    else:
+        candidates = glob.glob(pattern)
+
+    return sorted(
+        os.path.abspath(path) for path in candidates
+        if os.path.isfile(os.path.join(path, 'script_output.json'))
+    )
+
+
+def run_project(project_folder: str, tasks: tuple = TASKS, max_words: int = 12,
+                deep: bool = False, write_missing: bool = True, use_cache: bool = True,
+                workers: int = DEFAULT_PROJECT_WORKERS) -> dict:
+    """
+    Run the selected tasks on one project (called in a worker process).
+
+    Script output (progress lines, split notices) is captured so parallel
+    projects don't interleave on the terminal.
+
+    Args:
+        project_folder: Path to the project folder
+        tasks: Tasks to run, see TASKS
+        max_words: Maximum words per subtitle segment
+        deep: Validate image structure in the verify task
+        write_missing: Write missing_images.json when images are missing
+        use_cache: Read/write the project's duration and integrity caches
+        workers: Concurrent probes / checks within the project
+
+    Returns:
+        Summary dict: project, ok, error, elapsed_seconds, scenes, images,
+        expected_images, missing_images, corrupt_images, audios,
+        missing_audio, duration_seconds, srt_entries, warnings, outputs
+    """
+    from .generate_srt import generate_srt
+    from .prepare_batch_data import prepare_batch_data, save_batch_data
+    from .verify_images import save_missing_json, verify_images
+
+    summary = {
+        'project': project_folder,
+        'ok': True,
+        'error': None,
+        'elapsed_seconds': 0,
+        'scenes': None,
+        'images': None,
+        'expected_images': None,
+        'missing_images': None,
+        'corrupt_images': None,
+        'audios': None,
+        'missing_audio': None,
+        'duration_seconds': None,
+        'srt_entries': None,
+        'warnings': 0,
+        'outputs': []
+    }
+    start = time.perf_counter()
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if 'prepare' in tasks:
+                result = prepare_batch_data(project_folder, use_cache=use_cache, workers=workers)
+                summary['outputs'].extend(save_batch_data(result, project_folder))
+                stats = result['stats']
+                summary.update({
+                    'scenes': stats['total_scenes'],
+                    'images': stats['total_images'],
+                    'audios': stats['total_audios'],
+                    'missing_audio': stats['total_scenes'] - stats['total_audios'],
+                    'duration_seconds': stats['total_duration_seconds'],
+                    'warnings': len(result['warnings'])
+                })
+
+            if 'srt' in tasks:
+                srt_path, total_entries, _ = generate_srt(
+                    project_folder, max_words, use_cache=use_cache, workers=workers
+                )
+                summary['outputs'].append(srt_path)
+                summary['srt_entries'] = total_entries
+
+            if 'verify' in tasks:
+                result = verify_images(project_folder, deep=deep, workers=workers, use_cache=use_cache)
+                summary.update({
+                    'images': result['actual_count'],
+                    'expected_images': result['expected_count'],
+                    'missing_images': result['expected_count'] - result['actual_count'],
+                    'corrupt_images': result['corrupt_count']
+                })
+                if not result['all_complete'] and write_missing:
+                    summary['outputs'].append(save_missing_json(result, project_folder))
+    except Exception as e:
+        summary['ok'] = False
+        summary['error'] = f"{type(e).__name__}: {e}"
+
+    summary['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def run_batch(projects: list[str], jobs: int = DEFAULT_JOBS, on_done=None, **options) -> list[dict]:
+    """
+    Process projects on a process pool, isolating failures per project.
+
+    Args:
+        projects: Project folders
+        jobs: Maximum worker processes
+        on_done: Optional callback(summary) called as each project finishes
+        **options: Passed to run_project()
+
+    Returns:
+        Summaries in the order of projects
+    """
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {
+            executor.submit(run_project, project, **options): project
+            for project in projects
+        }
+        for future in as_completed(futures):
+            project = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed or out of memory)
+                summary = {'project': project, 'ok': False, 'error': f"{type(e).__name__}: {e}",
+                           'elapsed_seconds': None, 'outputs': []}
+            summaries[project] = summary
+            if on_done is not None:
+                on_done(summary)
+
+    return [summaries[project] for project in projects]
+
+
+def aggregate(summaries: list[dict]) -> dict:
+    """Totals over all project summaries (missing values count as 0)."""
+    def total(key):
+        return sum(summary.get(key) or 0 for summary in summaries)
+
+    return {
+        'projects': len(summaries),
+        'failed': sum(1 for summary in summaries if not summary['ok']),
+        'scenes': total('scenes'),
+        'images': total('images'),
+        'missing_images': total('missing_images'),
+        'corrupt_images': total('corrupt_images'),
+        'audios': total('audios'),
+        'missing_audio': total('missing_audio'),
+        'duration_seconds': round(total('duration_seconds'), 2),
+        'srt_entries': total('srt_entries')
+    }
+
+
+def needs_attention(summary: dict) -> bool:
+    """True if a project failed or is missing assets."""
+    return not summary['ok'] or bool(summary.get('missing_images')) or bool(summary.get('missing_audio'))
+
+
+def print_report(summaries: list[dict], totals: dict, elapsed: float):
+    """
+    Print the aggregate report.
+
+    Args:
+        summaries: Project summaries from run_batch()
+        totals: Result of aggregate()
+        elapsed: Wall time of the whole batch in seconds
+    """
+    def cell(value):
+        return '-' if value is None else str(value)
+
+    names = [os.path.basename(summary['project']) or summary['project'] for summary in summaries]
+    width = max([len(name) for name in names] + [7])
+
+    print(f"{'Project':<{width}}  {'Status':<6}  {'Scenes':>6}  {'Images':>9}  {'Miss img':>8}  "
+          f"{'Audios':>6}  {'Miss aud':>8}  {'Duration':>9}  {'Time':>7}")
+    print('-' * (width + 83))
+    for name, summary in zip(names, summaries):
+        if summary['ok']:
+            status = 'WARN' if needs_attention(summary) else 'OK'
+        else:
+            status = 'FAILED'
+        images = cell(summary.get('images'))
+        if summary.get('expected_images') is not None:
+            images = f"{images}/{summary['expected_images']}"
+        duration = summary.get('duration_seconds')
+        elapsed_seconds = summary.get('elapsed_seconds')
+        print(f"{name:<{width}}  {status:<6}  {cell(summary.get('scenes')):>6}  {images:>9}  "
+              f"{cell(summary.get('missing_images')):>8}  {cell(summary.get('audios')):>6}  "
+              f"{cell(summary.get('missing_audio')):>8}  "
+              f"{'-' if duration is None else f'{duration / 60:.1f} min':>9}  "
+              f"{'-' if elapsed_seconds is None else f'{elapsed_seconds:.1f}s':>7}")
+
+    failed = [summary for summary in summaries if not summary['ok']]
+    if failed:
+        print()
+        print("Failures:")
+        for summary in failed:
+            print(f"  - {summary['project']}: {summary['error']}")
+
+    print()
+    print(f"Projects: {totals['projects']} ({totals['failed']} failed)")
+    print(f"Total scenes: {totals['scenes']}")
+    print(f"Total images: {totals['images']} ({totals['missing_images']} missing, "
+          f"{totals['corrupt_images']} corrupt)")
+    print(f"Total audios: {totals['audios']} ({totals['missing_audio']} missing)")
+    print(f"Total duration: {totals['duration_seconds']} seconds "
+          f"({round(totals['duration_seconds'] / 60, 2)} minutes)")
+    print(f"Batch time: {elapsed:.1f}s")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Run preparation, SRT and verification over many project folders in parallel.'
+    )
+    parser.add_argument(
+        'root',
+        help='Root folder containing project folders, or a glob pattern matching project folders'
+    )
+    parser.add_argument(
+        '--tasks', '-t',
+        default=','.join(TASKS),
+        help='Comma-separated tasks to run per project: prepare, srt, verify (default: all)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f'Projects processed in parallel (default: {DEFAULT_JOBS})'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_PROJECT_WORKERS,
+        help=f'Concurrent audio probes / image checks within each project (default: {DEFAULT_PROJECT_WORKERS})'
+    )
+    parser.add_argument(
+        '--max-words', '-m',
+        type=int,
+        default=12,
+        help='Maximum words per subtitle segment (default: 12)'
+    )
+    parser.add_argument(
+        '--deep',
+        action='store_true',
+        help='Also validate PNG structure in the verify task'
+    )
+    parser.add_argument(
+        '--no-output',
+        action='store_true',
+        help='Do not write missing_images.json files'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the per-project duration and integrity caches'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Output the per-project summaries and totals as JSON instead of the report'
+    )
+
+    args = parser.parse_args()
+
+    tasks = tuple(task for task in TASKS if task in {t.strip() for t in args.tasks.split(',')})
+    unknown = {t.strip() for t in args.tasks.split(',') if t.strip()} - set(TASKS)
+    if unknown or not tasks:
+        print(f"Error: Invalid --tasks: {args.tasks} (choose from {', '.join(TASKS)})")
+        sys.exit(1)
+
+    projects = find_projects(args.root)
+    if not projects:
+        print(f"Error: No project folders (with script_output.json) found for: {args.root}")
+        sys.exit(1)
+
+    def progress(summary):
+        if not args.json:
+            status = 'done' if summary['ok'] else 'FAILED'
+            print(f"  [{status}] {summary['project']}")
+
+    if not args.json:
+        print(f"Processing {len(projects)} project(s) with {args.jobs} worker(s): {', '.join(tasks)}")
+        print()
+
+    start = time.perf_counter()
+    summaries = run_batch(
+        projects, args.jobs, on_done=progress,
+        tasks=tasks, max_words=args.max_words, deep=args.deep,
+        write_missing=not args.no_output, use_cache=not args.no_cache, workers=args.workers
+    )
+    elapsed = time.perf_counter() - start
+    totals = aggregate(summaries)
+
+    if args.json:
+        print(json.dumps({'projects': summaries, 'totals': totals}, ensure_ascii=False, indent=2))
+    else:
+        print()
+        print_report(summaries, totals, elapsed)
+
+    if any(needs_attention(summary) for summary in summaries):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
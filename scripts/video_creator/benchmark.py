@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Benchmark the helper scripts on synthetic projects.
+
+Creates synthetic projects (see make_synthetic_project.py) at 100, 1k and
+10k scenes and runs prepare_batch_data, generate_srt and verify_images
+(--deep) on each. Every run happens in a fresh child process, which
+records:
+
+- wall time
+- peak RSS (ru_maxrss)
+- read/write syscall counts and bytes (/proc/self/io, Linux only)
+
+Caches are disabled so every run is cold. The median of --repeat runs is
+written to a JSON baseline; with --compare, results are checked against an
+earlier baseline and regressions beyond --tolerance are reported (exit 1).
+
+Usage:
+    python benchmark.py [--sizes 100,1000,10000] [--output baseline.json] [--compare old.json]
+
+Example:
+    python benchmark.py --output bench_baseline.json
+    python benchmark.py --sizes 100,1000 --compare bench_baseline.json
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Folder containing the video_creator package (for the child interpreters)
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.2
+TOOLS = ('prepare_batch_data', 'generate_srt', 'verify_images')
+
+# Metrics compared against a baseline (lower is better)
+COMPARED_METRICS = ('wall_seconds', 'peak_rss_kb', 'syscr', 'syscw')
+
+
+def read_proc_io() -> dict:
+    """Syscall and byte counters of this process, or {} where unsupported."""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            return {key: int(value) for key, value in (line.split(':') for line in f)}
+    except OSError:
+        return {}
+
+
+def run_tool(tool: str, project_folder: str, output_dir: str):
+    """Run one tool in-process, with caches disabled."""
+    if tool == 'prepare_batch_data':
+        from .prepare_batch_data import prepare_batch_data, save_batch_data
+        save_batch_data(prepare_batch_data(project_folder, use_cache=False), output_dir)
+    elif tool == 'generate_srt':
+        from .generate_srt import generate_srt
+        generate_srt(project_folder, output_path=os.path.join(output_dir, 'subtitles.srt'),
+                     use_cache=False)
+    elif tool == 'verify_images':
+        from .verify_images import verify_images
+        verify_images(project_folder, deep=True, use_cache=False)
+    else:
+        raise ValueError(f"Unknown tool: {tool}")
+
+
+def measure(tool: str, project_folder: str, output_dir: str) -> dict:
+    """
+    Time one tool in this process (called in the child).
+
+    Returns:
+        Dict with wall_seconds, peak_rss_kb and /proc/self/io deltas
+    """
+    import contextlib
+    import io
+    import resource
+
+    before = read_proc_io()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_tool(tool, project_folder, output_dir)
+    wall = time.perf_counter() - start
+    after = read_proc_io()
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024  # bytes on macOS, KB on Linux
+
+    result = {'wall_seconds': wall, 'peak_rss_kb': rss}
+    for key in ('syscr', 'syscw', 'rchar', 'wchar'):
+        if key in before and key in after:
+            result[key] = after[key] - before[key]
+    return result
+
+
+def run_child(tool: str, project_folder: str, output_dir: str) -> dict:
+    """Measure a tool in a fresh interpreter so RSS and I/O counters are isolated."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PACKAGE_PARENT, env.get('PYTHONPATH')]))
+    completed = subprocess.run(
+        [sys.executable, '-m', f'{__package__}.benchmark', '--child', tool, project_folder, output_dir],
+        capture_output=True, text=True, env=env
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{tool} failed on {project_folder}:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: list[dict]) -> dict:
+    """Median of each metric over repeated runs."""
+    keys = runs[0].keys()
+    summary = {key: statistics.median(run[key] for run in runs) for key in keys}
+    summary['wall_seconds'] = round(summary['wall_seconds'], 4)
+    summary['runs'] = len(runs)
+    return summary
+
+
+def run_benchmarks(sizes: list[int], repeat: int = DEFAULT_REPEAT, work_dir: str = None,
+                   tools: list[str] = TOOLS) -> dict:
+    """
+    Run every tool at every size.
+
+    Args:
+        sizes: Scene counts to benchmark
+        repeat: Runs per tool and size (the median is recorded)
+        work_dir: Where synthetic projects are created (default: a temp dir, removed afterwards)
+        tools: Tools to benchmark
+
+    Returns:
+        Baseline dict with environment info and results[tool][size]
+    """
+    from .make_synthetic_project import make_project
+
+    cleanup = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix='video_creator_bench_')
+    results = {tool: {} for tool in tools}
+
+    try:
+        for size in sizes:
+            project_folder = os.path.join(work_dir, f"project_{size}")
+            if not os.path.exists(os.path.join(project_folder, 'script_output.json')):
+                print(f"Creating synthetic project with {size} scenes...")
+                make_project(project_folder, size)
+            output_dir = os.path.join(work_dir, f"output_{size}")
+            os.makedirs(output_dir, exist_ok=True)
+
+            for tool in tools:
+                runs = [run_child(tool, project_folder, output_dir) for _ in range(repeat)]
+                results[tool][str(size)] = summarize(runs)
+                stats = results[tool][str(size)]
+                print(f"  {tool:<20} {size:>6} scenes  {stats['wall_seconds']:>8.3f}s  "
+                      f"{stats['peak_rss_kb'] / 1024:>7.1f} MB  "
+                      f"syscr={stats.get('syscr', '-')} syscw={stats.get('syscw', '-')}")
+    finally:
+        if cleanup:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """
+    List metrics that got worse than the baseline by more than tolerance.
+
+    Returns:
+        Human readable regression lines (empty if none)
+    """
+    regressions = []
+    for tool, sizes in current['results'].items():
+        for size, stats in sizes.items():
+            old = baseline.get('results', {}).get(tool, {}).get(size)
+            if not old:
+                continue
+            for metric in COMPARED_METRICS:
+                if metric not in stats or not old.get(metric):
+                    continue
+                change = (stats[metric] - old[metric]) / old[metric]
+                if change > tolerance:
+                    regressions.append(
+                        f"{tool} @ {size} scenes: {metric} {old[metric]} -> {stats[metric]} "
+                        f"(+{change:.0%})"
+                    )
+    return regressions
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--child':
+        # Internal: measure one tool and print the result as JSON
+        tool, project_folder, output_dir = argv[1:4]
+        print(json.dumps(measure(tool, project_folder, output_dir)))
+        return
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Benchmark prepare_batch_data, generate_srt and verify_images on synthetic projects.'
+    )
+    parser.add_argument(
+        '--sizes',
+        default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='Comma-separated scene counts (default: 100,1000,10000)'
+    )
+    parser.add_argument(
+        '--repeat', '-r',
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f'Runs per tool and size; the median is recorded (default: {DEFAULT_REPEAT})'
+    )
+    parser.add_argument(
+        '--tools',
+        default=','.join(TOOLS),
+        help='Comma-separated tools to benchmark (default: all)'
+    )
+    parser.add_argument(
+        '--work-dir',
+        default=None,
+        help='Keep synthetic projects in this folder and reuse them (default: temp dir)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        default=None,
+        help='Write the results as a JSON baseline to this path'
+    )
+    parser.add_argument(
+        '--compare', '-c',
+        default=None,
+        help='Baseline JSON to compare against'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f'Allowed relative slowdown before a metric counts as a regression (default: {DEFAULT_TOLERANCE})'
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    except ValueError:
+        print(f"Error: Invalid --sizes: {args.sizes}")
+        sys.exit(1)
+    tools = [tool.strip() for tool in args.tools.split(',') if tool.strip()]
+    unknown = [tool for tool in tools if tool not in TOOLS]
+    if unknown:
+        print(f"Error: Unknown tool(s): {', '.join(unknown)} (choose from {', '.join(TOOLS)})")
+        sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline {args.compare} - {e}")
+            sys.exit(1)
+
+    try:
+        result = run_benchmarks(sizes, args.repeat, args.work_dir, tools)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print()
+        print(f"Baseline saved: {args.output}")
+
+    if baseline is not None:
+        regressions = compare(result, baseline, args.tolerance)
+        print()
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
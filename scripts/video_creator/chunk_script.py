@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Split a source script into scene-splitting batches at natural boundaries.
+
+The scene command splits the script into sentences batch by batch. This
+script only decides where the batches start and end, so that no batch is
+oversized and none cuts a paragraph or sentence in half:
+
+- paragraphs are separated by blank lines (by line breaks when the file
+  has no blank lines, as is usual for Chinese scripts)
+- a paragraph larger than a batch is divided at sentence ends
+  (。！？；… and . ! ? before whitespace, not after abbreviations like Mr.)
+- cut points are chosen over the whole text: as few batches of at most
+  --max-chars as possible, then as few cuts inside paragraphs as possible,
+  then sizes as even as possible (no small remainder batch at the end)
+
+Sizes are CJK-aware: a CJK character counts as CJK_CHAR_WEIGHT characters,
+as it carries about as much text as a short English word does. Without
+--max-chars the budget follows the table in commands/scene.md (whole text
+below 2000, then 1000 / 1500 / 2000 per batch).
+
+Each batch is written verbatim to <project_folder>/scene_batches/batch_NNN.txt.
+scene_batches.json records the source checksum, the detected language and,
+per batch, its file, character range [start, end) in the source, size,
+SHA-256 and whether its sentences have been written. Work through batches
+in order and mark each one with --done; --next names the first batch still
+to do. Rerunning keeps the done mark of every unchanged batch.
+
+Usage:
+    python chunk_script.py <project_folder> [--source FILE] [--max-chars N]
+    python chunk_script.py <project_folder> --next
+    python chunk_script.py <project_folder> --done batch_001.txt
+    python chunk_script.py <project_folder> --reset
+
+Example:
+    python chunk_script.py ./my_project                   # reads ./my_project/script.txt
+    python chunk_script.py ./my_project --source draft.txt --max-chars 1200
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import NamedTuple
+
+BATCHES_FOLDER = 'scene_batches'
+MANIFEST_FILENAME = 'scene_batches.json'
+MANIFEST_VERSION = 1
+
+# A CJK character carries roughly as much text as three Latin characters
+CJK_CHAR_WEIGHT = 3
+
+# Budget by total (weighted) size, as in the commands/scene.md table:
+# (total size below, batch size); None = everything in one batch
+BUDGET_TABLE = (
+    (2000, None),
+    (5000, 1000),
+    (10000, 1500),
+)
+LARGE_TEXT_BUDGET = 2000
+
+# Ideographs, kana, hangul, CJK punctuation and full-width forms
+CJK_RE = re.compile(r'[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff'
+                    r'\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]')
+LATIN_RE = re.compile(r'[A-Za-z]')
+
+BLANK_LINE_RE = re.compile(r'\n[ \t\r]*\n')
+LINE_BREAK_RE = re.compile(r'\n')
+
+# CJK sentence ends need no following space; Latin ones must be followed by
+# whitespace (so 3.5 and a.m., stay intact)
+CLOSERS = '"\'”’」』）)\\]'
+SENTENCE_END_RE = re.compile(
+    rf'(?:[。！？；]|…+)[{CLOSERS}]*'
+    rf'|[.!?]+[{CLOSERS}]*(?=\s)'
+)
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'prof', 'st', 'vs', 'etc', 'e.g', 'i.e', 'jr', 'sr', 'no'}
+WORD_BEFORE_RE = re.compile(r'([A-Za-z][A-Za-z.]*)\.$')
+
+
+class Unit(NamedTuple):
+    """A piece of the source that is never split: [start, end) offsets."""
+    start: int
+    end: int
+    paragraph_end: bool
+
+
+def text_size(text: str) -> int:
+    """Length of text with CJK characters counted CJK_CHAR_WEIGHT times."""
+    return len(text) + (CJK_CHAR_WEIGHT - 1) * len(CJK_RE.findall(text))
+
+
+def detect_language(text: str) -> str:
+    """'zh', 'en' or 'mixed', by the weighted share of CJK vs Latin letters."""
+    cjk = len(CJK_RE.findall(text)) * CJK_CHAR_WEIGHT
+    latin = len(LATIN_RE.findall(text))
+    if cjk + latin == 0:
+        return 'en'
+    share = cjk / (cjk + latin)
+    if share >= 0.8:
+        return 'zh'
+    if share <= 0.2:
+        return 'en'
+    return 'mixed'
+
+
+def default_budget(total_size: int) -> int:
+    """Batch size for a text of total_size, following the scene.md table."""
+    for limit, budget in BUDGET_TABLE:
+        if total_size < limit:
+            return budget or max(total_size, 1)
+    return LARGE_TEXT_BUDGET
+
+
+def iter_paragraphs(text: str):
+    """Yield (start, end) of each non-empty paragraph, whitespace trimmed."""
+    separator = BLANK_LINE_RE if BLANK_LINE_RE.search(text) else LINE_BREAK_RE
+    position = 0
+    for match in list(separator.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        start = position
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            yield start, end
+        if match:
+            position = match.end()
+
+
+def iter_sentences(text: str, start: int, end: int):
+    """Yield (start, end) of each sentence of text[start:end]."""
+    sentence_start = start
+    for match in SENTENCE_END_RE.finditer(text, start, end):
+        stop = match.end()
+        if match.group()[0] in '.!?':
+            before = WORD_BEFORE_RE.search(text, sentence_start, match.start() + 1)
+            if before and before.group(1).lower() in ABBREVIATIONS:
+                continue
+            following = text[stop:end].lstrip()
+            if following and following[0].islower():
+                continue
+        if text[sentence_start:stop].strip():
+            yield sentence_start, stop
+        sentence_start = stop
+        while sentence_start < end and text[sentence_start].isspace():
+            sentence_start += 1
+    if sentence_start < end:
+        yield sentence_start, end
+
+
+def split_units(text: str, budget: int) -> list[Unit]:
+    """Whole paragraphs, or the sentences of paragraphs larger than budget."""
+    units = []
+    for start, end in iter_paragraphs(text):
+        if text_size(text[start:end]) <= budget:
+            units.append(Unit(start, end, True))
+            continue
+        sentences = list(iter_sentences(text, start, end))
+        for i, (s_start, s_end) in enumerate(sentences):
+            units.append(Unit(s_start, s_end, i == len(sentences) - 1))
+    return units
+
+
+def plan_batches(text: str, budget: int = None) -> list[tuple[int, int]]:
+    """
+    Choose batch boundaries for a text.
+
+    Args:
+        text: Full source text
+        budget: Maximum weighted size per batch (default: from the scene.md table)
+
+    Returns:
+        List of (start, end) character ranges into text, in order. A single
+        sentence larger than the budget becomes a batch of its own.
+    """
+    if budget is None:
+        budget = default_budget(text_size(text.strip()))
+    if budget < 1:
+        raise ValueError("Batch size must be positive")
+
+    units = split_units(text, budget)
+    if not units:
+        return []
+
+    # text_size is additive, so a range's size is a difference of prefix sizes
+    starts, ends = [], []
+    size = position = 0
+    for unit in units:
+        size += text_size(text[position:unit.start])
+        starts.append(size)
+        size += text_size(text[unit.start:unit.end])
+        ends.append(size)
+        position = unit.end
+
+    # best[j]: cost of batching units[:j] as (batches, cuts inside paragraphs,
+    # sum of squared sizes) - the sum of squares is smallest for even sizes -
+    # and where its last batch starts
+    best = [((0, 0, 0), 0)]
+    for j in range(1, len(units) + 1):
+        inside = 0 if units[j - 1].paragraph_end else 1
+        choice = None
+        for i in range(j - 1, -1, -1):
+            batch_size = ends[j - 1] - starts[i]
+            if batch_size > budget and i < j - 1:
+                break
+            (batches, cuts, squares), _ = best[i]
+            cost = (batches + 1, cuts + inside, squares + batch_size * batch_size)
+            if choice is None or cost < choice[0]:
+                choice = (cost, i)
+        best.append(choice)
+
+    ranges = []
+    j = len(units)
+    while j > 0:
+        i = best[j][1]
+        ranges.append((units[i].start, units[j - 1].end))
+        j = i
+    ranges.reverse()
+    return ranges
+
+
+def load_manifest(project_folder: str) -> dict:
+    """Load scene_batches.json, or None if missing, unreadable or of another version."""
+    try:
+        with open(os.path.join(project_folder, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if isinstance(manifest, dict) and manifest.get('version') == MANIFEST_VERSION:
+        return manifest
+    return None
+
+
+def save_manifest(project_folder: str, manifest: dict) -> str:
+    """Write scene_batches.json (atomic replace) and return its path."""
+    path = os.path.join(project_folder, MANIFEST_FILENAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_batch(path: str, text: str) -> str:
+    """Write one batch file (atomic replace) and return its SHA-256."""
+    data = text.encode('utf-8')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return hashlib.sha256(data).hexdigest()
+
+
+def chunk_script(project_folder: str, source_path: str = None, max_chars: int = None) -> dict:
+    """
+    Split the source script into batches and write them with scene_batches.json.
+
+    Args:
+        project_folder: Project folder (batches and manifest are written here)
+        source_path: Script text file (default: <project_folder>/script.txt)
+        max_chars: Maximum weighted size per batch (default: from the scene.md table)
+
+    Returns:
+        The manifest dict
+
+    Raises:
+        FileNotFoundError: If the source file does not exist
+        ValueError: If the source file has no text
+    """
+    if source_path is None:
+        source_path = os.path.join(project_folder, 'script.txt')
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(f"Script file not found: {source_path}")
+
+    with open(source_path, 'rb') as f:
+        raw = f.read()
+    text = raw.decode('utf-8-sig').replace('\r\n', '\n')
+    if not text.strip():
+        raise ValueError(f"Script file is empty: {source_path}")
+
+    total = text_size(text.strip())
+    budget = default_budget(total) if max_chars is None else max_chars
+    ranges = plan_batches(text, budget)
+
+    batches_dir = os.path.join(project_folder, BATCHES_FOLDER)
+    os.makedirs(batches_dir, exist_ok=True)
+
+    previous = load_manifest(project_folder) or {'batches': []}
+    completed = {
+        (batch['file'], batch['start'], batch['end'], batch['sha256'])
+        for batch in previous['batches'] if batch.get('completed')
+    }
+
+    batches = []
+    for number, (start, end) in enumerate(ranges, 1):
+        batch_file = f"batch_{number:03d}.txt"
+        batch_text = text[start:end]
+        sha256 = write_batch(os.path.join(batches_dir, batch_file), batch_text)
+        size = text_size(batch_text)
+        batch = {
+            'file': batch_file,
+            'start': start,
+            'end': end,
+            'chars': len(batch_text),
+            'size': size,
+            'sha256': sha256,
+            'completed': (batch_file, start, end, sha256) in completed
+        }
+        if size > budget:
+            batch['oversized'] = True
+        batches.append(batch)
+
+    # Remove batches left over from a run with more batches
+    current = {batch['file'] for batch in batches}
+    with os.scandir(batches_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.txt') and entry.name not in current:
+                os.remove(entry.path)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source_file': os.path.abspath(source_path),
+        'source_sha256': hashlib.sha256(raw).hexdigest(),
+        'language': detect_language(text),
+        'total_chars': len(text.strip()),
+        'total_size': total,
+        'max_chars': budget,
+        'cjk_char_weight': CJK_CHAR_WEIGHT,
+        'batches': batches
+    }
+    save_manifest(project_folder, manifest)
+    return manifest
+
+
+def batch_checksum(project_folder: str, batch: dict) -> str:
+    """SHA-256 of a batch file as it is on disk now (None if missing)."""
+    try:
+        with open(os.path.join(project_folder, BATCHES_FOLDER, batch['file']), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def next_batch(manifest: dict) -> dict:
+    """The first batch not yet split into sentences, or None when all are done."""
+    return next((batch for batch in manifest['batches'] if not batch['completed']), None)
+
+
+def mark_completed(project_folder: str, batch_file: str) -> dict:
+    """
+    Mark a batch as split.
+
+    Raises:
+        ValueError: If the batch is unknown or its file no longer matches
+            the manifest checksum (the batches were regenerated or edited)
+    """
+    manifest = load_manifest(project_folder)
+    if manifest is None:
+        raise ValueError(f"No {MANIFEST_FILENAME} in: {project_folder}")
+    batch_file = os.path.basename(batch_file)
+    batch = next((batch for batch in manifest['batches'] if batch['file'] == batch_file), None)
+    if batch is None:
+        raise ValueError(f"Unknown batch: {batch_file}")
+    if batch_checksum(project_folder, batch) != batch['sha256']:
+        raise ValueError(f"Checksum mismatch for {batch_file}; rerun chunk_script.py")
+    batch['completed'] = True
+    save_manifest(project_folder, manifest)
+    return batch
+
+
+def describe(batch: dict) -> str:
+    """Human-readable range of a batch (1-based, inclusive character positions)."""
+    return f"chars {batch['start'] + 1}-{batch['end']}, size {batch['size']}"
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Split a script into scene-splitting batches at paragraph/sentence boundaries.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Project folder (batches are written to scene_batches/ inside it)'
+    )
+    parser.add_argument(
+        '--source', '-s',
+        default=None,
+        help='Script text file (default: <project_folder>/script.txt)'
+    )
+    parser.add_argument(
+        '--max-chars',
+        type=int,
+        default=None,
+        help=f'Maximum batch size in characters, CJK characters counting {CJK_CHAR_WEIGHT} '
+             '(default: by total length, see commands/scene.md)'
+    )
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument(
+        '--next',
+        action='store_true',
+        help='Print the first batch not yet marked as done'
+    )
+    action.add_argument(
+        '--done',
+        metavar='BATCH',
+        default=None,
+        help='Mark a batch as split into sentences (checks its checksum first)'
+    )
+    action.add_argument(
+        '--reset',
+        action='store_true',
+        help='Clear all done marks'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.project_folder):
+        print(f"Error: Project folder not found: {args.project_folder}")
+        sys.exit(1)
+
+    try:
+        if args.done:
+            batch = mark_completed(args.project_folder, args.done)
+            print(f"Completed: {batch['file']} ({describe(batch)})")
+            manifest = load_manifest(args.project_folder)
+        elif args.next or args.reset:
+            manifest = load_manifest(args.project_folder)
+            if manifest is None:
+                raise ValueError(f"No {MANIFEST_FILENAME} in: {args.project_folder}")
+            if args.reset:
+                for batch in manifest['batches']:
+                    batch['completed'] = False
+                save_manifest(args.project_folder, manifest)
+                print(f"Reset {len(manifest['batches'])} batch(es)")
+        else:
+            manifest = chunk_script(args.project_folder, args.source, args.max_chars)
+            print(f"Source: {manifest['source_file']}")
+            print(f"Language: {manifest['language']}, {manifest['total_chars']} chars "
+                  f"(size {manifest['total_size']})")
+            print(f"Batches: {len(manifest['batches'])} (max size {manifest['max_chars']})")
+            for batch in manifest['batches']:
+                status = 'done' if batch['completed'] else 'todo'
+                note = ' [oversized: one long sentence]' if batch.get('oversized') else ''
+                print(f"  [{status}] {batch['file']}: {describe(batch)}{note}")
+            print()
+            print(f"Manifest saved: {os.path.join(args.project_folder, MANIFEST_FILENAME)}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    batch = next_batch(manifest)
+    if args.next or args.done:
+        if batch is None:
+            print("All batches completed")
+        else:
+            print(f"Next batch: {os.path.join(os.path.abspath(args.project_folder), BATCHES_FOLDER, batch['file'])} "
+                  f"({describe(batch)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Join the scene audio files into one narration track without re-encoding.
+
+MPEG audio frames are self-contained, so audio_001.mp3, audio_002.mp3, ...
+can be joined by copying their frames back to back. ID3v2/ID3v1/APE tags
+and each file's Xing/Info/VBRI frame are left out; a single Info (or Xing,
+for mixed bitrates) frame describing the whole stream is written at the
+start so players report the right length.
+
+Alongside narration.mp3, narration.json records where each scene starts
+and ends in the joined track. Offsets come from exact frame counts
+(frames * samples per frame / sample rate), so the scene boundaries line
+up with the audio to the sample; they include each file's encoder delay
+and padding, which stay in the joined stream. The table also records each
+source's size and mtime, and the join is skipped while they are unchanged.
+
+All files must share the MPEG version, layer, sample rate and mono/stereo
+layout; anything else cannot be joined losslessly and is reported as an
+error.
+
+Usage:
+    python concat_audio.py <project_folder> [--force]
+
+Example:
+    python concat_audio.py ./my_project
+    python prepare_batch_data.py ./my_project --narration  # single audio entry
+    python generate_srt.py ./my_project --narration        # same scene offsets
+"""
+
+import json
+import os
+import sys
+
+from .mp3_frames import MONO, build_info_frame, scan_frames
+from .profiling import span
+from .project_index import scan_project
+
+NARRATION_FILENAME = 'narration.mp3'
+TABLE_FILENAME = 'narration.json'
+TABLE_VERSION = 1
+DEFAULT_WORKERS = 8
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def scene_audio_entries(project_index) -> list:
+    """The scene audio files to join: audio_XXX.mp3, sorted by file name."""
+    return [
+        entry for entry in project_index.audio_entries(prefix='audio_')
+        if entry.name.endswith('.mp3')
+    ]
+
+
+def scan_sources(paths: list[str], workers: int = DEFAULT_WORKERS) -> list:
+    """
+    Scan the frames of every source file (concurrently, results in order).
+
+    Raises:
+        ValueError: If a file is not an MPEG audio stream or its format
+            differs from the first file's
+    """
+    def scan(path):
+        with span('scan_frames', 'file', file=path):
+            return scan_frames(path)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(scan, paths))
+
+    first = None
+    for path, frames in zip(paths, results):
+        if frames is None:
+            raise ValueError(f"Not an MPEG audio stream: {path}")
+        header = frames.header
+        layout = (header.version, header.layer, header.sample_rate, header.channel_mode == MONO)
+        if first is None:
+            first, first_path = layout, path
+        elif layout != first:
+            raise ValueError(
+                f"Cannot join {os.path.basename(path)} losslessly: MPEG {header.version} layer "
+                f"{header.layer} {header.sample_rate} Hz {'mono' if layout[3] else 'stereo'} differs from "
+                f"{os.path.basename(first_path)} (MPEG {first[0]} layer {first[1]} {first[2]} Hz "
+                f"{'mono' if first[3] else 'stereo'})"
+            )
+    return results
+
+
+def build_table(paths: list[str], stats: list[os.stat_result], results: list,
+                output_path: str) -> dict:
+    """
+    Offset table for joined sources.
+
+    Returns:
+        Dict with version, file, sample_rate, samples_per_frame,
+        total_frames, duration_us and scenes (file, size, mtime_ns, frames,
+        start_us, end_us per source)
+    """
+    header = results[0].header
+    scenes = []
+    total_frames = 0
+    for path, stat, frames in zip(paths, stats, results):
+        start_us = total_frames * header.samples_per_frame * 1_000_000 // header.sample_rate
+        total_frames += frames.frame_count
+        scenes.append({
+            'file': os.path.basename(path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'frames': frames.frame_count,
+            'start_us': start_us,
+            'end_us': total_frames * header.samples_per_frame * 1_000_000 // header.sample_rate
+        })
+
+    return {
+        'version': TABLE_VERSION,
+        'file': os.path.abspath(output_path),
+        'sample_rate': header.sample_rate,
+        'samples_per_frame': header.samples_per_frame,
+        'total_frames': total_frames,
+        'duration_us': scenes[-1]['end_us'] if scenes else 0,
+        'scenes': scenes
+    }
+
+
+def write_narration(paths: list[str], results: list, output_path: str):
+    """Copy the audio frames of every source into output_path (atomic replace)."""
+    byte_count = sum(end - start for frames in results for start, end in frames.ranges)
+    bitrates = {frames.header.bitrate for frames in results}
+    info_frame = build_info_frame(results[0].header, sum(frames.frame_count for frames in results),
+                                  byte_count, vbr=len(bitrates) > 1)
+
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(info_frame)
+            for path, frames in zip(paths, results):
+                with open(path, 'rb') as f:
+                    for start, end in frames.ranges:
+                        f.seek(start)
+                        remaining = end - start
+                        while remaining:
+                            chunk = f.read(min(remaining, COPY_CHUNK_SIZE))
+                            if not chunk:
+                                raise ValueError(f"File changed while joining: {path}")
+                            out.write(chunk)
+                            remaining -= len(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_table(project_folder: str) -> dict:
+    """Load narration.json, or None if missing, unreadable or of another version."""
+    try:
+        with open(os.path.join(project_folder, TABLE_FILENAME), 'r', encoding='utf-8') as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if isinstance(table, dict) and table.get('version') == TABLE_VERSION:
+        return table
+    return None
+
+
+def is_current(table: dict, audio_entries: list) -> bool:
+    """True if the table was built from exactly these files, unchanged, and its track exists."""
+    if table is None or len(table['scenes']) != len(audio_entries):
+        return False
+    for scene, entry in zip(table['scenes'], audio_entries):
+        if (scene['file'] != entry.name or scene['size'] != entry.stat.st_size
+                or scene['mtime_ns'] != entry.stat.st_mtime_ns):
+            return False
+    return os.path.isfile(table['file'])
+
+
+def build_narration(project_folder: str, audio_entries: list, force: bool = False,
+                    workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    Join scene audio into narration.mp3 and write narration.json.
+
+    Args:
+        project_folder: Path to the project folder (location of both outputs)
+        audio_entries: Scene audio FileEntry objects, in timeline order
+        force: Rebuild even if the existing table matches the sources
+        workers: Concurrent frame scans
+
+    Returns:
+        The offset table (see build_table)
+
+    Raises:
+        ValueError: If the files cannot be joined losslessly
+    """
+    if not audio_entries:
+        raise ValueError("No scene audio files to join")
+
+    table = None if force else load_table(project_folder)
+    if is_current(table, audio_entries):
+        return table
+
+    output_path = os.path.join(project_folder, NARRATION_FILENAME)
+    paths = [entry.path for entry in audio_entries]
+    with span('scan_audio_frames'):
+        results = scan_sources(paths, workers)
+    with span('write_narration'):
+        write_narration(paths, results, output_path)
+
+    table = build_table(paths, [entry.stat for entry in audio_entries], results, output_path)
+    table_path = os.path.join(project_folder, TABLE_FILENAME)
+    tmp_path = table_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=2)
+    os.replace(tmp_path, table_path)
+    return table
+
+
+def scene_durations(table: dict) -> list[float]:
+    """
+    Scene durations in seconds from the offset table.
+
+    Each duration is the difference of the scene's integer-microsecond
+    offsets, so laying them out on the shared timeline (timeline.to_us)
+    reproduces the table's offsets exactly.
+    """
+    return [(scene['end_us'] - scene['start_us']) / 1_000_000 for scene in table['scenes']]
+
+
+def narration_audio_entry(table: dict) -> dict:
+    """The single audios_batch entry covering the whole narration track."""
+    duration = table['duration_us'] / 1_000_000
+    return {
+        "audio_url": table['file'],
+        "start": 0,
+        "end": duration,
+        "target_start": 0,
+        "track_name": "audio_main"
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Join audio_XXX.mp3 into narration.mp3 without re-encoding and write the scene offset table.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder'
+    )
+    parser.add_argument(
+        '--force', '-f',
+        action='store_true',
+        help='Rebuild even if narration.json matches the current audio files'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent frame scans (default: {DEFAULT_WORKERS})'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.project_folder):
+        print(f"Error: Project folder not found: {args.project_folder}")
+        sys.exit(1)
+
+    project_index = scan_project(args.project_folder)
+    audio_entries = scene_audio_entries(project_index)
+    if not audio_entries:
+        print(f"Error: No audio_XXX.mp3 files found in: {project_index.audio_folder}")
+        sys.exit(1)
+
+    try:
+        table = build_narration(args.project_folder, audio_entries, args.force, args.workers)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    duration = table['duration_us'] / 1_000_000
+    print(f"Joined files: {len(table['scenes'])}")
+    print(f"Total frames: {table['total_frames']} ({table['sample_rate']} Hz, "
+          f"{table['samples_per_frame']} samples/frame)")
+    print(f"Total duration: {round(duration, 3)} seconds ({round(duration / 60, 2)} minutes)")
+    print()
+    print(f"Narration saved:")
+    print(f"  - {table['file']}")
+    print(f"  - {os.path.join(args.project_folder, TABLE_FILENAME)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,732 @@
+#!/usr/bin/env python3
+"""
+Write a JianYing / CapCut draft directly to disk, without the capcut-api service.
+
+Takes the batch data from prepare_batch_data() (images_batch / audios_batch)
+and the subtitles.srt file and writes the draft folder JianYing opens:
+
+- draft_content.json: canvas, materials (photos, audio, subtitle texts,
+  speeds, intro animations, transitions) and the video/audio/text tracks
+- draft_info.json: the same document (newer macOS builds read this name)
+- draft_meta_info.json: draft id, name, folder, duration and imported files
+
+Everything is built in memory from the already laid out timeline (integer
+microseconds, see timeline.py) and written with one atomic replace per file,
+so a draft takes milliseconds instead of one service round trip per step.
+
+Intro animations and transitions are the names chosen by
+prepare_batch_data.py from INTRO_ANIMATIONS / TRANSITIONS. JianYing needs
+each effect's effect_id / resource_id from its effect library, which this
+script cannot look up offline; pass them with --effects, a JSON catalog:
+
+    {
+      "intro": {"Fade_In": {"name": "渐显", "effect_id": "...", "resource_id": "...", "duration_us": 500000}},
+      "transition": {"Dissolve": {"name": "叠化", "effect_id": "...", "resource_id": "...", "duration_us": 466666}}
+    }
+
+Names missing from the catalog are left out of the draft and reported as
+warnings (the clips themselves are unaffected).
+
+Usage:
+    python draft_writer.py <project_folder> [--draft-folder DIR] [--name NAME] [--width 1920 --height 1080]
+
+Example:
+    python draft_writer.py ./my_project
+    python draft_writer.py ./my_project --width 1080 --height 1920 --name toxic_love_video
+    python draft_writer.py ./my_project --narration --prepared-images --effects ~/capcut_effects.json
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import uuid
+
+from .audio_durations import DEFAULT_WORKERS
+from .profiling import add_profile_arguments, hot, profile_run, profile_trace, span
+from .timeline import US_PER_MS, to_us
+
+# Where JianYing / CapCut keep their drafts (first existing folder is the default)
+DRAFT_FOLDERS = (
+    '~/Movies/JianyingPro/User Data/Projects/com.lveditor.draft',
+    '~/Movies/CapCut/User Data/Projects/com.lveditor.draft',
+    '~/AppData/Local/JianyingPro/User Data/Projects/com.lveditor.draft',
+    '~/AppData/Local/CapCut/User Data/Projects/com.lveditor.draft',
+)
+
+DRAFT_VERSION = 360000
+DRAFT_NEW_VERSION = '110.0.0'
+FPS = 30.0
+
+DEFAULT_INTRO_DURATION_US = 500000
+DEFAULT_TRANSITION_DURATION_US = 466666
+
+# Subtitle style (same defaults as the add_subtitle step in jianying_draft.md)
+SUBTITLE_STYLE = {
+    'font': 'Poppins_Bold',
+    'font_size': 5.0,
+    'font_color': '#FFFFFF',
+    'border_color': '#000000',
+    'border_width': 2,
+    'transform_y': -0.8
+}
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def new_id() -> str:
+    """Upper-case UUID, the id format used throughout JianYing drafts."""
+    return str(uuid.uuid4()).upper()
+
+
+def hex_to_rgb(color: str) -> list[float]:
+    """'#RRGGBB' -> [r, g, b] in 0..1."""
+    color = color.lstrip('#')
+    return [int(color[i:i + 2], 16) / 255 for i in (0, 2, 4)]
+
+
+def png_size(path: str) -> tuple[int, int]:
+    """Width and height from a PNG's IHDR chunk, or None for other/unreadable files."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(24)
+    except OSError:
+        return None
+    if len(head) < 24 or head[:8] != PNG_SIGNATURE or head[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', head[16:24])
+
+
+def parse_srt(srt_text: str) -> list[tuple[int, int, str]]:
+    """
+    Parse SRT text.
+
+    Returns:
+        List of (start_us, end_us, text) in file order
+    """
+    def timestamp_us(value):
+        hms, millis = value.strip().split(',')
+        hours, minutes, seconds = (int(part) for part in hms.split(':'))
+        return ((hours * 3600 + minutes * 60 + seconds) * 1000 + int(millis)) * US_PER_MS
+
+    entries = []
+    for block in srt_text.replace('\r\n', '\n').strip().split('\n\n'):
+        lines = block.strip().split('\n')
+        if len(lines) < 2 or '-->' not in lines[1]:
+            continue
+        start, end = lines[1].split('-->')
+        entries.append((timestamp_us(start), timestamp_us(end), '\n'.join(lines[2:])))
+    return entries
+
+
+def load_effects(effects_path: str) -> dict:
+    """Load an effect catalog (see module docstring); None path = empty catalog."""
+    if effects_path is None:
+        return {'intro': {}, 'transition': {}}
+    with open(effects_path, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    return {'intro': catalog.get('intro', {}), 'transition': catalog.get('transition', {})}
+
+
+def empty_materials() -> dict:
+    """Material lists of an empty draft."""
+    names = (
+        'audio_balances', 'audio_effects', 'audio_fades', 'audios', 'beats', 'canvases', 'chromas',
+        'color_curves', 'digital_humans', 'drafts', 'effects', 'flowers', 'green_screens', 'handwrites',
+        'hsl', 'images', 'log_color_wheels', 'loudnesses', 'manual_deformations', 'masks',
+        'material_animations', 'material_colors', 'placeholders', 'plugin_effects', 'primary_color_wheels',
+        'realtime_denoises', 'shapes', 'smart_crops', 'sound_channel_mappings', 'speeds', 'stickers',
+        'tail_leaders', 'text_templates', 'texts', 'transitions', 'video_effects', 'video_trackings',
+        'videos', 'vocal_beautifys', 'vocal_separations'
+    )
+    return {name: [] for name in names}
+
+
+def make_segment(material_id: str, target_start: int, duration: int, source_start: int = 0,
+                 extra_refs: list = None, transform_y: float = 0.0, render_index: int = 0,
+                 visual: bool = False) -> dict:
+    """One track segment placing a material on the timeline (visual = photo/video clip)."""
+    return {
+        'id': new_id(),
+        'material_id': material_id,
+        'target_timerange': {'start': target_start, 'duration': duration},
+        'source_timerange': {'start': source_start, 'duration': duration},
+        'speed': 1.0,
+        'volume': 1.0,
+        'visible': True,
+        'render_index': render_index,
+        'extra_material_refs': extra_refs or [],
+        'clip': {
+            'alpha': 1.0,
+            'flip': {'horizontal': False, 'vertical': False},
+            'rotation': 0.0,
+            'scale': {'x': 1.0, 'y': 1.0},
+            'transform': {'x': 0.0, 'y': transform_y}
+        },
+        'uniform_scale': {'on': True, 'value': 1.0},
+        'enable_adjust': True,
+        'enable_color_curves': True,
+        'enable_lut': True,
+        'common_keyframes': [],
+        'keyframe_refs': [],
+        'reverse': False,
+        'intensifies_audio': False,
+        'is_placeholder': False,
+        'is_tone_modify': False,
+        'last_nonzero_volume': 1.0,
+        'track_render_index': 0,
+        'cartoon': False,
+        'hdr_settings': {'intensity': 1.0, 'mode': 1, 'nits': 1000} if visual else None
+    }
+
+
+def make_track(track_type: str, name: str, segments: list) -> dict:
+    return {
+        'attribute': 0,
+        'flag': 0,
+        'id': new_id(),
+        'is_default_name': False,
+        'name': name,
+        'segments': segments,
+        'type': track_type
+    }
+
+
+class DraftBuilder:
+    """
+    Assemble draft_content.json from batch entries and subtitles.
+
+    Usage:
+        builder = DraftBuilder(1920, 1080, effects)
+        builder.add_images(result['images_batch'])
+        builder.add_audios(result['audios_batch'])
+        builder.add_subtitles(parse_srt(srt_text))
+        content = builder.content()
+    """
+
+    def __init__(self, width: int, height: int, effects: dict = None,
+                 subtitle_style: dict = None):
+        self.width = width
+        self.height = height
+        self.effects = effects or {'intro': {}, 'transition': {}}
+        self.subtitle_style = {**SUBTITLE_STYLE, **(subtitle_style or {})}
+        self.materials = empty_materials()
+        self.tracks = {}
+        self.duration = 0
+        self.warnings = []
+        self.imported = []
+        self._photo_ids = {}
+        self._audio_ids = {}
+        self._missing_effects = set()
+
+    def _track(self, track_type: str, name: str) -> list:
+        """Segment list of the named track, created on first use."""
+        key = (track_type, name)
+        if key not in self.tracks:
+            self.tracks[key] = make_track(track_type, name, [])
+        return self.tracks[key]['segments']
+
+    def _speed(self) -> str:
+        speed_id = new_id()
+        self.materials['speeds'].append(
+            {'id': speed_id, 'type': 'speed', 'mode': 0, 'speed': 1.0, 'curve_speed': None}
+        )
+        return speed_id
+
+    def _effect(self, kind: str, name: str) -> dict:
+        """Catalog entry for an intro animation / transition, or None (warned once)."""
+        effect = self.effects[kind].get(name)
+        if effect is None and (kind, name) not in self._missing_effects:
+            self._missing_effects.add((kind, name))
+            self.warnings.append(f"No {kind} effect ids for '{name}' in the effect catalog; skipped")
+        return effect
+
+    def _photo(self, path: str) -> str:
+        """Photo material id for an image path (one material per file)."""
+        if path in self._photo_ids:
+            return self._photo_ids[path]
+        width, height = png_size(path) or (self.width, self.height)
+        material_id = new_id()
+        self.materials['videos'].append({
+            'id': material_id,
+            'type': 'photo',
+            'path': path,
+            'material_name': os.path.basename(path),
+            'width': width,
+            'height': height,
+            'duration': 10800000000,
+            'category_name': 'local',
+            'check_flag': 63487,
+            'crop': {
+                'upper_left_x': 0.0, 'upper_left_y': 0.0, 'upper_right_x': 1.0, 'upper_right_y': 0.0,
+                'lower_left_x': 0.0, 'lower_left_y': 1.0, 'lower_right_x': 1.0, 'lower_right_y': 1.0
+            },
+            'crop_ratio': 'free',
+            'crop_scale': 1.0,
+            'has_audio': False,
+            'local_material_id': '',
+            'media_path': ''
+        })
+        self._photo_ids[path] = material_id
+        self.imported.append({'path': path, 'id': material_id, 'metetype': 'photo',
+                              'width': width, 'height': height, 'duration': 0})
+        return material_id
+
+    def _audio(self, path: str, duration: int) -> str:
+        """Audio material id for a file (one material per file, longest use wins)."""
+        if path in self._audio_ids:
+            material = self._audio_ids[path]
+            material['duration'] = max(material['duration'], duration)
+            return material['id']
+        material = {
+            'id': new_id(),
+            'type': 'extract_music',
+            'path': path,
+            'name': os.path.basename(path),
+            'duration': duration,
+            'category_name': 'local',
+            'check_flag': 1,
+            'local_material_id': '',
+            'music_id': new_id(),
+            'wave_points': []
+        }
+        self.materials['audios'].append(material)
+        self._audio_ids[path] = material
+        self.imported.append({'path': path, 'id': material['id'], 'metetype': 'music',
+                              'width': 0, 'height': 0, 'duration': duration})
+        return material['id']
+
+    def add_images(self, images_batch: list[dict]):
+        """Add image batch entries (prepare_batch_data.py format) as photo segments."""
+        for image in images_batch:
+            start = to_us(image['start'])
+            duration = to_us(image['end']) - start
+            if duration <= 0:
+                continue
+
+            refs = [self._speed()]
+            intro = image.get('intro_animation')
+            effect = self._effect('intro', intro) if intro else None
+            if effect:
+                animation_id = new_id()
+                self.materials['material_animations'].append({
+                    'id': animation_id,
+                    'type': 'sticker_animation',
+                    'multi_language_current': 'none',
+                    'animations': [{
+                        'id': effect['effect_id'],
+                        'resource_id': effect['resource_id'],
+                        'name': effect.get('name', intro),
+                        'type': 'in',
+                        'start': 0,
+                        'duration': min(effect.get('duration_us', DEFAULT_INTRO_DURATION_US), duration),
+                        'panel': 'video',
+                        'material_type': 'video',
+                        'platform': 'all',
+                        'category_id': '',
+                        'category_name': '',
+                        'path': '',
+                        'request_id': '',
+                        'anim_adjust_params': None
+                    }]
+                })
+                refs.append(animation_id)
+
+            transition = image.get('transition')
+            effect = self._effect('transition', transition) if transition else None
+            if effect:
+                transition_id = new_id()
+                self.materials['transitions'].append({
+                    'id': transition_id,
+                    'type': 'transition',
+                    'name': effect.get('name', transition),
+                    'effect_id': effect['effect_id'],
+                    'resource_id': effect['resource_id'],
+                    'duration': min(effect.get('duration_us', DEFAULT_TRANSITION_DURATION_US), duration // 2),
+                    'is_overlap': effect.get('is_overlap', False),
+                    'platform': 'all',
+                    'category_id': '',
+                    'category_name': '',
+                    'path': '',
+                    'request_id': ''
+                })
+                refs.append(transition_id)
+
+            material_id = self._photo(image['image_url'])
+            self._track('video', image.get('track_name', 'main')).append(
+                make_segment(material_id, start, duration, extra_refs=refs, visual=True)
+            )
+            self.duration = max(self.duration, start + duration)
+
+    def add_audios(self, audios_batch: list[dict]):
+        """Add audio batch entries (prepare_batch_data.py format) as audio segments."""
+        for audio in audios_batch:
+            source_start = to_us(audio['start'])
+            duration = to_us(audio['end']) - source_start
+            if duration <= 0:
+                continue
+            target_start = to_us(audio['target_start'])
+            material_id = self._audio(audio['audio_url'], source_start + duration)
+            self._track('audio', audio.get('track_name', 'audio_main')).append(
+                make_segment(material_id, target_start, duration, source_start, extra_refs=[self._speed()])
+            )
+            self.duration = max(self.duration, target_start + duration)
+
+    def add_subtitles(self, subtitles: list[tuple[int, int, str]], track_name: str = 'subtitle'):
+        """Add (start_us, end_us, text) entries as text segments in the subtitle style."""
+        style = self.subtitle_style
+        fill = hex_to_rgb(style['font_color'])
+        stroke = hex_to_rgb(style['border_color'])
+        # API border width (0-100) -> JianYing stroke width (0-0.2)
+        stroke_width = style['border_width'] / 100 * 0.2
+
+        for start, end, text in subtitles:
+            duration = end - start
+            if duration <= 0:
+                continue
+            text_length = len(text.encode('utf-16-le')) // 2
+            content = {
+                'text': text,
+                'styles': [{
+                    'range': [0, text_length],
+                    'size': style['font_size'],
+                    'bold': False,
+                    'italic': False,
+                    'underline': False,
+                    'fill': {'alpha': 1.0, 'content': {'render_type': 'solid',
+                                                       'solid': {'alpha': 1.0, 'color': fill}}},
+                    'strokes': [{'content': {'solid': {'alpha': 1.0, 'color': stroke}},
+                                 'width': stroke_width}],
+                    'font': {'id': '', 'path': style.get('font_path', '')},
+                    'effectStyle': {'id': '', 'path': ''}
+                }]
+            }
+            material_id = new_id()
+            self.materials['texts'].append({
+                'id': material_id,
+                'type': 'subtitle',
+                'content': json.dumps(content, ensure_ascii=False),
+                'font_name': style['font'],
+                'font_path': style.get('font_path', ''),
+                'font_size': style['font_size'],
+                'text_color': style['font_color'],
+                'border_color': style['border_color'],
+                'border_width': stroke_width,
+                'alignment': 1,
+                'typesetting': 0,
+                'letter_spacing': 0.0,
+                'line_spacing': 0.02,
+                'line_max_width': 0.82,
+                'global_alpha': 1.0,
+                'check_flag': 7,
+                'words': {'end_time': [], 'start_time': [], 'text': []}
+            })
+            self._track('text', track_name).append(
+                make_segment(material_id, start, duration, transform_y=style['transform_y'], render_index=14000)
+            )
+            self.duration = max(self.duration, end)
+
+    def content(self, draft_id: str) -> dict:
+        """The draft_content.json document (tracks ordered video, audio, text)."""
+        order = {'video': 0, 'audio': 1, 'text': 2}
+        tracks = sorted(self.tracks.values(), key=lambda track: order[track['type']])
+        return {
+            'id': draft_id,
+            'version': DRAFT_VERSION,
+            'new_version': DRAFT_NEW_VERSION,
+            'name': '',
+            'fps': FPS,
+            'duration': self.duration,
+            'canvas_config': {'width': self.width, 'height': self.height, 'ratio': 'original'},
+            'color_space': 0,
+            'config': {
+                'adjust_max_index': 1,
+                'attachment_info': [],
+                'combination_max_index': 1,
+                'export_range': None,
+                'extract_audio_last_index': 1,
+                'lyrics_recognition_id': '',
+                'lyrics_sync': True,
+                'lyrics_taskinfo': [],
+                'maintrack_adsorb': True,
+                'material_save_mode': 0,
+                'original_sound_last_index': 1,
+                'record_audio_last_index': 1,
+                'sticker_max_index': 1,
+                'subtitle_recognition_id': '',
+                'subtitle_sync': True,
+                'subtitle_taskinfo': [],
+                'system_font_list': [],
+                'video_mute': False,
+                'zoom_info_params': None
+            },
+            'cover': None,
+            'create_time': 0,
+            'update_time': 0,
+            'extra_info': None,
+            'free_render_index_mode_on': False,
+            'group_container': None,
+            'keyframe_graph_list': [],
+            'keyframes': {name: [] for name in (
+                'adjusts', 'audios', 'effects', 'filters', 'handwrites', 'stickers', 'texts', 'videos'
+            )},
+            'materials': self.materials,
+            'mutable_config': None,
+            'platform': {'app_id': 3704, 'app_source': 'lv', 'app_version': '5.9.0', 'os': 'mac'},
+            'relationships': [],
+            'render_index_track_mode_on': False,
+            'retouch_cover': None,
+            'source': 'default',
+            'static_cover_image_path': '',
+            'tracks': tracks
+        }
+
+    def meta(self, draft_id: str, name: str, draft_dir: str) -> dict:
+        """The draft_meta_info.json document."""
+        now_us = time.time_ns() // 1000
+        imported = [{
+            'create_time': now_us // 1_000_000,
+            'duration': item['duration'],
+            'extra_info': os.path.basename(item['path']),
+            'file_Path': item['path'],
+            'height': item['height'],
+            'id': item['id'],
+            'import_time': now_us // 1_000_000,
+            'import_time_ms': now_us,
+            'item_source': 1,
+            'md5': '',
+            'metetype': item['metetype'],
+            'roughcut_time_range': {'duration': -1, 'start': -1},
+            'sub_time_range': {'duration': -1, 'start': -1},
+            'type': 0,
+            'width': item['width']
+        } for item in self.imported]
+
+        return {
+            'draft_cloud_last_action_download': False,
+            'draft_cover': '',
+            'draft_fold_path': draft_dir,
+            'draft_id': draft_id,
+            'draft_is_ai_shorts': False,
+            'draft_is_invisible': False,
+            'draft_json_file': os.path.join(draft_dir, 'draft_content.json'),
+            'draft_materials': [{'type': 0, 'value': imported}] + [
+                {'type': material_type, 'value': []} for material_type in (1, 2, 3, 6, 7, 8)
+            ],
+            'draft_name': name,
+            'draft_new_version': '',
+            'draft_removable_storage_device': '',
+            'draft_root_path': os.path.dirname(draft_dir),
+            'draft_segment_extra_info': [],
+            'draft_timeline_materials_size_': 0,
+            'tm_draft_create': now_us,
+            'tm_draft_modified': now_us,
+            'tm_duration': self.duration
+        }
+
+
+def default_draft_folder() -> str:
+    """First existing JianYing / CapCut drafts folder, or None."""
+    for folder in DRAFT_FOLDERS:
+        path = os.path.expanduser(folder)
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def write_json_atomic(path: str, data: dict):
+    """Write compact JSON through a temp file and os.replace()."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def write_draft(result: dict, srt_path: str, draft_folder: str, name: str,
+                width: int = 1920, height: int = 1080, effects: dict = None,
+                subtitle_style: dict = None) -> dict:
+    """
+    Write a draft from batch data and an SRT file.
+
+    Args:
+        result: Result of prepare_batch_data() / build_batch_data()
+        srt_path: subtitles.srt to add as the subtitle track (None = no subtitles)
+        draft_folder: JianYing / CapCut drafts root folder
+        name: Draft name; a timestamp is appended if a draft of that name exists
+        width: Canvas width
+        height: Canvas height
+        effects: Effect catalog (see load_effects)
+        subtitle_style: Overrides for SUBTITLE_STYLE
+
+    Returns:
+        Dict with draft_id, name, draft_dir, duration_us, images, audios,
+        subtitles and warnings
+    """
+    builder = DraftBuilder(width, height, effects, subtitle_style)
+    subtitles = []
+    if srt_path is not None:
+        with span('load_srt'), open(srt_path, 'r', encoding='utf-8') as f:
+            subtitles = parse_srt(f.read())
+
+    with hot('build_draft'):
+        builder.add_images(result['images_batch'])
+        builder.add_audios(result['audios_batch'])
+        builder.add_subtitles(subtitles)
+
+    draft_dir = os.path.join(draft_folder, name)
+    if os.path.exists(draft_dir):
+        name = f"{name}_{int(time.time())}"
+        draft_dir = os.path.join(draft_folder, name)
+    os.makedirs(draft_dir)
+
+    draft_id = new_id()
+    content = builder.content(draft_id)
+    with span('write_draft'):
+        write_json_atomic(os.path.join(draft_dir, 'draft_content.json'), content)
+        write_json_atomic(os.path.join(draft_dir, 'draft_info.json'), content)
+        write_json_atomic(os.path.join(draft_dir, 'draft_meta_info.json'),
+                          builder.meta(draft_id, name, draft_dir))
+
+    return {
+        'draft_id': draft_id,
+        'name': name,
+        'draft_dir': draft_dir,
+        'duration_us': builder.duration,
+        'images': len(builder.materials['videos']),
+        'audios': len(builder.materials['audios']),
+        'subtitles': len(builder.materials['texts']),
+        'warnings': builder.warnings
+    }
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Write a JianYing/CapCut draft from the project assets without the capcut-api service.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder'
+    )
+    parser.add_argument(
+        '--draft-folder', '-d',
+        default=None,
+        help='JianYing/CapCut drafts folder (default: the first existing com.lveditor.draft folder)'
+    )
+    parser.add_argument(
+        '--name', '-n',
+        default=None,
+        help='Draft name (default: project folder name)'
+    )
+    parser.add_argument(
+        '--width',
+        type=int,
+        default=1920,
+        help='Canvas width (default: 1920)'
+    )
+    parser.add_argument(
+        '--height',
+        type=int,
+        default=1080,
+        help='Canvas height (default: 1080)'
+    )
+    parser.add_argument(
+        '--srt',
+        default=None,
+        help='Subtitle file to use as is (default: regenerate project_folder/subtitles.srt from the same timeline)'
+    )
+    parser.add_argument(
+        '--max-words', '-m',
+        type=int,
+        default=12,
+        help='Maximum words per subtitle segment (default: 12)'
+    )
+    parser.add_argument(
+        '--effects',
+        default=None,
+        help='JSON catalog of intro animation / transition effect ids (see the module docstring)'
+    )
+    parser.add_argument(
+        '--narration',
+        action='store_true',
+        help='Use one joined narration.mp3 (see concat_audio.py) instead of per-scene audio clips'
+    )
+    parser.add_argument(
+        '--prepared-images',
+        action='store_true',
+        help='Use the resolution-fitted copies in images_prepared/ (see prepare_images.py) where up to date'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the audio duration cache (.audio_durations.json)'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent audio duration probes (default: {DEFAULT_WORKERS})'
+    )
+    add_profile_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.project_folder):
+        print(f"Error: Project folder not found: {args.project_folder}")
+        sys.exit(1)
+
+    project_folder = os.path.abspath(args.project_folder)
+    draft_folder = os.path.expanduser(args.draft_folder) if args.draft_folder else default_draft_folder()
+    if draft_folder is None or not os.path.isdir(draft_folder):
+        print(f"Error: Drafts folder not found: {draft_folder or ', '.join(DRAFT_FOLDERS)} "
+              f"(pass --draft-folder)")
+        sys.exit(1)
+    name = args.name or os.path.basename(project_folder.rstrip(os.sep))
+
+    with profile_run(profile_trace(args), 'draft_writer', project_folder, args.cprofile):
+        try:
+            from .prepare_batch_data import prepare_batch_data
+            effects = load_effects(args.effects)
+            start = time.perf_counter()
+            result = prepare_batch_data(project_folder, use_cache=not args.no_cache, workers=args.workers,
+                                        prepared_images=args.prepared_images, narration=args.narration)
+
+            srt_path = args.srt
+            if srt_path is None:
+                # Regenerate so the subtitles can't be stale against the audio (durations are cached)
+                from .generate_srt import generate_srt
+                srt_path, _, _ = generate_srt(project_folder, args.max_words, use_cache=not args.no_cache,
+                                              workers=args.workers, narration=args.narration)
+
+            draft = write_draft(result, srt_path, draft_folder, name, args.width, args.height, effects)
+            elapsed = time.perf_counter() - start
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    duration = draft['duration_us'] / 1_000_000
+    print(f"Draft name: {draft['name']}")
+    print(f"Draft ID: {draft['draft_id']}")
+    print(f"Canvas: {args.width}x{args.height}")
+    print(f"Images: {draft['images']}")
+    print(f"Audios: {draft['audios']}")
+    print(f"Subtitles: {draft['subtitles']}")
+    print(f"Total duration: {round(duration, 2)} seconds ({round(duration / 60, 2)} minutes)")
+    print(f"Built in: {elapsed:.2f}s")
+
+    warnings = result['warnings'] + draft['warnings']
+    if warnings:
+        print()
+        print("Warnings:")
+        for warning in warnings:
+            print(f"  - {warning}")
+
+    print()
+    print(f"Draft saved: {draft['draft_dir']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+Generate TTS audio and images for a project against an HTTP endpoint.
+
+Reads script_output.json and drives audio and image generation with
+asyncio, writing audio/audio_XXX.mp3 and images/image_XXX[_YY].png:
+
+- token-bucket rate limiting (--rate requests per second, --burst)
+- adaptive concurrency: the number of in-flight requests grows by one
+  after a full window of successes and halves on 429/503 responses
+- per-item retry with jittered exponential backoff (Retry-After honoured)
+- atomic writes (temp file + rename), so an interrupted run never leaves a
+  truncated file behind, and existing files are skipped on resume
+
+With --cache (see asset_cache.py), files generated before in any project
+are copied (reflinked where possible; hardlinked with --cache-hardlink) from
+the shared asset cache instead of being requested again, and new results
+are added to it.
+
+A failed item never stops the run: failures are reported at the end and
+the exit status is 1. Re-running the script only retries what is missing.
+
+Endpoint contract (JSON over POST, both URLs configurable):
+
+    TTS:    {"text", "voice_id", "speed", "format"}
+            -> {"audio": "<base64>"}
+    Images: {"prompt", "model", "size", "image_count"}
+            -> {"images": ["<base64>", ...]}  (image_count entries)
+
+The API key is sent as "Authorization: Bearer <key>" when --api-key or
+VIDEO_CREATOR_API_KEY is set. Only the standard library is used.
+
+Usage:
+    python generate_assets.py <project_folder> --tts-url URL --image-url URL [--only audio|images]
+
+Example:
+    python generate_assets.py /path/to/project --tts-url http://127.0.0.1:8080/tts \\
+        --image-url http://127.0.0.1:8080/image
+    python generate_assets.py /path/to/project --tts-url http://127.0.0.1:8080/tts --only audio --rate 2
+"""
+
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from .asset_cache import DEFAULT_MAX_BYTES, AssetCache, audio_key, image_key, parse_size
+
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+DEFAULT_CONCURRENCY = 3
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_RETRIES = 5
+DEFAULT_TIMEOUT = 120.0
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+THROTTLE_STATUSES = {429, 503}
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class GenerationError(Exception):
+    """A failed generation request."""
+
+    def __init__(self, message: str, status: int = None, retryable: bool = True,
+                 retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+    @property
+    def throttled(self) -> bool:
+        return self.status in THROTTLE_STATUSES
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for coroutines.
+
+    Holds up to `capacity` tokens, refilled at `rate` tokens per second;
+    each request takes one token. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to the endpoint (additive increase,
+    multiplicative decrease).
+
+    The limit grows by one after `limit` consecutive successes, up to
+    `maximum`, and halves (down to 1) whenever the endpoint throttles.
+    """
+
+    def __init__(self, initial: int, maximum: int):
+        self.maximum = max(1, maximum)
+        self.limit = min(max(1, initial), self.maximum)
+        self.active = 0
+        self._streak = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self, throttled: bool = False, succeeded: bool = False):
+        async with self._cond:
+            self.active -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self._streak = 0
+            elif succeeded:
+                self._streak += 1
+                if self._streak >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._streak = 0
+            self._cond.notify_all()
+
+
+def backoff_delay(attempt: int, retry_after: float = None) -> float:
+    """
+    Delay before retry number `attempt` (0-based), in seconds.
+
+    Full jitter: a random delay up to BACKOFF_BASE * 2**attempt, capped at
+    BACKOFF_CAP. A server-provided Retry-After is used as the lower bound.
+    """
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def post_json(url: str, payload: dict, api_key: str = None,
+              timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """
+    POST a JSON payload and decode the JSON response (blocking).
+
+    Raises:
+        GenerationError: On HTTP errors, network errors or invalid responses
+    """
+    headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    if api_key:
+        headers['Authorization'] = f'Bearer {api_key}'
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode('utf-8'), headers=headers, method='POST'
+    )
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+    except urllib.error.HTTPError as e:
+        retry_after = None
+        try:
+            retry_after = float(e.headers.get('Retry-After', ''))
+        except (TypeError, ValueError):
+            pass
+        raise GenerationError(
+            f"HTTP {e.code} {e.reason}", status=e.code,
+            retryable=e.code in RETRYABLE_STATUSES, retry_after=retry_after
+        )
+    except (urllib.error.URLError, OSError) as e:
+        reason = getattr(e, 'reason', e)
+        raise GenerationError(f"Request failed: {reason}")
+
+    try:
+        return json.loads(body)
+    except ValueError:
+        raise GenerationError("Invalid JSON response")
+
+
+def write_atomic(path: str, data: bytes):
+    """Write a file via a temp file in the same folder and an atomic rename."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _decode(value) -> bytes:
+    try:
+        data = base64.b64decode(value, validate=True)
+    except (TypeError, ValueError):
+        raise GenerationError("Invalid base64 payload")
+    if not data:
+        raise GenerationError("Empty payload")
+    return data
+
+
+def image_file_names(index: int, image_count: int, image_format: str = 'png') -> list[str]:
+    """File names for a scene's images (same naming rules as verify_images.py)."""
+    if image_count == 1:
+        return [f"image_{index:03d}.{image_format}"]
+    return [f"image_{index:03d}_{i:02d}.{image_format}" for i in range(1, image_count + 1)]
+
+
+def build_audio_items(script_data: list[dict], audio_folder: str, settings: dict,
+                      force: bool = False) -> list[dict]:
+    """
+    One TTS item per scene whose audio file is missing (or every scene with force).
+
+    Returns:
+        List of dicts with index, label, payload, paths and cache_keys
+    """
+    items = []
+    for i, scene in enumerate(script_data, start=1):
+        path = os.path.join(audio_folder, f"audio_{i:03d}.{settings['format']}")
+        if not force and os.path.isfile(path) and os.path.getsize(path) > 0:
+            continue
+        items.append({
+            'index': i,
+            'label': os.path.basename(path),
+            'payload': {
+                'text': scene.get('script', ''),
+                'voice_id': settings['voice_id'],
+                'speed': settings['speed'],
+                'format': settings['format']
+            },
+            'paths': [path],
+            'cache_keys': [audio_key(scene.get('script', ''), settings['voice_id'],
+                                     settings['speed'], settings['format'])]
+        })
+    return items
+
+
+def build_image_items(script_data: list[dict], images_folder: str, settings: dict,
+                      force: bool = False) -> list[dict]:
+    """
+    One image item per scene with any missing image (or every scene with force).
+
+    Returns:
+        List of dicts with index, label, payload, paths and cache_keys
+    """
+    items = []
+    for i, scene in enumerate(script_data, start=1):
+        image_count = scene.get('image_count', 1)
+        paths = [os.path.join(images_folder, name) for name in image_file_names(i, image_count)]
+        if not force and all(os.path.isfile(p) and os.path.getsize(p) > 0 for p in paths):
+            continue
+        items.append({
+            'index': i,
+            'label': os.path.basename(paths[0]) if image_count == 1 else f"image_{i:03d}_*",
+            'payload': {
+                'prompt': scene.get('prompt', ''),
+                'model': settings['model'],
+                'size': settings['size'],
+                'image_count': image_count
+            },
+            'paths': paths,
+            'cache_keys': [
+                image_key(scene.get('prompt', ''), settings['model'], settings['size'],
+                          slot, image_count)
+                for slot in range(1, image_count + 1)
+            ]
+        })
+    return items
+
+
+def extract_audio(response: dict, item: dict) -> list[bytes]:
+    """Decode a TTS response into one file body."""
+    if not isinstance(response, dict) or 'audio' not in response:
+        raise GenerationError("Response has no 'audio' field")
+    return [_decode(response['audio'])]
+
+
+def extract_images(response: dict, item: dict) -> list[bytes]:
+    """Decode an image response into one file body per expected image."""
+    images = response.get('images') if isinstance(response, dict) else None
+    if not isinstance(images, list):
+        raise GenerationError("Response has no 'images' list")
+    if len(images) < len(item['paths']):
+        # Models occasionally return fewer images than asked for; retry the scene
+        raise GenerationError(f"Expected {len(item['paths'])} images, got {len(images)}")
+    return [_decode(value) for value in images[:len(item['paths'])]]
+
+
+class Scheduler:
+    """
+    Runs one kind of generation request (TTS or images) for many items.
+
+    Usage:
+        scheduler = Scheduler(url, extract_audio, rate=5, burst=10)
+        failures = await scheduler.run(items)
+    """
+
+    def __init__(self, url: str, extract, api_key: str = None, rate: float = DEFAULT_RATE,
+                 burst: int = DEFAULT_BURST, concurrency: int = DEFAULT_CONCURRENCY,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT, executor: ThreadPoolExecutor = None,
+                 cache: AssetCache = None, on_done=None):
+        self.url = url
+        self.extract = extract
+        self.api_key = api_key
+        self.retries = retries
+        self.timeout = timeout
+        self.executor = executor
+        self.cache = cache
+        self.on_done = on_done
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AdaptiveLimiter(concurrency, max_concurrency)
+        self.succeeded = 0
+        self.cached = 0
+        self.attempts = 0
+        self.throttled = 0
+
+    async def _request(self, item: dict) -> list[bytes]:
+        await self.bucket.acquire()
+        await self.limiter.acquire()
+        throttled = False
+        succeeded = False
+        try:
+            self.attempts += 1
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                self.executor, post_json, self.url, item['payload'], self.api_key, self.timeout
+            )
+            bodies = self.extract(response, item)
+            # Only a usable response counts towards raising the concurrency limit
+            succeeded = True
+        except GenerationError as e:
+            throttled = e.throttled
+            if throttled:
+                self.throttled += 1
+            raise
+        finally:
+            await self.limiter.release(throttled=throttled, succeeded=succeeded)
+        return bodies
+
+    async def _run_item(self, item: dict) -> str:
+        """Generate one item with retries; returns None or an error message."""
+        if self.cache is not None and all(
+            self.cache.fetch(key, path) for key, path in zip(item['cache_keys'], item['paths'])
+        ):
+            self.cached += 1
+            self.succeeded += 1
+            return None
+
+        for attempt in range(self.retries + 1):
+            try:
+                bodies = await self._request(item)
+            except GenerationError as e:
+                if not e.retryable or attempt == self.retries:
+                    return str(e)
+                await asyncio.sleep(backoff_delay(attempt, e.retry_after))
+                continue
+
+            for path, key, data in zip(item['paths'], item['cache_keys'], bodies):
+                write_atomic(path, data)
+                if self.cache is not None:
+                    self.cache.store(key, data, os.path.splitext(path)[1])
+            self.succeeded += 1
+            return None
+
+    async def run(self, items: list[dict]) -> dict[int, str]:
+        """
+        Generate all items concurrently.
+
+        Returns:
+            Dict of 1-based scene index -> error message, for failed items only
+        """
+        async def run_one(item):
+            try:
+                error = await self._run_item(item)
+            except Exception as e:
+                # E.g. a write or cache error: fail this item, not the whole run
+                error = f"{type(e).__name__}: {e}"
+            if self.on_done:
+                self.on_done(item, error)
+            return error
+
+        errors = await asyncio.gather(*(run_one(item) for item in items))
+        return {item['index']: error for item, error in zip(items, errors) if error}
+
+
+async def generate_assets(project_folder: str, tts_url: str = None, image_url: str = None,
+                          audio_settings: dict = None, image_settings: dict = None,
+                          api_key: str = None, rate: float = DEFAULT_RATE,
+                          burst: int = DEFAULT_BURST, concurrency: int = DEFAULT_CONCURRENCY,
+                          max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                          retries: int = DEFAULT_RETRIES, timeout: float = DEFAULT_TIMEOUT,
+                          force: bool = False, cache: AssetCache = None,
+                          on_done=None) -> dict:
+    """
+    Generate missing audio and images for a project.
+
+    Audio and images run side by side, each with its own rate limiter and
+    concurrency limit. Pass only tts_url or only image_url to run one kind.
+
+    Args:
+        project_folder: Path to the project folder
+        tts_url: TTS endpoint URL (None to skip audio)
+        image_url: Image endpoint URL (None to skip images)
+        audio_settings: voice_id, speed and format
+        image_settings: model and size
+        api_key: Optional bearer token
+        rate: Requests per second per endpoint (0 = unlimited)
+        burst: Token bucket capacity
+        concurrency: Initial in-flight requests per endpoint
+        max_concurrency: Upper bound for adaptive concurrency
+        retries: Retries per item after the first attempt
+        timeout: Per-request timeout in seconds
+        force: Regenerate files that already exist
+        cache: Optional shared asset cache to link hits from and store results in
+        on_done: Optional callback(item, error) after each item
+
+    Returns:
+        Dict with audio and images entries, each holding total, succeeded,
+        cached, attempts, throttled and failures (scene index -> error)
+    """
+    script_path = os.path.join(project_folder, 'script_output.json')
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script output not found: {script_path}")
+    with open(script_path, 'r', encoding='utf-8') as f:
+        script_data = json.load(f)
+
+    jobs = {}
+    if tts_url:
+        audio_folder = os.path.join(project_folder, 'audio')
+        os.makedirs(audio_folder, exist_ok=True)
+        jobs['audio'] = (tts_url, extract_audio,
+                         build_audio_items(script_data, audio_folder, audio_settings, force))
+    if image_url:
+        images_folder = os.path.join(project_folder, 'images')
+        os.makedirs(images_folder, exist_ok=True)
+        jobs['images'] = (image_url, extract_images,
+                          build_image_items(script_data, images_folder, image_settings, force))
+
+    # Blocking HTTP calls run on one shared pool sized for the worst case
+    executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency) * max(1, len(jobs)))
+    try:
+        schedulers = {
+            kind: Scheduler(
+                url, extract, api_key=api_key, rate=rate, burst=burst,
+                concurrency=concurrency, max_concurrency=max_concurrency,
+                retries=retries, timeout=timeout, executor=executor, cache=cache,
+                on_done=on_done
+            )
+            for kind, (url, extract, _) in jobs.items()
+        }
+        failures = await asyncio.gather(*(
+            schedulers[kind].run(items) for kind, (_, _, items) in jobs.items()
+        ))
+    finally:
+        executor.shutdown(wait=False)
+        if cache is not None:
+            cache.save()
+
+    return {
+        kind: {
+            'total': len(jobs[kind][2]),
+            'succeeded': schedulers[kind].succeeded,
+            'cached': schedulers[kind].cached,
+            'attempts': schedulers[kind].attempts,
+            'throttled': schedulers[kind].throttled,
+            'failures': failed
+        }
+        for kind, failed in zip(jobs, failures)
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Generate TTS audio and images for a project against an HTTP endpoint.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder containing script_output.json'
+    )
+    parser.add_argument('--tts-url', help='TTS endpoint URL')
+    parser.add_argument('--image-url', help='Image generation endpoint URL')
+    parser.add_argument(
+        '--only',
+        choices=['audio', 'images'],
+        help='Generate only audio or only images'
+    )
+    parser.add_argument(
+        '--api-key',
+        default=os.environ.get('VIDEO_CREATOR_API_KEY'),
+        help='Bearer token (default: $VIDEO_CREATOR_API_KEY)'
+    )
+    parser.add_argument('--voice', '-v', default='English_Gentle-voiced_man', help='TTS voice ID')
+    parser.add_argument('--speed', '-s', type=float, default=1.2, help='TTS speed (default: 1.2)')
+    parser.add_argument('--format', '-f', default='mp3', help='Audio format (default: mp3)')
+    parser.add_argument('--model', default='doubao-seedream-4-0-250828', help='Image model')
+    parser.add_argument('--size', default='2048x2048', help='Image resolution (default: 2048x2048)')
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=DEFAULT_RATE,
+        help=f'Requests per second per endpoint, 0 for unlimited (default: {DEFAULT_RATE:g})'
+    )
+    parser.add_argument(
+        '--burst',
+        type=int,
+        default=DEFAULT_BURST,
+        help=f'Token bucket size (default: {DEFAULT_BURST})'
+    )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Initial concurrent requests per endpoint (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f'Upper bound for adaptive concurrency (default: {DEFAULT_MAX_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f'Retries per item (default: {DEFAULT_RETRIES})'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f'Per-request timeout in seconds (default: {DEFAULT_TIMEOUT:g})'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse and fill the shared asset cache (see asset_cache.py)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=None,
+        help='Asset cache directory (default: $VIDEO_CREATOR_CACHE or ~/.cache/video-creator/assets)'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=parse_size,
+        default=DEFAULT_MAX_BYTES,
+        help='Asset cache size limit, e.g. 500M or 2G (default: 5G)'
+    )
+    parser.add_argument(
+        '--cache-hardlink',
+        action='store_true',
+        help='Hardlink cache hits instead of reflinking/copying them (saves disk space; '
+             'project files must then never be rewritten in place)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate files that already exist'
+    )
+
+    args = parser.parse_args()
+
+    project_folder = os.path.abspath(args.project_folder)
+    if not os.path.isdir(project_folder):
+        print(f"Error: Project folder not found: {project_folder}")
+        sys.exit(1)
+
+    tts_url = args.tts_url if args.only != 'images' else None
+    image_url = args.image_url if args.only != 'audio' else None
+    if not tts_url and not image_url:
+        print("Error: Provide --tts-url and/or --image-url")
+        sys.exit(1)
+
+    def on_done(item, error):
+        if error:
+            print(f"  ❌ {item['label']}: {error}")
+        else:
+            print(f"  ✅ {item['label']}")
+
+    print(f"🎬 生成项目资源: {project_folder}")
+    print()
+
+    cache = AssetCache(args.cache_dir, args.cache_size, args.cache_hardlink) if args.cache else None
+
+    try:
+        result = asyncio.run(generate_assets(
+            project_folder,
+            tts_url=tts_url,
+            image_url=image_url,
+            audio_settings={'voice_id': args.voice, 'speed': args.speed,
+                            'format': args.format.lower().lstrip('.')},
+            image_settings={'model': args.model, 'size': args.size},
+            api_key=args.api_key,
+            rate=args.rate,
+            burst=args.burst,
+            concurrency=args.concurrency,
+            max_concurrency=args.max_concurrency,
+            retries=args.retries,
+            timeout=args.timeout,
+            force=args.force,
+            cache=cache,
+            on_done=on_done
+        ))
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON - {e}")
+        sys.exit(1)
+
+    names = {'audio': '音频', 'images': '图像'}
+    failed = False
+    print()
+    for kind, stats in result.items():
+        print(f"{names[kind]}: {stats['succeeded']}/{stats['total']} 成功 "
+              f"(缓存命中 {stats['cached']}), "
+              f"{stats['attempts']} 次请求, {stats['throttled']} 次限流")
+        for index, error in sorted(stats['failures'].items()):
+            failed = True
+            print(f"  - Index {index}: {error}")
+
+    if cache is not None:
+        print(f"资源缓存累计: 命中 {cache.stats['hits']}, 未命中 {cache.stats['misses']} ({cache.cache_dir})")
+
+    if failed:
+        print()
+        print("部分项目失败，重新运行即可只补充缺失的文件")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Generate SRT subtitle files with smart splitting for long text.
+
+This script reads script data and audio files from a project folder,
+then generates an SRT file with automatic subtitle splitting for long sentences.
+
+Usage:
+    python generate_srt.py <project_folder> [--max-words N] [--stream]
+
+Example:
+    python generate_srt.py psy
+    python generate_srt.py psy --max-words 10
+    python generate_srt.py psy --stream  # bounded memory for very long projects
+    python generate_srt.py psy --narration  # time scenes by narration.json (concat_audio.py)
+
+Requirements:
+    pip install mutagen  (optional, only needed for non-MP3 audio)
+    pip install numpy    (optional, vectorized timeline for long projects)
+
+Profiling:
+    --profile records a timing span per stage and per audio file as
+    Chrome trace JSON (--profile-output TRACE_JSON to choose the path) and
+    prints a summary table; --cprofile also runs the subtitle layout loop
+    under cProfile (see profiling.py).
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .audio_durations import (
+    DEFAULT_WINDOW, DEFAULT_WORKERS, DurationCache, iter_durations, probe_audio_duration, resolve_durations
+)
+from .json_stream import iter_json_array
+from .profiling import add_profile_arguments, hot, profile_run, profile_trace, span
+from .project_index import FileEntry, ProjectIndex, scan_folder, scan_project
+from .timeline import US_PER_MS, iter_timeline
+
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.ogg', '.m4a'}
+
+
+def format_timestamp(ms: float) -> str:
+    """Convert milliseconds to SRT timestamp format (HH:MM:SS,mmm)."""
+    hours = int(ms // 3600000)
+    minutes = int((ms % 3600000) // 60000)
+    seconds = int((ms % 60000) // 1000)
+    millis = int(ms % 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
+
+
+def get_audio_duration_ms(audio_path: str, cache: DurationCache = None) -> float:
+    """
+    Get audio duration in milliseconds from file.
+
+    Args:
+        audio_path: Path to the audio file
+        cache: Optional project duration cache to read from and update
+
+    Returns:
+        Duration in milliseconds
+    """
+    if cache is not None:
+        seconds = cache.get_duration(audio_path)
+    else:
+        seconds = probe_audio_duration(audio_path)
+
+    return seconds * 1000  # Convert seconds to milliseconds
+
+
+def split_subtitle(text: str, max_words: int = 12) -> list[str]:
+    """
+    Split a subtitle text into segments if it exceeds max_words.
+
+    Args:
+        text: The subtitle text to split
+        max_words: Maximum words per segment (default: 12)
+
+    Returns:
+        List of text segments
+    """
+    words = text.split()
+    if len(words) <= max_words:
+        return [text]
+
+    segments = []
+    while words:
+        segment = words[:max_words]
+        words = words[max_words:]
+        segments.append(' '.join(segment))
+
+    return segments
+
+
+def get_audio_files(audio_folder: str) -> list[str]:
+    """
+    Get sorted list of audio files from the audio folder.
+
+    Args:
+        audio_folder: Path to the audio folder
+
+    Returns:
+        List of audio file paths sorted by filename (audio_001.mp3, audio_002.mp3, ...)
+    """
+    return [entry.path for entry in get_audio_entries(audio_folder)]
+
+
+def get_audio_entries(audio_folder: str) -> list[FileEntry]:
+    """
+    List audio files (with their stat) from a single scan of the audio folder.
+
+    Args:
+        audio_folder: Path to the audio folder
+
+    Returns:
+        List of FileEntry sorted by filename (audio_001.mp3, audio_002.mp3, ...)
+    """
+    # Sort by filename to ensure correct order (audio_001, audio_002, ...)
+    return [
+        entry for name, entry in sorted(scan_folder(audio_folder).items())
+        if Path(name).suffix.lower() in AUDIO_EXTENSIONS
+    ]
+
+
+def load_data(project_folder: str) -> tuple[list[FileEntry], list[dict]]:
+    """
+    Load audio files and script data from project folder.
+
+    Args:
+        project_folder: Path to the project folder
+
+    Returns:
+        Tuple of (audio_file_entries, script_data); entries are sorted by
+        file name and carry the path and stat from a single directory scan
+    """
+    audio_folder = os.path.join(project_folder, 'audio')
+    script_path = os.path.join(project_folder, 'script_output.json')
+
+    if not os.path.exists(audio_folder):
+        raise FileNotFoundError(f"Audio folder not found: {audio_folder}")
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script output not found: {script_path}")
+
+    with span('scan_audio'):
+        audio_files = get_audio_entries(audio_folder)
+
+    if not audio_files:
+        raise FileNotFoundError(f"No audio files found in: {audio_folder}")
+
+    with span('load_script'), open(script_path, 'r', encoding='utf-8') as f:
+        script_data = json.load(f)
+
+    return audio_files, script_data
+
+
+def iter_srt_scenes(scenes: Iterable[dict], durations: Iterable[float], max_words: int = 12,
+                    start_scene: int = 0, start_us: int = 0, start_index: int = 1,
+                    window: int = None) -> Iterator[list[str]]:
+    """
+    Generate SRT entries scene by scene.
+
+    Scenes and durations may be lazy iterables (see --stream); both are aligned
+    with scene 0 and entries before start_scene are skipped. Segment
+    boundaries come from the shared integer-microsecond timeline (see
+    timeline.py), so they line up exactly with the batch data.
+
+    Args:
+        scenes: Scene dicts from script_output.json
+        durations: Scene audio durations in seconds, in timeline order
+        max_words: Maximum words per subtitle segment (default: 12)
+        start_scene: 0-based scene to start from (earlier scenes are skipped)
+        start_us: Timeline position in microseconds where start_scene begins
+        start_index: SRT sequence number of the first emitted entry
+        window: Scenes laid out per vectorized pass (default: all at once)
+
+    Yields:
+        List of SRT entry blocks ("index\ntimestamps\ntext\n") per scene
+    """
+    srt_index = start_index
+
+    def segment(scene):
+        return split_subtitle(scene.get('script', ''), max_words)
+
+    timeline = iter_timeline(scenes, durations, start_scene, start_us, segment, window)
+    for i, (scene, timing, segments) in enumerate(timeline, start_scene):
+        if len(segments) > 1:
+            text = scene.get('script', '')
+            print(f"  Scene {i+1}: Split into {len(segments)} segments ({len(text.split())} words)")
+
+        blocks = []
+        for text, (start, end) in zip(segments, timing.subtitles):
+            blocks.append(
+                f"{srt_index}\n"
+                f"{format_timestamp(start // US_PER_MS)} --> {format_timestamp(end // US_PER_MS)}\n"
+                f"{text}\n"
+            )
+            srt_index += 1
+
+        yield blocks
+
+
+def build_srt(script_data: list[dict], durations: list[float], max_words: int = 12,
+              start_scene: int = 0, start_us: int = 0, start_index: int = 1) -> tuple[str, int, int]:
+    """
+    Build SRT content for consecutive scenes.
+
+    Args:
+        script_data: Scene dicts from script_output.json
+        durations: Scene audio durations in seconds, in timeline order
+        max_words: Maximum words per subtitle segment (default: 12)
+        start_scene: 0-based scene to start from (earlier scenes are skipped)
+        start_us: Timeline position in microseconds where start_scene begins
+        start_index: SRT sequence number of the first emitted entry
+
+    Returns:
+        Tuple of (srt_text, entries_emitted, split_count)
+    """
+    srt_blocks = []
+    split_count = 0
+
+    for blocks in iter_srt_scenes(script_data, durations, max_words, start_scene, start_us, start_index):
+        if len(blocks) > 1:
+            split_count += 1
+        srt_blocks.extend(blocks)
+
+    return '\n'.join(srt_blocks), len(srt_blocks), split_count
+
+
+def narration_durations(project_folder: str, workers: int = DEFAULT_WORKERS,
+                        project_index: ProjectIndex = None) -> list[float]:
+    """
+    Scene durations from the joined narration track's offset table.
+
+    Builds (or reuses) narration.mp3 / narration.json, see concat_audio.py,
+    so subtitles share the frame-exact scene offsets of the batch data.
+    """
+    from .concat_audio import build_narration, scene_audio_entries, scene_durations
+
+    if project_index is None:
+        with span('scan_project'):
+            project_index = scan_project(project_folder)
+    audio_entries = scene_audio_entries(project_index)
+    if not audio_entries:
+        raise FileNotFoundError(f"No audio_XXX.mp3 files found in: {os.path.join(project_folder, 'audio')}")
+    with span('build_narration'):
+        return scene_durations(build_narration(project_folder, audio_entries, workers=workers))
+
+
+def generate_srt(project_folder: str, max_words: int = 12, output_path: str = None,
+                 use_cache: bool = True, workers: int = DEFAULT_WORKERS,
+                 narration: bool = False, project_index: ProjectIndex = None,
+                 script_data: list[dict] = None, cache: DurationCache = None) -> tuple[str, int, int]:
+    """
+    Generate SRT file with smart subtitle splitting.
+
+    Args:
+        project_folder: Path to the project folder
+        max_words: Maximum words per subtitle segment (default: 12)
+        output_path: Custom output path (default: project_folder/subtitles.srt)
+        use_cache: Read/write the project's audio duration cache (default: True)
+        workers: Concurrent audio duration probes (default: 8)
+        narration: Time scenes by the joined narration track (concat_audio.py)
+        project_index: Optional pre-scanned project index (audio/ is scanned if omitted)
+        script_data: Optional pre-loaded script_output.json entries
+        cache: Optional already loaded duration cache (see resolve_durations)
+
+    Returns:
+        Tuple of (output_path, total_entries, split_count): the written SRT
+        file, its number of entries and the number of scenes split in several
+    """
+    if project_index is None or script_data is None:
+        audio_files, loaded = load_data(project_folder)
+        script_data = loaded if script_data is None else script_data
+    else:
+        audio_files = project_index.audio_entries(AUDIO_EXTENSIONS)
+        if not audio_files:
+            raise FileNotFoundError(f"No audio files found in: {project_index.audio_folder}")
+
+    if len(audio_files) != len(script_data):
+        print(f"Warning: Audio files ({len(audio_files)}) and script entries ({len(script_data)}) count mismatch")
+
+    if narration:
+        durations = narration_durations(project_folder, workers, project_index)
+    else:
+        # Resolve all durations up front (concurrently), in timeline order
+        durations = resolve_durations(project_folder, audio_files[:len(script_data)], use_cache, workers,
+                                      cache=cache)
+
+    with hot('layout'):
+        srt_text, total_entries, split_count = build_srt(script_data, durations, max_words)
+
+    # Determine output path
+    if output_path is None:
+        output_path = os.path.join(project_folder, 'subtitles.srt')
+
+    # Write SRT file
+    with span('write_srt'), open(output_path, 'w', encoding='utf-8') as f:
+        f.write(srt_text)
+
+    return output_path, total_entries, split_count
+
+
+def stream_srt(project_folder: str, max_words: int = 12, output_path: str = None,
+               use_cache: bool = True, workers: int = DEFAULT_WORKERS,
+               narration: bool = False) -> tuple[str, int, int]:
+    """
+    Generate the SRT file with bounded memory.
+
+    script_output.json is read incrementally, durations are probed in
+    fixed-size windows and each scene's entries are written as soon as they
+    are computed. Output is identical to generate_srt().
+
+    Args:
+        project_folder: Path to the project folder
+        max_words: Maximum words per subtitle segment (default: 12)
+        output_path: Custom output path (default: project_folder/subtitles.srt)
+        use_cache: Read/write the project's audio duration cache (default: True)
+        workers: Concurrent audio duration probes (default: 8)
+        narration: Time scenes by the joined narration track (concat_audio.py)
+
+    Returns:
+        Tuple of (output_path, total_entries, split_count)
+    """
+    audio_folder = os.path.join(project_folder, 'audio')
+    script_path = os.path.join(project_folder, 'script_output.json')
+
+    if not os.path.exists(audio_folder):
+        raise FileNotFoundError(f"Audio folder not found: {audio_folder}")
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script output not found: {script_path}")
+
+    with span('scan_audio'):
+        audio_files = get_audio_entries(audio_folder)
+    if not audio_files:
+        raise FileNotFoundError(f"No audio files found in: {audio_folder}")
+
+    if output_path is None:
+        output_path = os.path.join(project_folder, 'subtitles.srt')
+
+    scenes = iter_json_array(script_path)
+    if narration:
+        cache = None
+        durations = iter(narration_durations(project_folder, workers))
+    else:
+        cache = DurationCache(project_folder) if use_cache else None
+        durations = iter_durations(audio_files, cache, workers)
+
+    total_entries = 0
+    split_count = 0
+    scene_count = 0
+
+    # Reading, probing, layout and writing are interleaved window by window;
+    # a failed run must not leave a short SRT behind, so write beside it
+    tmp_path = output_path + '.tmp'
+    try:
+        with hot('stream_scenes'), open(tmp_path, 'w', encoding='utf-8') as f:
+            for blocks in iter_srt_scenes(scenes, durations, max_words, window=DEFAULT_WINDOW):
+                scene_count += 1
+                if len(blocks) > 1:
+                    split_count += 1
+                for block in blocks:
+                    if total_entries:
+                        f.write('\n')
+                    f.write(block)
+                    total_entries += 1
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, output_path)
+
+    # zip() stops at the shorter input; count what is left of the script
+    scene_count += sum(1 for _ in scenes)
+    if len(audio_files) != scene_count:
+        print(f"Warning: Audio files ({len(audio_files)}) and script entries ({scene_count}) count mismatch")
+
+    if cache is not None:
+        with span('save_duration_cache'):
+            cache.save()
+
+    return output_path, total_entries, split_count
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Generate SRT subtitle files with smart splitting for long text.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder containing audio/ and script_output.json'
+    )
+    parser.add_argument(
+        '--max-words', '-m',
+        type=int,
+        default=12,
+        help='Maximum words per subtitle segment (default: 12)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default=None,
+        help='Custom output path for SRT file (default: project_folder/subtitles.srt)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the audio duration cache (.audio_durations.json)'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent audio duration probes (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Bounded-memory mode: read script_output.json incrementally and write entries as they are generated'
+    )
+    parser.add_argument(
+        '--narration',
+        action='store_true',
+        help='Time scenes by the joined narration.mp3 offset table (see concat_audio.py), '
+             'matching prepare_batch_data.py --narration'
+    )
+    add_profile_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    # Check if project folder exists
+    if not os.path.isdir(args.project_folder):
+        print(f"Error: Project folder not found: {args.project_folder}")
+        sys.exit(1)
+
+    print(f"Generating SRT for: {args.project_folder}")
+    print(f"Max words per segment: {args.max_words}")
+    print()
+
+    trace_dir = os.path.dirname(os.path.abspath(args.output)) if args.output else args.project_folder
+    with profile_run(profile_trace(args), 'generate_srt', trace_dir, args.cprofile):
+        try:
+            build = stream_srt if args.stream else generate_srt
+            output_path, total_entries, split_count = build(
+                args.project_folder,
+                max_words=args.max_words,
+                output_path=args.output,
+                use_cache=not args.no_cache,
+                workers=args.workers,
+                narration=args.narration
+            )
+
+            print()
+            print(f"SRT file generated: {output_path}")
+            print(f"Total subtitle entries: {total_entries}")
+            print(f"Scenes with splits: {split_count}")
+
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON - {e}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
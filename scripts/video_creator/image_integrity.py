@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Fast structural integrity check for generated PNG images.
+
+An interrupted image batch can leave zero-byte or truncated PNGs behind.
+They look "present" to a name-only check, so the MCP tool's skip-existing
+resume never regenerates them. validate_png() reads only the head and tail
+of each file (seek, no decoding):
+
+- the 8-byte PNG signature
+- the IHDR chunk: length, type, non-zero dimensions and CRC
+- the IEND trailer at the very end of the file
+
+Results are cached per project in <project_folder>/.image_integrity.json,
+keyed by file name and validated against size and mtime, and files are
+checked in parallel on a thread pool.
+
+Usage:
+    python image_integrity.py <file.png> [<file.png> ...]
+"""
+
+import json
+import os
+import struct
+import sys
+import zlib
+
+from .profiling import span
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+IEND_TRAILER = b'\x00\x00\x00\x00IEND\xaeB`\x82'
+HEAD_SIZE = 8 + 25  # signature + IHDR chunk (length, type, 13 bytes data, CRC)
+
+CACHE_FILENAME = '.image_integrity.json'
+CACHE_VERSION = 1
+DEFAULT_WORKERS = 8
+
+
+def validate_png(path: str) -> str:
+    """
+    Check a PNG file's signature, IHDR chunk and IEND trailer.
+
+    Args:
+        path: Path to the PNG file
+
+    Returns:
+        None if the file looks intact, otherwise a short reason
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return 'empty file'
+            if size < HEAD_SIZE + len(IEND_TRAILER):
+                return f'truncated ({size} bytes)'
+
+            head = f.read(HEAD_SIZE)
+            f.seek(-len(IEND_TRAILER), os.SEEK_END)
+            tail = f.read(len(IEND_TRAILER))
+    except OSError as e:
+        return f'unreadable ({e.strerror})'
+
+    if head[:8] != PNG_SIGNATURE:
+        return 'not a PNG (bad signature)'
+
+    length, chunk_type = struct.unpack('>I4s', head[8:16])
+    if chunk_type != b'IHDR' or length != 13:
+        return 'missing IHDR chunk'
+
+    width, height = struct.unpack('>II', head[16:24])
+    if width == 0 or height == 0:
+        return 'invalid dimensions'
+
+    crc = struct.unpack('>I', head[29:33])[0]
+    if zlib.crc32(head[12:29]) & 0xFFFFFFFF != crc:
+        return 'corrupt IHDR (CRC mismatch)'
+
+    if tail != IEND_TRAILER:
+        return 'truncated (missing IEND)'
+
+    return None
+
+
+class IntegrityCache:
+    """
+    Sidecar cache of validation results for one project folder.
+
+    Usage:
+        cache = IntegrityCache(project_folder)
+        problems = check_images(entries, cache)
+        cache.save()
+    """
+
+    def __init__(self, project_folder: str):
+        self.cache_path = os.path.join(project_folder, CACHE_FILENAME)
+        self.entries = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Load the sidecar cache, ignoring missing or unreadable files."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+            self.entries = data.get('entries', {})
+
+    def lookup(self, entry) -> tuple[bool, str]:
+        """
+        Return (hit, reason) for a scanned FileEntry.
+
+        reason is None for intact files; hit is False if the file is not
+        cached or changed since it was checked.
+        """
+        cached = self.entries.get(entry.name)
+        if cached and cached.get('size') == entry.size and cached.get('mtime_ns') == entry.mtime_ns:
+            return True, cached.get('reason')
+        return False, None
+
+    def store(self, entry, reason: str):
+        """Record a validation result for a scanned FileEntry."""
+        self.entries[entry.name] = {
+            'size': entry.size,
+            'mtime_ns': entry.mtime_ns,
+            'reason': reason
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the cache back to disk if anything changed (atomic replace)."""
+        if not self._dirty:
+            return
+
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self.entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # A read-only project folder must not break verification
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._dirty = False
+
+
+def check_images(entries: list, cache: IntegrityCache = None,
+                 workers: int = DEFAULT_WORKERS) -> dict[str, str]:
+    """
+    Validate many PNG files concurrently.
+
+    Args:
+        entries: Scanned FileEntry objects (see project_index.scan_folder)
+        cache: Optional integrity cache to read from and update
+        workers: Maximum number of concurrent checks
+
+    Returns:
+        Dict of file name -> reason, for corrupt files only
+    """
+    to_check = []
+    problems = {}
+
+    for entry in entries:
+        hit, reason = cache.lookup(entry) if cache is not None else (False, None)
+        if hit:
+            if reason:
+                problems[entry.name] = reason
+        else:
+            to_check.append(entry)
+
+    def check(entry):
+        with span('validate_png', 'file', file=entry.name):
+            return validate_png(entry.path)
+
+    if to_check:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            reasons = list(executor.map(check, to_check))
+
+        for entry, reason in zip(to_check, reasons):
+            if cache is not None:
+                cache.store(entry, reason)
+            if reason:
+                problems[entry.name] = reason
+
+    return problems
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: {os.path.basename(sys.argv[0])} <file.png> [<file.png> ...]")
+        sys.exit(1)
+
+    failed = False
+    for path in sys.argv[1:]:
+        reason = validate_png(path)
+        if reason:
+            failed = True
+            print(f"{path}: {reason}")
+        else:
+            print(f"{path}: ok")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
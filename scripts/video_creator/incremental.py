@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Incremental draft preparation driven by per-scene content hashes.
+
+A build state file (<project_folder>/.build_state.json) records one hash per
+scene covering its script text, prompt, image_count and the name/size/mtime
+of its audio and image files, plus the scene's audio duration. On rebuild:
+
+- unchanged scenes reuse their recorded duration (no audio probing)
+- outputs before the first changed scene are kept as they are
+- timeline offsets, batch entries and subtitles are recomputed only from the
+  first changed scene onwards and patched into the existing output files
+
+The state also records the size and mtime of each output file it wrote and
+the output mode (plain per-scene audio and original images). Anything that
+makes patching unsafe (no or unreadable state, different settings or mode,
+output files missing or rewritten since, e.g. by prepare --narration or
+watch_project --refresh-batch, scenes without audio) falls back to a full
+build via manifest.build_manifest(), which then records a fresh state.
+
+Usage:
+    python manifest.py <project_folder> --incremental
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from .audio_durations import DEFAULT_WORKERS, resolve_durations
+from .generate_srt import build_srt, split_subtitle
+from .prepare_batch_data import build_batch_data, get_scene_audio, load_script_output, save_batch_data
+from .project_index import FileEntry, ProjectIndex, scan_project
+from .timeline import timeline_offset
+from .verify_images import save_missing_json, verify_images
+
+STATE_FILENAME = '.build_state.json'
+STATE_VERSION = 2
+
+# The only output mode incremental builds produce; outputs written in any
+# other mode are never patched
+BUILD_MODE = {'narration': False, 'prepared_images': False, 'stream': False}
+
+# Start of an SRT entry: its index line followed by the timestamp line
+# (subtitle text may itself contain blank lines)
+SRT_ENTRY_RE = re.compile(r'^\d+[ \t]*\n\d+:\d{2}:\d{2},\d{3}[ \t]*-->', re.MULTILINE)
+
+
+def _file_signature(entry: FileEntry) -> list:
+    """Name, size and mtime of a scanned file (None if missing)."""
+    if entry is None:
+        return None
+    return [entry.name, entry.size, entry.mtime_ns]
+
+
+def scene_hash(scene: dict, scene_idx: int, project_index: ProjectIndex,
+               audio_entry: FileEntry) -> str:
+    """
+    Hash everything that affects a scene's batch entries and subtitles.
+
+    Args:
+        scene: Scene dict from script_output.json
+        scene_idx: 0-based scene index
+        project_index: Scanned project folder
+        audio_entry: The scene's audio file, or None if missing
+
+    Returns:
+        Hex digest
+    """
+    image_count = scene.get('image_count', 1)
+    payload = {
+        'script': scene.get('script', ''),
+        'prompt': scene.get('prompt', ''),
+        'image_count': image_count,
+        'audio': _file_signature(audio_entry),
+        'images': [
+            _file_signature(project_index.image_entry(scene_idx, img_idx, image_count))
+            for img_idx in range(image_count)
+        ]
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def load_state(project_folder: str) -> dict:
+    """Load the build state file, or None if missing, unreadable or outdated."""
+    state_path = os.path.join(project_folder, STATE_FILENAME)
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+
+def output_signatures(paths: dict) -> dict:
+    """Output name -> [size, mtime_ns] of each output file (None if missing)."""
+    signatures = {}
+    for name, path in paths.items():
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            signatures[name] = None
+            continue
+        signatures[name] = [stat.st_size, stat.st_mtime_ns]
+    return signatures
+
+
+def save_state(project_folder: str, settings: dict, hashes: list[str], durations: list[float],
+               warnings: list[str], outputs: dict):
+    """Write the build state file (atomic replace)."""
+    state_path = os.path.join(project_folder, STATE_FILENAME)
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': STATE_VERSION,
+            'settings': settings,
+            'outputs': outputs,
+            'scenes': [
+                {'hash': h, 'duration': d} for h, d in zip(hashes, durations)
+            ],
+            'warnings': warnings
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+
+def _scene_of_warning(warning: str) -> int:
+    """1-based scene number a build_batch_data() warning refers to."""
+    try:
+        return int(warning.split(':', 1)[0].split()[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _srt_prefix(srt_text: str, entries: int) -> str:
+    """The first entries subtitles of srt_text, without trailing blank lines."""
+    starts = [match.start() for match in SRT_ENTRY_RE.finditer(srt_text)]
+    end = starts[entries] if entries < len(starts) else len(srt_text)
+    return srt_text[:end].rstrip('\n')
+
+
+def _output_paths(output_dir: str) -> dict:
+    return {
+        'images_batch': os.path.join(output_dir, 'images_batch.json'),
+        'audios_batch': os.path.join(output_dir, 'audios_batch.json'),
+        'subtitles': os.path.join(output_dir, 'subtitles.srt')
+    }
+
+
+def incremental_build(project_folder: str, max_words: int = 12, use_cache: bool = True,
+                      workers: int = DEFAULT_WORKERS, output_dir: str = None) -> dict:
+    """
+    Rebuild only what changed since the last build and patch the outputs.
+
+    Args:
+        project_folder: Path to the project folder
+        max_words: Maximum words per subtitle segment (default: 12)
+        use_cache: Read/write the project's audio duration cache (default: True)
+        workers: Concurrent audio duration probes (default: 8)
+        output_dir: Directory for batch JSON and SRT files (default: project_folder)
+
+    Returns:
+        Dict shaped like manifest.build_manifest() plus:
+        - changed_scenes: 1-based indexes of scenes that were reprocessed
+        - first_changed: 1-based index the timeline was recomputed from (None if nothing changed)
+        - full_rebuild: True if the state could not be used
+        - paths: dict of output name -> written path
+    """
+    from .manifest import build_manifest, missing_scene_audio, write_manifest
+
+    output_dir = output_dir or project_folder
+    settings = {'max_words': max_words, 'output_dir': os.path.abspath(output_dir), 'mode': BUILD_MODE}
+
+    script_output = load_script_output(project_folder)
+    project_index = scan_project(project_folder)
+    audio_entries = get_scene_audio(project_index)
+
+    hashes = [
+        scene_hash(scene, i, project_index, audio_entries[i] if i < len(audio_entries) else None)
+        for i, scene in enumerate(script_output)
+    ]
+
+    state = load_state(project_folder)
+    paths = _output_paths(output_dir)
+    usable = (
+        state is not None
+        and state.get('settings') == settings
+        and not missing_scene_audio(project_index, len(script_output))
+        # Outputs must still be the ones this state describes
+        and state.get('outputs') == output_signatures(paths)
+        and None not in state['outputs'].values()
+    )
+
+    if not usable:
+        result = build_manifest(project_folder, max_words, use_cache, workers)
+        result['paths'] = write_manifest(result, project_folder, output_dir)
+        result['changed_scenes'] = list(range(1, len(script_output) + 1))
+        result['first_changed'] = 1 if script_output else None
+        result['full_rebuild'] = True
+        if not result['missing_audio']:
+            save_state(project_folder, settings, hashes, result['durations'], result['batch']['warnings'],
+                       output_signatures(paths))
+        return result
+
+    old_scenes = state['scenes']
+    entry_counts = [
+        len(split_subtitle(scene.get('script', ''), max_words)) for scene in script_output
+    ]
+    changed = [
+        i for i, h in enumerate(hashes)
+        if i >= len(old_scenes) or old_scenes[i]['hash'] != h
+    ]
+    first_changed = changed[0] if changed else None
+    if first_changed is None and len(old_scenes) != len(hashes):
+        # Scenes were removed from the end
+        first_changed = len(hashes)
+
+    # Durations: reuse unchanged scenes, probe only changed ones
+    changed_set = set(changed)
+    durations = [
+        old_scenes[i]['duration'] if i not in changed_set else None
+        for i in range(len(script_output))
+    ]
+    if changed:
+        probed = resolve_durations(
+            project_folder, [audio_entries[i] for i in changed], use_cache, workers
+        )
+        for i, duration in zip(changed, probed):
+            durations[i] = duration
+
+    verification = verify_images(project_folder, project_index, script_output)
+    audio_paths = [entry.path for entry in audio_entries]
+
+    with open(paths['images_batch'], 'r', encoding='utf-8') as f:
+        images_batch = json.load(f)
+    with open(paths['audios_batch'], 'r', encoding='utf-8') as f:
+        audios_batch = json.load(f)
+    with open(paths['subtitles'], 'r', encoding='utf-8') as f:
+        srt_text = f.read()
+
+    warnings = state.get('warnings', [])
+
+    if first_changed is not None:
+        # Timeline position and output counts of the unchanged prefix
+        start_us = timeline_offset(durations[:first_changed])
+        prefix_images = sum(
+            1 for i in range(first_changed)
+            for img_idx in range(script_output[i].get('image_count', 1))
+            if project_index.image_entry(i, img_idx, script_output[i].get('image_count', 1))
+        )
+        prefix_entries = sum(entry_counts[:first_changed])
+
+        suffix = build_batch_data(
+            script_output, audio_paths, durations, project_index,
+            start_scene=first_changed, start_us=start_us
+        )
+        images_batch = images_batch[:prefix_images] + suffix['images_batch']
+        audios_batch = audios_batch[:first_changed] + suffix['audios_batch']
+        warnings = [
+            w for w in warnings if 0 < _scene_of_warning(w) <= first_changed
+        ] + suffix['warnings']
+
+        suffix_text, _, _ = build_srt(
+            script_output, durations, max_words,
+            start_scene=first_changed, start_us=start_us, start_index=prefix_entries + 1
+        )
+        prefix = _srt_prefix(srt_text, prefix_entries) if prefix_entries else ''
+        if prefix and suffix_text:
+            srt_text = prefix + '\n\n' + suffix_text
+        elif prefix:
+            srt_text = prefix + '\n'
+        else:
+            srt_text = suffix_text
+
+        save_batch_data({'images_batch': images_batch, 'audios_batch': audios_batch}, output_dir)
+        with open(paths['subtitles'], 'w', encoding='utf-8') as f:
+            f.write(srt_text)
+
+        save_state(project_folder, settings, hashes, durations, warnings, output_signatures(paths))
+
+    total_duration = sum(durations)
+    batch = {
+        'images_batch': images_batch,
+        'audios_batch': audios_batch,
+        'stats': {
+            'total_scenes': len(script_output),
+            'total_images': len(images_batch),
+            'total_audios': len(audios_batch),
+            'total_duration_seconds': round(total_duration, 2),
+            'total_duration_minutes': round(total_duration / 60, 2)
+        },
+        'warnings': warnings
+    }
+
+    result_paths = dict(paths)
+    if not verification['all_complete']:
+        result_paths['missing_images'] = save_missing_json(verification, project_folder)
+
+    return {
+        'batch': batch,
+        'srt': {
+            'text': srt_text,
+            'total_entries': sum(entry_counts),
+            'split_count': sum(1 for count in entry_counts if count > 1)
+        },
+        'verification': verification,
+        'missing_audio': [],
+        'durations': durations,
+        'changed_scenes': [i + 1 for i in changed],
+        'first_changed': first_changed + 1 if first_changed is not None else None,
+        'full_rebuild': False,
+        'paths': result_paths
+    }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory JSON array reading and writing.
+
+iter_json_array() yields the elements of a top-level JSON array (such as
+script_output.json) one at a time while reading the file in fixed-size
+chunks, so the whole document is never held in memory.
+
+JsonArrayWriter writes a JSON array element by element in compact form
+(no indentation), for batch outputs that are produced scene by scene. It
+writes to <path>.tmp and renames it into place only when the with block
+completes, so a failed run never leaves a short array that still parses.
+
+Usage:
+    for scene in iter_json_array('script_output.json'):
+        ...
+
+    with JsonArrayWriter('images_batch.json') as writer:
+        writer.write({"image_url": ...})
+"""
+
+import json
+import os
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789+-.eE'
+
+
+def iter_json_array(path: str, chunk_size: int = CHUNK_SIZE):
+    """
+    Iterate over the elements of a top-level JSON array in a file.
+
+    Args:
+        path: Path to a JSON file whose top-level value is an array
+        chunk_size: Number of characters read per chunk
+
+    Yields:
+        Decoded array elements, in order
+
+    Raises:
+        json.JSONDecodeError: If the file is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def fill():
+            """Append the next chunk; returns False at end of file."""
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] != '[':
+            raise json.JSONDecodeError("Expecting '['", buffer, pos)
+        pos += 1
+
+        skip_whitespace()
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+
+        while True:
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Element spans the chunk boundary: read more and retry
+                    if eof or not fill():
+                        raise
+                    continue
+                if not buffer[end:].strip(_NUMBER_CHARS) and not eof and fill():
+                    # A scalar may continue in the next chunk (a number cut
+                    # as '-0.' or '1e' decodes as its shorter prefix); decode again
+                    continue
+                break
+            pos = end
+            yield value
+
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            if buffer[pos] == ']':
+                return
+            if buffer[pos] != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+
+
+class JsonArrayWriter:
+    """Write a compact JSON array one element at a time (atomic replace on success)."""
+
+    def __init__(self, path: str, ensure_ascii: bool = True):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.ensure_ascii = ensure_ascii
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        self._file.write('[')
+        return self
+
+    def write(self, item):
+        """Append one element to the array."""
+        if self.count:
+            self._file.write(',')
+        self._file.write(json.dumps(item, ensure_ascii=self.ensure_ascii, separators=(',', ':')))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # Keep whatever complete file was there before
+            self._file.close()
+            os.remove(self.tmp_path)
+            return False
+
+        try:
+            self._file.write(']')
+        finally:
+            self._file.close()
+        os.replace(self.tmp_path, self.path)
+        return False
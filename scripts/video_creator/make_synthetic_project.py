@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Create a synthetic project folder for benchmarks and manual testing.
+
+Generates, fully offline:
+
+- script_output.json with N scenes, a mix of image_count values (1-3) and
+  script lengths (some long enough to be split into several subtitles)
+- audio/audio_XXX.mp3: short, valid CBR MP3 streams (32 kbps MPEG-1 Layer
+  III frames of silence, 1-4 seconds each)
+- images/image_XXX[_YY].png: tiny valid 1x1 PNGs
+- deliberately missing and corrupt (truncated) images, and optionally
+  missing audio at the end of the timeline
+
+The output is deterministic for a given --seed.
+
+Usage:
+    python make_synthetic_project.py <project_folder> --scenes N [--seed 1]
+
+Example:
+    python make_synthetic_project.py /tmp/bench_1k --scenes 1000
+    python make_synthetic_project.py /tmp/broken --scenes 50 --missing-images 0.1 --corrupt-images 0.05
+"""
+
+import json
+import os
+import random
+import struct
+import sys
+import zlib
+
+# MPEG-1 Layer III, 32 kbps, 44.1 kHz, no padding: 104-byte frames of 1152 samples
+MP3_FRAME = b'\xff\xfb\x10\x00' + b'\x00' * 100
+MP3_FRAME_SECONDS = 1152 / 44100
+
+WORDS = (
+    "your brain on toxic love is like a slot machine player at three in the "
+    "morning every small reward keeps you pulling the lever hoping the next "
+    "message will finally make everything feel okay again"
+).split()
+
+
+def make_png() -> bytes:
+    """A valid 1x1 grayscale PNG."""
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(chunk_type + data) & 0xFFFFFFFF
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', crc)
+
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 0, 0, 0, 0))
+        + chunk(b'IDAT', zlib.compress(b'\x00\x00'))
+        + chunk(b'IEND', b'')
+    )
+
+
+def image_names(index: int, image_count: int) -> list[str]:
+    """Image file names for a scene (project naming rules)."""
+    if image_count == 1:
+        return [f"image_{index:03d}.png"]
+    return [f"image_{index:03d}_{i:02d}.png" for i in range(1, image_count + 1)]
+
+
+def make_project(project_folder: str, scenes: int, seed: int = 1,
+                 missing_images: float = 0.02, corrupt_images: float = 0.01,
+                 missing_audio: int = 0) -> dict:
+    """
+    Write a synthetic project folder.
+
+    Args:
+        project_folder: Folder to create (existing files are overwritten)
+        scenes: Number of scenes
+        seed: Random seed
+        missing_images: Fraction of image files to leave out
+        corrupt_images: Fraction of image files to write truncated
+        missing_audio: Number of audio files to leave out at the end
+
+    Returns:
+        Dict with scenes, images, missing_images, corrupt_images, audio and
+        missing_audio counts
+    """
+    rng = random.Random(seed)
+    audio_folder = os.path.join(project_folder, 'audio')
+    images_folder = os.path.join(project_folder, 'images')
+    os.makedirs(audio_folder, exist_ok=True)
+    os.makedirs(images_folder, exist_ok=True)
+
+    png = make_png()
+    counts = {'scenes': scenes, 'images': 0, 'missing_images': 0, 'corrupt_images': 0,
+              'audio': 0, 'missing_audio': 0}
+    script_output = []
+
+    for index in range(1, scenes + 1):
+        image_count = rng.choice((1, 1, 1, 2, 3))
+        frames = rng.randint(40, 160)
+        # Roughly 2.5 words per second, so long clips get split subtitles
+        word_count = max(3, int(frames * MP3_FRAME_SECONDS * 2.5 * rng.uniform(0.8, 1.2)))
+
+        script_output.append({
+            'index': index,
+            'script': ' '.join(rng.choice(WORDS) for _ in range(word_count)).capitalize() + '.',
+            'prompt': f"Digital drawing, stick figure style, beige background, scene {index}",
+            'image_count': image_count
+        })
+
+        if index <= scenes - missing_audio:
+            with open(os.path.join(audio_folder, f"audio_{index:03d}.mp3"), 'wb') as f:
+                f.write(MP3_FRAME * frames)
+            counts['audio'] += 1
+        else:
+            counts['missing_audio'] += 1
+
+        for name in image_names(index, image_count):
+            roll = rng.random()
+            if roll < missing_images:
+                counts['missing_images'] += 1
+                continue
+            data = png
+            if roll < missing_images + corrupt_images:
+                data = png[:rng.randint(0, len(png) - 1)]
+                counts['corrupt_images'] += 1
+            with open(os.path.join(images_folder, name), 'wb') as f:
+                f.write(data)
+            counts['images'] += 1
+
+    with open(os.path.join(project_folder, 'script_output.json'), 'w', encoding='utf-8') as f:
+        json.dump(script_output, f, ensure_ascii=False, indent=2)
+
+    return counts
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Create a synthetic project folder for benchmarks and testing.'
+    )
+    parser.add_argument('project_folder', help='Folder to create')
+    parser.add_argument('--scenes', '-n', type=int, default=100, help='Number of scenes (default: 100)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    parser.add_argument(
+        '--missing-images',
+        type=float,
+        default=0.02,
+        help='Fraction of image files to leave out (default: 0.02)'
+    )
+    parser.add_argument(
+        '--corrupt-images',
+        type=float,
+        default=0.01,
+        help='Fraction of image files to write truncated (default: 0.01)'
+    )
+    parser.add_argument(
+        '--missing-audio',
+        type=int,
+        default=0,
+        help='Number of audio files to leave out at the end of the timeline (default: 0)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        counts = make_project(
+            args.project_folder, args.scenes, args.seed,
+            args.missing_images, args.corrupt_images, args.missing_audio
+        )
+    except OSError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Created {args.project_folder}")
+    print(f"  Scenes: {counts['scenes']}")
+    print(f"  Images: {counts['images']} ({counts['missing_images']} missing, "
+          f"{counts['corrupt_images']} corrupt)")
+    print(f"  Audio: {counts['audio']} ({counts['missing_audio']} missing)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Prepare every draft input for a project in one pass.
+
+Loads script_output.json once, scans images/ and audio/ once and probes each
+audio file at most once, then computes a single timeline and writes:
+
+- images_batch.json / audios_batch.json  (same as prepare_batch_data.py)
+- subtitles.srt                          (same as generate_srt.py)
+- missing_images.json                    (same as verify_images.py, only if images are missing)
+
+With --incremental, per-scene content hashes recorded in .build_state.json
+limit the work to scenes that changed since the last build (see incremental.py).
+
+Usage:
+    python manifest.py <project_folder> [--max-words N] [--output-dir DIR] [--incremental]
+
+Example:
+    python manifest.py /path/to/project
+    python manifest.py /path/to/project --max-words 10
+    python manifest.py /path/to/project --incremental
+"""
+
+import json
+import os
+import sys
+
+from .audio_durations import DEFAULT_WORKERS, resolve_durations
+from .generate_srt import build_srt
+from .prepare_batch_data import build_batch_data, get_scene_audio, load_script_output, save_batch_data
+from .project_index import ProjectIndex, scan_project
+from .verify_audio import get_expected_file
+from .verify_images import save_missing_json, verify_images
+
+
+def missing_scene_audio(project_index: ProjectIndex, scene_count: int) -> list[int]:
+    """1-based indexes of scenes whose audio_XXX.mp3 is missing, by expected name."""
+    return [
+        index for index in range(1, scene_count + 1)
+        if get_expected_file(index) not in project_index.audio
+    ]
+
+
+def build_manifest(project_folder: str, max_words: int = 12, use_cache: bool = True,
+                   workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    Compute batch data, subtitles and the missing-asset report for a project.
+
+    Args:
+        project_folder: Path to the project folder
+        max_words: Maximum words per subtitle segment (default: 12)
+        use_cache: Read/write the project's audio duration cache (default: True)
+        workers: Concurrent audio duration probes (default: 8)
+
+    Returns:
+        Dict with:
+        - batch: result of prepare_batch_data.build_batch_data()
+        - srt: dict with text, total_entries and split_count
+        - verification: result of verify_images.verify_images()
+        - missing_audio: 1-based scene indexes without an audio file
+        - durations: scene audio durations in seconds, in timeline order
+    """
+    script_output = load_script_output(project_folder)
+
+    audio_folder = os.path.join(project_folder, 'audio')
+    if not os.path.exists(audio_folder):
+        raise FileNotFoundError(f"Audio folder not found: {audio_folder}")
+
+    images_folder = os.path.join(project_folder, 'images')
+    if not os.path.exists(images_folder):
+        raise FileNotFoundError(f"Images folder not found: {images_folder}")
+
+    project_index = scan_project(project_folder)
+
+    audio_entries = get_scene_audio(project_index)
+    if not audio_entries:
+        raise FileNotFoundError(f"No audio files found in: {audio_folder}")
+
+    durations = resolve_durations(project_folder, audio_entries[:len(script_output)], use_cache, workers)
+
+    batch = build_batch_data(
+        script_output, [entry.path for entry in audio_entries], durations, project_index
+    )
+    srt_text, total_entries, split_count = build_srt(script_output, durations, max_words)
+    verification = verify_images(project_folder, project_index, script_output)
+
+    return {
+        'batch': batch,
+        'srt': {
+            'text': srt_text,
+            'total_entries': total_entries,
+            'split_count': split_count
+        },
+        'verification': verification,
+        'missing_audio': missing_scene_audio(project_index, len(script_output)),
+        'durations': durations
+    }
+
+
+def write_manifest(result: dict, project_folder: str, output_dir: str = None) -> dict:
+    """
+    Write all outputs of build_manifest().
+
+    Args:
+        result: Result dict from build_manifest()
+        project_folder: Path to the project folder
+        output_dir: Directory for batch JSON and SRT files (default: project_folder)
+
+    Returns:
+        Dict of output name -> written path
+    """
+    output_dir = output_dir or project_folder
+
+    images_batch_path, audios_batch_path = save_batch_data(result['batch'], output_dir)
+
+    srt_path = os.path.join(output_dir, 'subtitles.srt')
+    with open(srt_path, 'w', encoding='utf-8') as f:
+        f.write(result['srt']['text'])
+
+    paths = {
+        'images_batch': images_batch_path,
+        'audios_batch': audios_batch_path,
+        'subtitles': srt_path
+    }
+
+    if not result['verification']['all_complete']:
+        paths['missing_images'] = save_missing_json(result['verification'], project_folder)
+
+    return paths
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Prepare batch data, subtitles and the missing-asset report in one pass.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder containing script_output.json, audio/ and images/'
+    )
+    parser.add_argument(
+        '--max-words', '-m',
+        type=int,
+        default=12,
+        help='Maximum words per subtitle segment (default: 12)'
+    )
+    parser.add_argument(
+        '--output-dir', '-o',
+        type=str,
+        default=None,
+        help='Output directory for batch JSON and SRT files (default: project_folder)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the audio duration cache (.audio_durations.json)'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent audio duration probes (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--incremental', '-i',
+        action='store_true',
+        help='Only reprocess scenes changed since the last --incremental build (.build_state.json)'
+    )
+
+    args = parser.parse_args(argv)
+
+    # Resolve to absolute path (CapCut API requires absolute paths)
+    project_folder = os.path.abspath(args.project_folder)
+
+    if not os.path.isdir(project_folder):
+        print(f"Error: Project folder not found: {project_folder}")
+        sys.exit(1)
+
+    print(f"Preparing draft inputs for: {project_folder}")
+    print()
+
+    try:
+        if args.incremental:
+            from .incremental import incremental_build
+            result = incremental_build(
+                project_folder,
+                max_words=args.max_words,
+                use_cache=not args.no_cache,
+                workers=args.workers,
+                output_dir=args.output_dir
+            )
+            paths = result['paths']
+        else:
+            result = build_manifest(
+                project_folder,
+                max_words=args.max_words,
+                use_cache=not args.no_cache,
+                workers=args.workers
+            )
+            paths = write_manifest(result, project_folder, args.output_dir)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON - {e}")
+        sys.exit(1)
+
+    stats = result['batch']['stats']
+    verification = result['verification']
+    print()
+    print(f"Total scenes: {stats['total_scenes']}")
+    print(f"Total images: {stats['total_images']} (expected {verification['expected_count']})")
+    print(f"Total audios: {stats['total_audios']}")
+    print(f"Total duration: {stats['total_duration_seconds']} seconds ({stats['total_duration_minutes']} minutes)")
+    print(f"Subtitle entries: {result['srt']['total_entries']} ({result['srt']['split_count']} scenes split)")
+
+    if args.incremental:
+        if result['full_rebuild']:
+            print("Incremental: no usable build state, performed a full build")
+        elif result['first_changed'] is None:
+            print("Incremental: no changes since the last build")
+        else:
+            print(f"Incremental: {len(result['changed_scenes'])} changed scene(s), "
+                  f"timeline recomputed from scene {result['first_changed']}")
+
+    if result['batch']['warnings']:
+        print()
+        print("Warnings:")
+        for warning in result['batch']['warnings']:
+            print(f"  - {warning}")
+
+    if result['missing_audio']:
+        print()
+        print(f"Missing audio for {len(result['missing_audio'])} scene(s): "
+              f"{', '.join(str(i) for i in result['missing_audio'])}")
+
+    print()
+    print("Outputs saved:")
+    for path in paths.values():
+        print(f"  - {path}")
+
+
+if __name__ == '__main__':
+    main()
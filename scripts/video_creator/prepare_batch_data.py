@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+Prepare batch data for CapCut video creation.
+
+This script reads script_output.json and audio files from a project folder,
+then generates images_batch.json and audios_batch.json for use with CapCut API.
+
+Usage:
+    python prepare_batch_data.py <project_folder> [--stream]
+
+Example:
+    python prepare_batch_data.py /Users/zhenhaohua/code/test_empty/r2_0
+    python prepare_batch_data.py ./long_documentary --stream  # bounded memory, compact JSON
+    python prepare_batch_data.py ./my_project --prepared-images  # use images_prepared/ (prepare_images.py)
+    python prepare_batch_data.py ./my_project --narration  # one joined narration.mp3 (concat_audio.py)
+    python prepare_batch_data.py ./my_project --pages --page-items 50  # also write batch_pages/ (batch_pages.py)
+
+Requirements:
+    pip install mutagen  (optional, only needed for non-MP3 audio)
+    pip install numpy    (optional, vectorized timeline for long projects)
+
+Profiling:
+    --profile records a timing span per stage (JSON load, directory scan,
+    duration probing, layout, output writing) and per audio file, writes
+    them as Chrome trace JSON (--profile-output TRACE_JSON to choose the
+    path) and prints a summary table; --cprofile also runs the layout loop
+    under cProfile (see profiling.py).
+"""
+
+import itertools
+import json
+import os
+import sys
+from typing import Iterable, Iterator
+
+from .audio_durations import (
+    DEFAULT_WINDOW, DEFAULT_WORKERS, DurationCache, iter_durations, probe_audio_duration,
+    resolve_durations
+)
+from .batch_pages import DEFAULT_MAX_BYTES, DEFAULT_MAX_ITEMS, MANIFEST_FILENAME, PAGES_FOLDER, write_batch_pages
+from .json_stream import JsonArrayWriter, iter_json_array
+from .profiling import add_profile_arguments, hot, profile_run, profile_trace, span
+from .project_index import FileEntry, ProjectIndex, scan_project
+from .timeline import iter_timeline, to_seconds
+
+# Animation lists (循环使用)
+INTRO_ANIMATIONS = [
+    "Fade_In", "Zoom_1", "Zoom_2", "Slide_Down", "Slide_Up",
+    "Slide_Left", "Slide_Right", "Rotate", "Flip", "Mini_Zoom"
+]
+
+TRANSITIONS = [
+    "Dissolve", "Mix", "Black_Fade", "White_Flash", "Blur",
+    "Slide", "Wipe_Right", "Wipe_Left", "Flip", "Glitch"
+]
+
+
+def get_audio_duration(audio_path: str, cache: DurationCache = None) -> float:
+    """
+    Get audio duration in seconds from file.
+
+    Args:
+        audio_path: Path to the audio file
+        cache: Optional project duration cache to read from and update
+
+    Returns:
+        Duration in seconds
+    """
+    if cache is not None:
+        return cache.get_duration(audio_path)
+    return probe_audio_duration(audio_path)
+
+
+def get_image_path(project_index: ProjectIndex, scene_idx: int, img_idx: int, image_count: int) -> str:
+    """
+    Get image path based on naming convention.
+
+    Single image scenes use image_XXX.png (falling back to image_XXX_01.png),
+    multi-image scenes use image_XXX_YY.png. Paths are resolved from the
+    scanned project index, without touching the filesystem.
+
+    Args:
+        project_index: Scanned project folder (see project_index.scan_project)
+        scene_idx: 0-based scene index
+        img_idx: 0-based image index within scene
+        image_count: Total images in this scene
+
+    Returns:
+        Absolute path to image file, or None if not found
+    """
+    return project_index.image_path(scene_idx, img_idx, image_count)
+
+
+def load_script_output(project_folder: str) -> list[dict]:
+    """
+    Load script_output.json from a project folder.
+
+    Args:
+        project_folder: Path to the project folder
+
+    Returns:
+        List of scene dicts
+    """
+    script_path = os.path.join(project_folder, 'script_output.json')
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script output not found: {script_path}")
+
+    with span('load_script'), open(script_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def get_scene_audio(project_index: ProjectIndex) -> list[FileEntry]:
+    """
+    Get the scene audio files (audio_XXX.mp3) sorted by file name.
+
+    Args:
+        project_index: Scanned project folder
+
+    Returns:
+        List of FileEntry, one per scene in timeline order
+    """
+    return [
+        entry for entry in project_index.audio_entries(prefix='audio_')
+        if entry.name.endswith('.mp3')
+    ]
+
+
+def iter_scene_entries(scenes: Iterable[dict], audio_paths: list[str], durations: Iterable[float],
+                       project_index: ProjectIndex, start_scene: int = 0,
+                       start_us: int = 0, window: int = None,
+                       image_paths: dict = None) -> Iterator[dict]:
+    """
+    Lay out the timeline scene by scene.
+
+    Scenes and durations may be lazy iterables (see --stream); both are aligned
+    with scene 0 and entries before start_scene are skipped. All boundaries
+    come from the shared integer-microsecond timeline (see timeline.py).
+
+    Args:
+        scenes: Scene dicts from script_output.json
+        audio_paths: Scene audio file paths, in timeline order
+        durations: Audio durations in seconds, aligned with the scenes
+        project_index: Scanned project folder used to resolve image paths
+        start_scene: 0-based scene to start from (earlier scenes are skipped)
+        start_us: Timeline position in microseconds where start_scene begins
+        window: Scenes laid out per vectorized pass (default: all at once)
+        image_paths: Optional source path -> prepared image path mapping
+            (see prepare_images.prepared_image_paths)
+
+    Yields:
+        Dict per scene with scene_idx, images (image batch entries), audio
+        (audio batch entry, or None if the scene has no audio file, which ends
+        the timeline), duration and warnings
+    """
+    scenes = iter(scenes)
+    durations = itertools.islice(durations, len(audio_paths))
+    scene_idx = start_scene
+
+    for scene, timing, _ in iter_timeline(scenes, durations, start_scene, start_us, window=window):
+        warnings = []
+        images = []
+
+        image_count = scene.get('image_count', 1)
+
+        # Get animation for this scene
+        intro_animation = INTRO_ANIMATIONS[scene_idx % len(INTRO_ANIMATIONS)]
+        transition = TRANSITIONS[scene_idx % len(TRANSITIONS)]
+
+        # Add images for this scene
+        for img_idx, (img_start, img_end) in enumerate(timing.images):
+            image_path = get_image_path(project_index, scene_idx, img_idx, image_count)
+            if image_path is None:
+                warnings.append(f"Scene {scene_idx + 1}: Missing image {img_idx + 1}/{image_count}")
+                continue
+
+            image_config = {
+                "image_url": image_paths.get(image_path, image_path) if image_paths else image_path,
+                "start": to_seconds(img_start),
+                "end": to_seconds(img_end),
+                "track_name": "main"
+            }
+
+            # Only add animation to first image of scene
+            if img_idx == 0:
+                image_config["intro_animation"] = intro_animation
+                image_config["transition"] = transition
+
+            images.append(image_config)
+
+        # Add audio for this scene
+        audio = {
+            "audio_url": audio_paths[scene_idx],
+            "start": 0,
+            "end": to_seconds(timing.duration),
+            "target_start": to_seconds(timing.start),
+            "track_name": "audio_main"
+        }
+
+        yield {
+            "scene_idx": scene_idx,
+            "images": images,
+            "audio": audio,
+            "duration": to_seconds(timing.duration),
+            "warnings": warnings
+        }
+        scene_idx += 1
+
+    # The timeline ends at the first scene without an audio file
+    if scene_idx >= len(audio_paths) and next(scenes, None) is not None:
+        yield {
+            "scene_idx": scene_idx,
+            "images": [],
+            "audio": None,
+            "duration": 0,
+            "warnings": [f"Scene {scene_idx + 1}: No corresponding audio file"]
+        }
+
+
+def resolve_prepared_images(project_folder: str, project_index: ProjectIndex) -> dict:
+    """
+    Map source image paths to their images_prepared/ copies (see prepare_images.py).
+
+    Images without an up-to-date prepared copy keep their original path.
+    """
+    from .prepare_images import prepared_image_paths
+    with span('load_prepared_images'):
+        return prepared_image_paths(project_folder, project_index.images)
+
+
+def resolve_narration(project_folder: str, audio_entries: list[FileEntry],
+                      workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    Join the scene audio into narration.mp3 (see concat_audio.py).
+
+    Returns:
+        The narration offset table; scene durations come from its exact
+        frame counts instead of per-file probes
+    """
+    from .concat_audio import build_narration
+    with span('build_narration'):
+        return build_narration(project_folder, audio_entries, workers=workers)
+
+
+def build_stats(total_scenes: int, total_images: int, total_audios: int, total_duration: float) -> dict:
+    """Summary stats shared by the in-memory and streaming builders."""
+    return {
+        "total_scenes": total_scenes,
+        "total_images": total_images,
+        "total_audios": total_audios,
+        "total_duration_seconds": round(total_duration, 2),
+        "total_duration_minutes": round(total_duration / 60, 2)
+    }
+
+
+def build_batch_data(script_output: list[dict], audio_paths: list[str], durations: list[float],
+                     project_index: ProjectIndex, start_scene: int = 0,
+                     start_us: int = 0, image_paths: dict = None) -> dict:
+    """
+    Lay out the timeline and build image/audio batch entries.
+
+    Args:
+        script_output: Scene dicts from script_output.json
+        audio_paths: Scene audio file paths, in timeline order
+        durations: Audio durations in seconds, aligned with the scenes
+        project_index: Scanned project folder used to resolve image paths
+        start_scene: 0-based scene to start from (earlier scenes are skipped)
+        start_us: Timeline position in microseconds where start_scene begins
+        image_paths: Optional source path -> prepared image path mapping
+
+    Returns:
+        Dict with images_batch, audios_batch, stats and warnings
+    """
+    total_duration = to_seconds(start_us)
+    images_batch = []
+    audios_batch = []
+    warnings = []
+
+    for entry in iter_scene_entries(script_output, audio_paths, durations, project_index,
+                                    start_scene, start_us, image_paths=image_paths):
+        images_batch.extend(entry["images"])
+        if entry["audio"] is not None:
+            audios_batch.append(entry["audio"])
+        warnings.extend(entry["warnings"])
+        total_duration += entry["duration"]
+
+    return {
+        "images_batch": images_batch,
+        "audios_batch": audios_batch,
+        "stats": build_stats(len(script_output), len(images_batch), len(audios_batch), total_duration),
+        "warnings": warnings
+    }
+
+
+def save_batch_data(result: dict, output_dir: str) -> tuple[str, str]:
+    """
+    Write images_batch.json and audios_batch.json.
+
+    Args:
+        result: Result dict from prepare_batch_data() / build_batch_data()
+        output_dir: Directory for the batch JSON files
+
+    Returns:
+        Tuple of (images_batch_path, audios_batch_path)
+    """
+    images_batch_path = os.path.join(output_dir, 'images_batch.json')
+    audios_batch_path = os.path.join(output_dir, 'audios_batch.json')
+
+    with span('write_images_batch'), open(images_batch_path, 'w', encoding='utf-8') as f:
+        json.dump(result["images_batch"], f, indent=2)
+
+    with span('write_audios_batch'), open(audios_batch_path, 'w', encoding='utf-8') as f:
+        json.dump(result["audios_batch"], f, indent=2)
+
+    return images_batch_path, audios_batch_path
+
+
+def prepare_batch_data(project_folder: str, use_cache: bool = True,
+                       workers: int = DEFAULT_WORKERS, prepared_images: bool = False,
+                       narration: bool = False, project_index: ProjectIndex = None,
+                       script_output: list[dict] = None, cache: DurationCache = None) -> dict:
+    """
+    Prepare batch data for images and audio.
+
+    Args:
+        project_folder: Path to the project folder
+        use_cache: Read/write the project's audio duration cache (default: True)
+        workers: Concurrent audio duration probes (default: 8)
+        prepared_images: Point image_url at up-to-date images_prepared/ copies
+        narration: Join the scene audio into narration.mp3 and emit it as the
+            single audios_batch entry, timing scenes by its offset table
+        project_index: Optional pre-scanned project index (scanned if omitted)
+        script_output: Optional pre-loaded script_output.json entries
+        cache: Optional already loaded duration cache (see resolve_durations)
+
+    Returns:
+        Dict with images_batch, audios_batch, and stats
+    """
+    # Load script output
+    if script_output is None:
+        script_output = load_script_output(project_folder)
+
+    # Get audio files
+    audio_folder = os.path.join(project_folder, 'audio')
+    if not os.path.exists(audio_folder):
+        raise FileNotFoundError(f"Audio folder not found: {audio_folder}")
+
+    # Images folder
+    images_folder = os.path.join(project_folder, 'images')
+    if not os.path.exists(images_folder):
+        raise FileNotFoundError(f"Images folder not found: {images_folder}")
+
+    # List images/ and audio/ once; all lookups below are in memory
+    if project_index is None:
+        with span('scan_project'):
+            project_index = scan_project(project_folder)
+
+    audio_entries = get_scene_audio(project_index)
+    if not audio_entries:
+        raise FileNotFoundError(f"No audio files found in: {audio_folder}")
+
+    if narration:
+        from .concat_audio import narration_audio_entry, scene_durations
+        table = resolve_narration(project_folder, audio_entries, workers)
+        durations = scene_durations(table)
+    else:
+        # Resolve all scene durations up front (concurrently), in scene order
+        durations = resolve_durations(project_folder, audio_entries[:len(script_output)], use_cache, workers,
+                                      cache=cache)
+
+    image_paths = resolve_prepared_images(project_folder, project_index) if prepared_images else None
+
+    with hot('layout'):
+        result = build_batch_data(
+            script_output, [entry.path for entry in audio_entries], durations, project_index,
+            image_paths=image_paths
+        )
+    if narration:
+        result["audios_batch"] = [narration_audio_entry(table)]
+    return result
+
+
+def stream_batch_data(project_folder: str, output_dir: str = None, use_cache: bool = True,
+                      workers: int = DEFAULT_WORKERS, prepared_images: bool = False,
+                      narration: bool = False) -> dict:
+    """
+    Prepare batch data with bounded memory, writing outputs as scenes are processed.
+
+    script_output.json is read incrementally, durations are probed in
+    fixed-size windows, and images_batch.json / audios_batch.json are written
+    entry by entry as compact (non-indented) JSON. Only the directory index
+    and the warnings list grow with the project.
+
+    Args:
+        project_folder: Path to the project folder
+        output_dir: Directory for batch JSON files (default: project_folder)
+        use_cache: Read/write the project's audio duration cache (default: True)
+        workers: Concurrent audio duration probes (default: 8)
+        prepared_images: Point image_url at up-to-date images_prepared/ copies
+        narration: Join the scene audio into narration.mp3 and emit it as the
+            single audios_batch entry, timing scenes by its offset table
+
+    Returns:
+        Dict with stats, warnings and the written paths
+    """
+    script_path = os.path.join(project_folder, 'script_output.json')
+    if not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script output not found: {script_path}")
+
+    audio_folder = os.path.join(project_folder, 'audio')
+    if not os.path.exists(audio_folder):
+        raise FileNotFoundError(f"Audio folder not found: {audio_folder}")
+
+    images_folder = os.path.join(project_folder, 'images')
+    if not os.path.exists(images_folder):
+        raise FileNotFoundError(f"Images folder not found: {images_folder}")
+
+    with span('scan_project'):
+        project_index = scan_project(project_folder)
+    audio_entries = get_scene_audio(project_index)
+    if not audio_entries:
+        raise FileNotFoundError(f"No audio files found in: {audio_folder}")
+
+    output_dir = output_dir or project_folder
+    images_batch_path = os.path.join(output_dir, 'images_batch.json')
+    audios_batch_path = os.path.join(output_dir, 'audios_batch.json')
+
+    image_paths = resolve_prepared_images(project_folder, project_index) if prepared_images else None
+    scenes = iter_json_array(script_path)
+    if narration:
+        from .concat_audio import narration_audio_entry, scene_durations
+        table = resolve_narration(project_folder, audio_entries, workers)
+        cache = None
+        durations = iter(scene_durations(table))
+    else:
+        cache = DurationCache(project_folder) if use_cache else None
+        durations = iter_durations(audio_entries, cache, workers)
+
+    total_duration = 0
+    warnings = []
+    processed = 0
+
+    # Reading, probing, layout and writing are interleaved window by window;
+    # probe_durations spans inside the stream show the probing share
+    with hot('stream_scenes'), JsonArrayWriter(images_batch_path) as images_writer, \
+            JsonArrayWriter(audios_batch_path) as audios_writer:
+        for entry in iter_scene_entries(scenes, [e.path for e in audio_entries], durations, project_index,
+                                        window=DEFAULT_WINDOW, image_paths=image_paths):
+            processed += 1
+            for image_config in entry["images"]:
+                images_writer.write(image_config)
+            if entry["audio"] is not None and not narration:
+                audios_writer.write(entry["audio"])
+            warnings.extend(entry["warnings"])
+            total_duration += entry["duration"]
+        if narration:
+            audios_writer.write(narration_audio_entry(table))
+
+    # Count scenes left after a missing audio file stopped the timeline
+    remaining = sum(1 for _ in scenes)
+
+    if cache is not None:
+        with span('save_duration_cache'):
+            cache.save()
+
+    return {
+        "stats": build_stats(processed + remaining, images_writer.count, audios_writer.count, total_duration),
+        "warnings": warnings,
+        "paths": (images_batch_path, audios_batch_path)
+    }
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Prepare batch data for CapCut video creation.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder'
+    )
+    parser.add_argument(
+        '--output-dir', '-o',
+        type=str,
+        default=None,
+        help='Output directory for batch JSON files (default: project_folder)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the audio duration cache (.audio_durations.json)'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent audio duration probes (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Bounded-memory mode: read script_output.json incrementally and write compact JSON scene by scene'
+    )
+    parser.add_argument(
+        '--prepared-images',
+        action='store_true',
+        help='Use the resolution-fitted copies in images_prepared/ (see prepare_images.py) where up to date'
+    )
+    parser.add_argument(
+        '--narration',
+        action='store_true',
+        help='Join audio_XXX.mp3 into narration.mp3 without re-encoding (see concat_audio.py) and '
+             'emit it as a single audio entry; scene timings come from its frame-exact offset table'
+    )
+    parser.add_argument(
+        '--pages',
+        action='store_true',
+        help='Also split the batch files into size-bounded pages with a resumable manifest (see batch_pages.py)'
+    )
+    parser.add_argument(
+        '--page-items',
+        type=int,
+        default=DEFAULT_MAX_ITEMS,
+        help=f'With --pages: maximum entries per page (default: {DEFAULT_MAX_ITEMS})'
+    )
+    parser.add_argument(
+        '--page-bytes',
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help=f'With --pages: maximum bytes of JSON per page (default: {DEFAULT_MAX_BYTES})'
+    )
+    add_profile_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    # Check if project folder exists
+    if not os.path.isdir(args.project_folder):
+        print(f"Error: Project folder not found: {args.project_folder}")
+        sys.exit(1)
+
+    print(f"Preparing batch data for: {args.project_folder}")
+    print()
+
+    # Determine output directory
+    output_dir = args.output_dir or args.project_folder
+    with profile_run(profile_trace(args), 'prepare_batch_data', output_dir, args.cprofile):
+        try:
+            if args.stream:
+                result = stream_batch_data(
+                    args.project_folder,
+                    output_dir=output_dir,
+                    use_cache=not args.no_cache,
+                    workers=args.workers,
+                    prepared_images=args.prepared_images,
+                    narration=args.narration
+                )
+            else:
+                result = prepare_batch_data(
+                    args.project_folder,
+                    use_cache=not args.no_cache,
+                    workers=args.workers,
+                    prepared_images=args.prepared_images,
+                    narration=args.narration
+                )
+
+            # Print stats
+            stats = result["stats"]
+            print(f"Total scenes: {stats['total_scenes']}")
+            print(f"Total images: {stats['total_images']}")
+            print(f"Total audios: {stats['total_audios']}")
+            print(f"Total duration: {stats['total_duration_seconds']} seconds ({stats['total_duration_minutes']} minutes)")
+
+            # Print warnings
+            if result["warnings"]:
+                print()
+                print("Warnings:")
+                for warning in result["warnings"]:
+                    print(f"  - {warning}")
+
+            # Save batch data to JSON files (already written in streaming mode)
+            if args.stream:
+                images_batch_path, audios_batch_path = result["paths"]
+            else:
+                images_batch_path, audios_batch_path = save_batch_data(result, output_dir)
+
+            print()
+            print(f"Batch data saved:")
+            print(f"  - {images_batch_path}")
+            print(f"  - {audios_batch_path}")
+
+            if args.pages:
+                # Streaming mode has no lists in memory; the pages are read back from the files
+                batches = None if args.stream else {
+                    'images': result["images_batch"], 'audios': result["audios_batch"]
+                }
+                with span('write_batch_pages'):
+                    manifest = write_batch_pages(output_dir, batches, args.page_items, args.page_bytes)
+                print(f"  - {os.path.join(output_dir, MANIFEST_FILENAME)} "
+                      f"({len(manifest['pages'])} pages in {os.path.join(output_dir, PAGES_FOLDER)})")
+
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Fit generated images to the draft resolution before building the draft.
+
+The image step produces 2048x2048 PNGs (about 2 MB each) while drafts are
+1920x1080 or 1080x1920, so CapCut has to load and scale hundreds of
+oversized square images. This optional stage, run after verify_images.py,
+writes a copy of every image fitted to the draft resolution into
+<project_folder>/images_prepared/ (same file names, new extension):
+
+- crop:   scale to cover the frame and center-crop (default)
+- pad:    scale to fit inside the frame and pad with --background
+- resize: stretch to the exact frame size
+
+optionally re-encoded as JPEG or WebP. Images are processed on a process
+pool. Outputs are cached by source content: the manifest
+(images_prepared/.prepared.json) records each source's size, mtime and
+SHA-256 together with the settings used, so unchanged images are skipped
+without rehashing and touched-but-identical images without re-encoding.
+
+prepare_batch_data.py --prepared-images then points image_url at the
+prepared files (falling back to the originals for images that have no
+up-to-date prepared copy).
+
+Usage:
+    python prepare_images.py <project_folder> [--width 1920] [--height 1080] [--mode crop] [--format jpeg]
+
+Example:
+    python prepare_images.py /path/to/project
+    python prepare_images.py /path/to/project --width 1080 --height 1920 --mode pad --format webp
+
+Requirements:
+    pip install Pillow
+"""
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .project_index import IMAGE_NAME_RE, scan_folder
+
+PREPARED_FOLDER = 'images_prepared'
+MANIFEST_FILENAME = '.prepared.json'
+MANIFEST_VERSION = 1
+DEFAULT_WIDTH = 1920
+DEFAULT_HEIGHT = 1080
+DEFAULT_MODE = 'crop'
+DEFAULT_FORMAT = 'png'
+DEFAULT_QUALITY = 90
+DEFAULT_BACKGROUND = '#000000'
+DEFAULT_JOBS = os.cpu_count() or 1
+
+MODES = ('crop', 'pad', 'resize')
+FORMATS = {'png': ('PNG', '.png'), 'jpeg': ('JPEG', '.jpg'), 'webp': ('WEBP', '.webp')}
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_key(width: int, height: int, mode: str, image_format: str,
+                 quality: int, background: str) -> str:
+    """Identifies the output settings a prepared file was made with."""
+    key = f"{width}x{height}:{mode}:{image_format}"
+    if image_format != 'png':
+        key += f":q{quality}"
+    if mode == 'pad':
+        key += f":{background}"
+    return key
+
+
+def load_pil():
+    """
+    Import Pillow on first use (prepared_image_paths() works without it).
+
+    Returns:
+        Tuple of (PIL.Image, PIL.ImageOps)
+
+    Raises:
+        ImportError: If Pillow is not installed
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise ImportError("Pillow is required to prepare images. Install with: pip install Pillow")
+    return Image, ImageOps
+
+
+def fit_image(src_path: str, dst_path: str, width: int, height: int, mode: str = DEFAULT_MODE,
+              image_format: str = DEFAULT_FORMAT, quality: int = DEFAULT_QUALITY,
+              background: str = DEFAULT_BACKGROUND):
+    """
+    Write src_path fitted to width x height (atomic replace).
+
+    Args:
+        src_path: Source image
+        dst_path: Output path
+        width: Target width in pixels
+        height: Target height in pixels
+        mode: crop, pad or resize
+        image_format: png, jpeg or webp
+        quality: JPEG/WebP quality (1-100)
+        background: Pad color
+    """
+    Image, ImageOps = load_pil()
+    with Image.open(src_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image_format == 'jpeg' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        size = (width, height)
+        if mode == 'crop':
+            fitted = ImageOps.fit(image, size, Image.LANCZOS)
+        elif mode == 'pad':
+            fitted = ImageOps.pad(image, size, Image.LANCZOS, color=background)
+        else:
+            fitted = image.resize(size, Image.LANCZOS)
+
+        pil_format = FORMATS[image_format][0]
+        options = {'optimize': True} if image_format == 'png' else {'quality': quality}
+        tmp_path = f"{dst_path}.{os.getpid()}.tmp"
+        try:
+            fitted.save(tmp_path, pil_format, **options)
+            os.replace(tmp_path, dst_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def _prepare_one(task: dict) -> dict:
+    """
+    Hash one source and (re)encode it unless the cached output matches.
+
+    Runs in a worker process; returns the manifest entry, or an error.
+    """
+    try:
+        sha256 = file_sha256(task['src'])
+        cached = task['cached']
+        if not (cached and cached.get('sha256') == sha256 and cached.get('settings') == task['settings']
+                and os.path.exists(task['dst'])):
+            fit_image(task['src'], task['dst'], **task['options'])
+            status = 'prepared'
+        else:
+            status = 'unchanged'
+    except Exception as e:
+        return {'name': task['name'], 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+
+    return {
+        'name': task['name'],
+        'status': status,
+        'entry': {
+            'size': task['size'],
+            'mtime_ns': task['mtime_ns'],
+            'sha256': sha256,
+            'settings': task['settings'],
+            'output': os.path.basename(task['dst'])
+        }
+    }
+
+
+def load_manifest(project_folder: str) -> dict:
+    """Prepared-image manifest entries (source name -> entry); {} if absent."""
+    path = os.path.join(project_folder, PREPARED_FOLDER, MANIFEST_FILENAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if isinstance(data, dict) and data.get('version') == MANIFEST_VERSION:
+        return data.get('entries', {})
+    return {}
+
+
+def save_manifest(project_folder: str, entries: dict):
+    """Write the manifest (atomic replace)."""
+    path = os.path.join(project_folder, PREPARED_FOLDER, MANIFEST_FILENAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'entries': entries}, f)
+    os.replace(tmp_path, path)
+
+
+def prepare_images(project_folder: str, width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT,
+                   mode: str = DEFAULT_MODE, image_format: str = DEFAULT_FORMAT,
+                   quality: int = DEFAULT_QUALITY, background: str = DEFAULT_BACKGROUND,
+                   jobs: int = DEFAULT_JOBS, force: bool = False) -> dict:
+    """
+    Fit every project image to the draft resolution.
+
+    Args:
+        project_folder: Path to the project folder
+        width: Target width in pixels
+        height: Target height in pixels
+        mode: crop, pad or resize
+        image_format: png, jpeg or webp
+        quality: JPEG/WebP quality (1-100)
+        background: Pad color
+        jobs: Worker processes
+        force: Re-encode every image, ignoring the cache
+
+    Returns:
+        Dict with total, prepared, unchanged (cache hits), failed
+        (list of {name, error}), bytes_before, bytes_after and output_folder
+    """
+    load_pil()
+
+    images_folder = os.path.join(project_folder, 'images')
+    if not os.path.exists(images_folder):
+        raise FileNotFoundError(f"Images folder not found: {images_folder}")
+
+    output_folder = os.path.join(project_folder, PREPARED_FOLDER)
+    os.makedirs(output_folder, exist_ok=True)
+
+    settings = settings_key(width, height, mode, image_format, quality, background)
+    options = {
+        'width': width, 'height': height, 'mode': mode, 'image_format': image_format,
+        'quality': quality, 'background': background
+    }
+    ext = FORMATS[image_format][1]
+
+    previous = load_manifest(project_folder)
+    manifest = {} if force else previous
+    sources = {name: entry for name, entry in scan_folder(images_folder).items() if IMAGE_NAME_RE.match(name)}
+
+    entries = {}
+    tasks = []
+    for name, source in sorted(sources.items()):
+        dst = os.path.join(output_folder, os.path.splitext(name)[0] + ext)
+        cached = manifest.get(name)
+        # Unchanged source (same size and mtime) with a matching output: skip without hashing
+        if (cached and cached.get('size') == source.size and cached.get('mtime_ns') == source.mtime_ns
+                and cached.get('settings') == settings and os.path.exists(dst)):
+            entries[name] = cached
+            continue
+        tasks.append({
+            'name': name, 'src': source.path, 'dst': dst, 'size': source.size,
+            'mtime_ns': source.mtime_ns, 'settings': settings, 'options': options,
+            'cached': cached
+        })
+
+    unchanged = len(entries)
+    prepared = 0
+    failed = []
+    if tasks:
+        with ProcessPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for result in executor.map(_prepare_one, tasks, chunksize=8):
+                if result['status'] == 'failed':
+                    failed.append({'name': result['name'], 'error': result['error']})
+                    continue
+                entries[result['name']] = result['entry']
+                if result['status'] == 'prepared':
+                    prepared += 1
+                else:
+                    unchanged += 1
+
+    save_manifest(project_folder, entries)
+
+    # Drop outputs left over from other settings (e.g. .jpg after switching to webp) or removed sources
+    for name, old in previous.items():
+        if entries.get(name, {}).get('output') != old.get('output'):
+            try:
+                os.remove(os.path.join(output_folder, old['output']))
+            except (OSError, KeyError):
+                pass
+
+    bytes_after = 0
+    for entry in entries.values():
+        try:
+            bytes_after += os.path.getsize(os.path.join(output_folder, entry['output']))
+        except OSError:
+            pass
+
+    return {
+        'total': len(sources),
+        'prepared': prepared,
+        'unchanged': unchanged,
+        'failed': failed,
+        'bytes_before': sum(sources[name].size for name in entries),
+        'bytes_after': bytes_after,
+        'output_folder': output_folder
+    }
+
+
+def prepared_image_paths(project_folder: str, images: dict) -> dict:
+    """
+    Map source image paths to their up-to-date prepared copies.
+
+    Only entries whose source still has the recorded size and mtime, and
+    whose output exists, are included, so stale copies are never used.
+
+    Args:
+        project_folder: Path to the project folder
+        images: Scanned images/ files (ProjectIndex.images)
+
+    Returns:
+        Dict of source path -> prepared path
+    """
+    output_folder = os.path.join(project_folder, PREPARED_FOLDER)
+    outputs = scan_folder(output_folder)
+    paths = {}
+    for name, entry in load_manifest(project_folder).items():
+        source = images.get(name)
+        output = outputs.get(entry.get('output'))
+        if (source is not None and output is not None
+                and entry.get('size') == source.size and entry.get('mtime_ns') == source.mtime_ns):
+            paths[source.path] = output.path
+    return paths
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Fit generated images to the draft resolution (cached, in parallel).'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder containing images/'
+    )
+    parser.add_argument(
+        '--width',
+        type=int,
+        default=DEFAULT_WIDTH,
+        help=f'Target width in pixels (default: {DEFAULT_WIDTH})'
+    )
+    parser.add_argument(
+        '--height',
+        type=int,
+        default=DEFAULT_HEIGHT,
+        help=f'Target height in pixels (default: {DEFAULT_HEIGHT})'
+    )
+    parser.add_argument(
+        '--mode',
+        choices=MODES,
+        default=DEFAULT_MODE,
+        help='crop: cover and center-crop; pad: fit and pad; resize: stretch (default: crop)'
+    )
+    parser.add_argument(
+        '--format', '-f',
+        choices=sorted(FORMATS),
+        default=DEFAULT_FORMAT,
+        help='Output format (default: png)'
+    )
+    parser.add_argument(
+        '--quality', '-q',
+        type=int,
+        default=DEFAULT_QUALITY,
+        help=f'JPEG/WebP quality 1-100 (default: {DEFAULT_QUALITY})'
+    )
+    parser.add_argument(
+        '--background',
+        default=DEFAULT_BACKGROUND,
+        help=f'Pad color for --mode pad (default: {DEFAULT_BACKGROUND})'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f'Worker processes (default: {DEFAULT_JOBS})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-encode every image, ignoring the cache'
+    )
+
+    args = parser.parse_args()
+
+    project_folder = os.path.abspath(args.project_folder)
+    if not os.path.isdir(project_folder):
+        print(f"Error: Project folder not found: {project_folder}")
+        sys.exit(1)
+
+    print(f"Preparing images for: {project_folder}")
+    print(f"Target: {args.width}x{args.height} ({args.mode}, {args.format})")
+    print()
+
+    try:
+        result = prepare_images(
+            project_folder,
+            width=args.width,
+            height=args.height,
+            mode=args.mode,
+            image_format=args.format,
+            quality=args.quality,
+            background=args.background,
+            jobs=args.jobs,
+            force=args.force
+        )
+    except (ImportError, FileNotFoundError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"Total images: {result['total']}")
+    print(f"Prepared: {result['prepared']}")
+    print(f"Unchanged (cached): {result['unchanged']}")
+    print(f"Size: {result['bytes_before'] / 1024 ** 2:.1f} MB -> {result['bytes_after'] / 1024 ** 2:.1f} MB")
+
+    if result['failed']:
+        print()
+        print("Failed (originals will be used):")
+        for item in result['failed']:
+            print(f"  - {item['name']}: {item['error']}")
+
+    print()
+    print(f"Prepared images saved to: {result['output_folder']}")
+    print("Use prepare_batch_data.py --prepared-images to reference them in the batch data")
+
+    if result['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Lightweight stage/file timing for the helper scripts (--profile).
+
+While a Profiler is active, span() records how long each stage (JSON load,
+directory scan, duration probing, layout, output writing) and each file
+(one audio probe, one PNG check) takes. Spans from worker threads are
+recorded with their thread, so concurrent probes show up as parallel lanes.
+
+Results are written as Chrome trace-event JSON (open in chrome://tracing
+or https://ui.perfetto.dev) and summarized as a table of total/mean/max
+time per span name. Optionally, the hot loop can also be run under
+cProfile; its stats are dumped next to the trace (.prof, readable with
+python -m pstats or snakeviz).
+
+When no Profiler is active, span() is a no-op, so instrumented code costs
+a single function call per span.
+
+Usage:
+    from video_creator.profiling import Profiler, span
+
+    with Profiler('prepare_batch_data') as profiler:
+        with span('load_script'):
+            ...
+    profiler.save('trace.json')
+    profiler.print_summary()
+
+    python profiling.py trace.json  # summary of a saved trace
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+_active = None
+
+
+def span(name: str, cat: str = 'stage', **args):
+    """
+    Time a block of code on the active profiler.
+
+    Args:
+        name: Span name (shown in the trace and summary)
+        cat: Category: 'stage', or 'file' for per-file work (pass file=...)
+        **args: Extra details stored with the trace event
+
+    Returns:
+        Context manager (a no-op when profiling is off)
+    """
+    if _active is None:
+        return contextlib.nullcontext()
+    return _active.span(name, cat, **args)
+
+
+def hot(name: str):
+    """Time a block as a stage and run it under cProfile if requested."""
+    if _active is None:
+        return contextlib.nullcontext()
+    return _active.hot(name)
+
+
+class Profiler:
+    """
+    Collects trace events for one script run.
+
+    Usage:
+        with Profiler('generate_srt', cprofile=True) as profiler:
+            ...
+        profiler.save(trace_path)
+    """
+
+    def __init__(self, process_name: str, cprofile: bool = False):
+        self.process_name = process_name
+        self.cprofile = cprofile
+        self.events = []
+        self.profile = None
+        self._lock = threading.Lock()
+        self._threads = {}
+        self._origin = time.perf_counter_ns()
+
+    def __enter__(self):
+        global _active
+        self._previous = _active
+        _active = self
+        self._root = self.span(self.process_name, 'run')
+        self._root.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        self._root.__exit__(*exc)
+        _active = self._previous
+        return False
+
+    def _tid(self) -> int:
+        """Small stable thread number (1 = first thread seen)."""
+        ident = threading.get_ident()
+        with self._lock:
+            return self._threads.setdefault(ident, len(self._threads) + 1)
+
+    def record(self, name: str, cat: str, start_ns: int, end_ns: int, args: dict = None):
+        """Add a complete ('X') trace event; timestamps are perf_counter_ns values."""
+        event = {
+            'name': name,
+            'cat': cat,
+            'ph': 'X',
+            'ts': (start_ns - self._origin) / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': 1,
+            'tid': self._tid()
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str = 'stage', **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, cat, start, time.perf_counter_ns(), args)
+
+    @contextlib.contextmanager
+    def hot(self, name: str):
+        with self.span(name):
+            if not self.cprofile:
+                yield
+                return
+            import cProfile
+            self.profile = self.profile or cProfile.Profile()
+            self.profile.enable()
+            try:
+                yield
+            finally:
+                self.profile.disable()
+
+    def trace(self) -> dict:
+        """Chrome trace-event document."""
+        metadata = [
+            {'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': self.process_name}}
+        ] + [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+             'args': {'name': 'main' if tid == 1 else f'worker-{tid - 1}'}}
+            for tid in sorted(self._threads.values())
+        ]
+        return {'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}
+
+    def save(self, trace_path: str) -> str:
+        """
+        Write the trace (and cProfile stats, if captured).
+
+        Args:
+            trace_path: Output path for the trace JSON
+
+        Returns:
+            Path of the .prof file, or None if cProfile was not used
+        """
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(), f)
+
+        if self.profile is None:
+            return None
+        base = os.path.splitext(trace_path)[0]
+        prof_path = (base[:-len('.trace')] if base.endswith('.trace') else base) + '.prof'
+        self.profile.dump_stats(prof_path)
+        return prof_path
+
+    def print_summary(self, limit: int = 15, file=None):
+        """Print the span summary table and, if captured, the top cProfile entries."""
+        print_summary(self.events, file)
+        if self.profile is not None:
+            import pstats
+            out = io.StringIO()
+            pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(limit)
+            print(file=file)
+            print(out.getvalue().rstrip(), file=file)
+
+
+def summarize(events: list[dict]) -> list[dict]:
+    """
+    Aggregate complete events by (category, name).
+
+    Returns:
+        Rows with cat, name, count, total_ms, mean_ms and max_ms, stages
+        first and then by total time
+    """
+    groups = {}
+    for event in events:
+        if event.get('ph') != 'X':
+            continue
+        groups.setdefault((event['cat'], event['name']), []).append(event['dur'] / 1000)
+
+    rows = [
+        {
+            'cat': cat,
+            'name': name,
+            'count': len(durations),
+            'total_ms': sum(durations),
+            'mean_ms': sum(durations) / len(durations),
+            'max_ms': max(durations)
+        }
+        for (cat, name), durations in groups.items()
+    ]
+    order = {'run': 0, 'stage': 1}
+    rows.sort(key=lambda row: (order.get(row['cat'], 2), -row['total_ms']))
+    return rows
+
+
+def print_summary(events: list[dict], file=None):
+    """Print a table of span timings."""
+    rows = summarize(events)
+    name_width = max([len(row['name']) for row in rows] + [4])
+    print(f"{'Span':<{name_width}}  {'Kind':<5}  {'Count':>6}  {'Total ms':>10}  {'Mean ms':>9}  {'Max ms':>9}",
+          file=file)
+    print('-' * (name_width + 48), file=file)
+    for row in rows:
+        print(f"{row['name']:<{name_width}}  {row['cat']:<5}  {row['count']:>6}  "
+              f"{row['total_ms']:>10.1f}  {row['mean_ms']:>9.2f}  {row['max_ms']:>9.2f}", file=file)
+
+
+def add_profile_arguments(parser):
+    """Add --profile, --profile-output and --cprofile to a script's argument parser."""
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record per-stage and per-file timings as Chrome trace JSON '
+             '(default path: <output folder>/<script>.trace.json) and print a summary table'
+    )
+    parser.add_argument(
+        '--profile-output',
+        metavar='TRACE_JSON',
+        default=None,
+        help='Path of the --profile trace (implies --profile)'
+    )
+    parser.add_argument(
+        '--cprofile',
+        action='store_true',
+        help='With --profile, also run the hot loop under cProfile (stats saved as .prof)'
+    )
+
+
+def profile_trace(args) -> str:
+    """
+    Trace path from parsed add_profile_arguments() options.
+
+    Returns:
+        None when profiling is off, '' for the default path, else the path
+    """
+    if args.profile_output:
+        return args.profile_output
+    return '' if args.profile else None
+
+
+@contextlib.contextmanager
+def profile_run(trace_path: str, script_name: str, output_dir: str, cprofile: bool = False):
+    """
+    Profile a script run if --profile was given.
+
+    The trace is saved and the summary printed (to stderr, so --json output
+    stays parseable) even if the run ends with sys.exit().
+
+    Args:
+        trace_path: From profile_trace() (None = off, '' = default path)
+        script_name: Name of the trace's process and default file
+        output_dir: Folder for the default trace path
+        cprofile: Also run the hot loop under cProfile
+
+    Yields:
+        The active Profiler, or None when profiling is off
+    """
+    if trace_path is None:
+        yield None
+        return
+
+    trace_path = trace_path or os.path.join(output_dir, f"{script_name}.trace.json")
+    profiler = Profiler(script_name, cprofile)
+    try:
+        with profiler:
+            yield profiler
+    finally:
+        prof_path = profiler.save(trace_path)
+        print(file=sys.stderr)
+        profiler.print_summary(file=sys.stderr)
+        print(file=sys.stderr)
+        print(f"Trace saved: {trace_path}", file=sys.stderr)
+        if prof_path:
+            print(f"cProfile stats saved: {prof_path}", file=sys.stderr)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(f"Usage: {os.path.basename(sys.argv[0])} <trace.json>")
+        sys.exit(1)
+
+    try:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            trace = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error: Cannot read trace {sys.argv[1]} - {e}")
+        sys.exit(1)
+
+    print_summary(trace.get('traceEvents', []))
+
+
+if __name__ == '__main__':
+    main()
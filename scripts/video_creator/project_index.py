@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Single-pass directory index for a video project folder.
+
+Scans images/ and audio/ once with os.scandir and keeps every file's path,
+size and mtime in memory, so scripts resolve asset paths with dictionary
+lookups instead of one os.path.exists() call per expected file.
+
+Naming rules (see commands/image.md and commands/audio.md):
+- Single image:  image_XXX.png     -> slot (XXX, 0)
+- Multi image:   image_XXX_YY.png  -> slot (XXX, YY)
+- Audio:         audio_XXX.mp3     -> scene XXX
+
+Usage:
+    from video_creator.project_index import scan_project
+
+    index = scan_project(project_folder)
+    path = index.image_path(scene_idx, img_idx, image_count)
+"""
+
+import os
+import re
+from typing import NamedTuple
+
+IMAGE_NAME_RE = re.compile(r'^image_(\d+)(?:_(\d+))?\.([A-Za-z0-9]+)$')
+AUDIO_NAME_RE = re.compile(r'^audio_(\d+)\.([A-Za-z0-9]+)$')
+
+
+class FileEntry(NamedTuple):
+    """A scanned file: name, absolute path and its os.stat() result."""
+    name: str
+    path: str
+    stat: os.stat_result
+
+    @property
+    def size(self) -> int:
+        return self.stat.st_size
+
+    @property
+    def mtime_ns(self) -> int:
+        return self.stat.st_mtime_ns
+
+
+def scan_folder(folder: str) -> dict[str, FileEntry]:
+    """
+    List regular files in a folder with a single os.scandir pass.
+
+    Args:
+        folder: Directory to scan
+
+    Returns:
+        Dict of file name -> FileEntry (empty if the folder does not exist)
+    """
+    entries = {}
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_file():
+                    entries[entry.name] = FileEntry(entry.name, entry.path, entry.stat())
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class ProjectIndex:
+    """
+    In-memory view of a project's images/ and audio/ folders.
+
+    Attributes:
+        images: file name -> FileEntry for everything in images/
+        audio: file name -> FileEntry for everything in audio/
+        image_slots: (scene_num, image_num, ext) -> FileEntry, 1-based scene
+            numbers; image_num is 0 for unsuffixed single-image files
+        audio_slots: (scene_num, ext) -> FileEntry
+    """
+
+    def __init__(self, project_folder: str, images: dict[str, FileEntry],
+                 audio: dict[str, FileEntry]):
+        self.project_folder = project_folder
+        self.images_folder = os.path.join(project_folder, 'images')
+        self.audio_folder = os.path.join(project_folder, 'audio')
+        self.images = images
+        self.audio = audio
+
+        self.image_slots = {}
+        for entry in images.values():
+            self._set_slot(self.images_folder, entry.name, entry)
+
+        self.audio_slots = {}
+        for entry in audio.values():
+            self._set_slot(self.audio_folder, entry.name, entry)
+
+    def _set_slot(self, folder: str, name: str, entry: FileEntry = None):
+        """Point a file's slot at entry (or remove the slot if entry is None)."""
+        if folder == self.images_folder:
+            match = IMAGE_NAME_RE.match(name)
+            if not match:
+                return
+            scene_num, image_num, ext = match.groups()
+            slots, key = self.image_slots, (int(scene_num), int(image_num or 0), ext.lower())
+        else:
+            match = AUDIO_NAME_RE.match(name)
+            if not match:
+                return
+            scene_num, ext = match.groups()
+            slots, key = self.audio_slots, (int(scene_num), ext.lower())
+
+        if entry is None:
+            slots.pop(key, None)
+        else:
+            slots[key] = entry
+
+    def update(self, folder: str, name: str = None) -> list[str]:
+        """
+        Re-read a changed file (or rescan the whole folder) after a change on disk.
+
+        Args:
+            folder: images_folder or audio_folder
+            name: File name, or None to rescan the folder
+
+        Returns:
+            Names of the files that were re-read
+        """
+        files = self.images if folder == self.images_folder else self.audio
+
+        if name is None:
+            for old in list(files):
+                self._set_slot(folder, old)
+            files.clear()
+            files.update(scan_folder(folder))
+            for entry in files.values():
+                self._set_slot(folder, entry.name, entry)
+            return list(files)
+
+        path = os.path.join(folder, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            files.pop(name, None)
+            self._set_slot(folder, name)
+            return [name]
+
+        entry = FileEntry(name, path, stat)
+        files[name] = entry
+        self._set_slot(folder, name, entry)
+        return [name]
+
+    def image_entry(self, scene_idx: int, img_idx: int, image_count: int,
+                    image_format: str = 'png') -> FileEntry:
+        """
+        Resolve an image slot using the project naming convention.
+
+        Single-image scenes use image_XXX.png and fall back to image_XXX_01.png.
+
+        Args:
+            scene_idx: 0-based scene index
+            img_idx: 0-based image index within scene
+            image_count: Total images in this scene
+            image_format: Image file extension (default: png)
+
+        Returns:
+            FileEntry, or None if the image is missing
+        """
+        scene_num = scene_idx + 1
+        if image_count == 1:
+            entry = self.image_slots.get((scene_num, 0, image_format))
+            if entry is None:
+                entry = self.image_slots.get((scene_num, 1, image_format))
+            return entry
+        return self.image_slots.get((scene_num, img_idx + 1, image_format))
+
+    def image_path(self, scene_idx: int, img_idx: int, image_count: int,
+                   image_format: str = 'png') -> str:
+        """Absolute image path for a slot, or None if missing."""
+        entry = self.image_entry(scene_idx, img_idx, image_count, image_format)
+        return entry.path if entry else None
+
+    def audio_entries(self, extensions: set[str] = None, prefix: str = '') -> list[FileEntry]:
+        """
+        Audio files sorted by file name (audio_001, audio_002, ...).
+
+        Args:
+            extensions: Lower-case suffixes to include, e.g. {'.mp3'} (default: all)
+            prefix: Only include names starting with this prefix
+
+        Returns:
+            List of FileEntry sorted by name
+        """
+        entries = [
+            entry for name, entry in self.audio.items()
+            if name.startswith(prefix)
+            and (extensions is None or os.path.splitext(name)[1].lower() in extensions)
+        ]
+        entries.sort(key=lambda e: e.name)
+        return entries
+
+
+def scan_project(project_folder: str) -> ProjectIndex:
+    """
+    Scan a project's images/ and audio/ folders once.
+
+    Args:
+        project_folder: Path to the project folder
+
+    Returns:
+        ProjectIndex for the folder
+    """
+    return ProjectIndex(
+        project_folder,
+        images=scan_folder(os.path.join(project_folder, 'images')),
+        audio=scan_folder(os.path.join(project_folder, 'audio'))
+    )
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Pack missing assets into the fewest batch tool calls.
+
+prompt_to_image_batch and text_to_speech_batch take at most 10 items per
+call. Missing assets can be regenerated in two ways:
+
+- start_index: a contiguous range of scenes, regenerated from their original
+  prompts/scripts (one item per scene, even for multi-image scenes)
+- output_indexes: any set of single files, each named by its output index
+  (27 -> image_027.png, 1203 -> image_012_03.png)
+
+Only scenes whose files are all missing can go into a start_index range.
+Partially missing scenes always need output_indexes. plan_batches() splits
+every run of consecutive fully-missing scenes into start_index chunks, then
+decides which chunks to keep as start_index calls and which to fold into
+output_indexes calls so that the total number of calls is minimal. Ties are
+resolved towards start_index, which reuses the original prompts.
+
+Usage:
+    from video_creator.regen_plan import plan_batches
+    calls = plan_batches(missing_items)
+"""
+
+MAX_BATCH_SIZE = 10
+
+
+def output_index(scene_index: int, position: int, image_count: int) -> int:
+    """
+    output_indexes value for one image file.
+
+    Args:
+        scene_index: 1-based scene index
+        position: 1-based image position within the scene
+        image_count: Total images in the scene
+
+    Returns:
+        scene_index for single-image scenes, scene_index * 100 + position otherwise
+    """
+    if image_count == 1:
+        return scene_index
+    return scene_index * 100 + position
+
+
+def _runs(indexes: list[int]) -> list[list[int]]:
+    """Split sorted indexes into runs of consecutive values."""
+    runs = []
+    for index in indexes:
+        if runs and index == runs[-1][-1] + 1:
+            runs[-1].append(index)
+        else:
+            runs.append([index])
+    return runs
+
+
+def plan_batches(missing: list[dict], max_batch: int = MAX_BATCH_SIZE,
+                 allow_output_indexes: bool = True) -> list[dict]:
+    """
+    Group missing assets into batch calls.
+
+    Args:
+        missing: One dict per scene with missing files:
+            - index: 1-based scene index
+            - complete: True if every file of the scene is missing
+            - outputs: list of (output_index, file_name) for the missing files
+        max_batch: Maximum items per call (default: 10)
+        allow_output_indexes: False for tools that only support start_index;
+            every scene is then planned as part of a start_index range
+
+    Returns:
+        List of calls ordered by first index, each a dict with:
+        - mode: 'start_index' or 'output_indexes'
+        - start_index: first scene index (start_index mode)
+        - indexes: scene indexes covered (start_index mode)
+        - output_indexes: output index per item (output_indexes mode)
+        - files: file names the call regenerates
+    """
+    by_index = {item['index']: item for item in missing}
+
+    whole = sorted(item['index'] for item in missing if item['complete'] or not allow_output_indexes)
+    chunks = [
+        run[i:i + max_batch]
+        for run in _runs(whole)
+        for i in range(0, len(run), max_batch)
+    ]
+
+    if allow_output_indexes:
+        # (scene index, (output_index, file_name)): output indexes of multi-image
+        # scenes do not order like scene indexes (scene 5 image 1 is 501)
+        partial_outputs = [
+            (item['index'], output)
+            for item in missing if not item['complete'] for output in item['outputs']
+        ]
+
+        # Keeping a chunk as its own call saves its files from the output_indexes pool.
+        # For k kept chunks the best choice is the k with the most files; pick the k
+        # that minimises the total number of calls (largest k on ties).
+        def size(chunk):
+            return sum(len(by_index[index]['outputs']) for index in chunk)
+
+        ranked = sorted(chunks, key=size, reverse=True)
+        pool = len(partial_outputs) + sum(size(chunk) for chunk in chunks)
+        best_k, best_calls = 0, -(-pool // max_batch)
+        for k, chunk in enumerate(ranked, start=1):
+            pool -= size(chunk)
+            calls = k + -(-pool // max_batch)
+            if calls <= best_calls:
+                best_k, best_calls = k, calls
+
+        kept = ranked[:best_k]
+        folded = [(index, output) for chunk in ranked[best_k:] for index in chunk
+                  for output in by_index[index]['outputs']]
+        pool_outputs = sorted(partial_outputs + folded)
+    else:
+        kept = chunks
+        pool_outputs = []
+
+    # (first scene index, call)
+    calls = [
+        (chunk[0], {
+            'mode': 'start_index',
+            'start_index': chunk[0],
+            'indexes': chunk,
+            'files': [name for index in chunk for _, name in by_index[index]['outputs']]
+        })
+        for chunk in kept
+    ]
+    for i in range(0, len(pool_outputs), max_batch):
+        group = pool_outputs[i:i + max_batch]
+        calls.append((group[0][0], {
+            'mode': 'output_indexes',
+            'output_indexes': [value for _, (value, _) in group],
+            'files': [name for _, (_, name) in group]
+        }))
+
+    calls.sort(key=lambda pair: pair[0])
+    return [call for _, call in calls]
+
+
+def describe_call(call: dict) -> str:
+    """One-line human readable summary of a planned call."""
+    if call['mode'] == 'start_index':
+        first, last = call['indexes'][0], call['indexes'][-1]
+        span = f"{first}" if first == last else f"{first}-{last}"
+        return f"start_index={first} (index {span}, {len(call['indexes'])} 项)"
+    return f"output_indexes={call['output_indexes']}"
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Append-only journal for prompt batches, compacted into script_output.json.
+
+Saving progress by rewriting the accumulated output after every batch
+writes O(n²) bytes over a run, and a crash during a rewrite can leave a
+broken file. Instead, each finished batch is appended as one JSON line to
+<project_folder>/script_output.journal.jsonl and fsync'ed:
+
+    {"batch": 1, "scenes": [{"index": 1, "script": "...", "prompt": "...", "image_count": 3}, ...]}
+
+Every batch is checked before it is written:
+
+- index: int, continuing without gaps from the last journaled scene (1-based)
+- script: non-empty string, equal to the sentence with that index in
+  scenes.json when it exists
+- prompt: non-empty string
+- image_count (optional, default 1): positive int; word_count (optional):
+  positive int, and image_count must be ceil(word_count / 5) when both are given
+
+A line cut short by a crash is ignored (that batch is simply redone) and
+overwritten by the next append. --compact writes all journaled scenes
+to script_output.json in one atomic rename (the index field is dropped, as in
+the existing format) and removes the journal. It refuses when scenes are
+missing, unless --partial is given.
+
+Usage:
+    python script_journal.py <project_folder> --append BATCH_JSON   (or - for stdin)
+    python script_journal.py <project_folder> --status
+    python script_journal.py <project_folder> --compact [--partial]
+
+Example:
+    python script_journal.py ./my_project --append batch_01.json
+    python script_journal.py ./my_project --status    # where to resume after an interruption
+    python script_journal.py ./my_project --compact
+"""
+
+import json
+import math
+import os
+import sys
+
+JOURNAL_FILENAME = 'script_output.journal.jsonl'
+OUTPUT_FILENAME = 'script_output.json'
+WORDS_PER_IMAGE = 5
+
+# Output key order, as in commands/prompt.md
+OUTPUT_KEYS = ('script', 'word_count', 'image_count', 'prompt')
+
+
+def load_sentences(project_folder: str) -> list[str]:
+    """Sentence texts from scenes.json in index order, or None if it does not exist."""
+    scenes_path = os.path.join(project_folder, 'scenes.json')
+    if not os.path.exists(scenes_path):
+        return None
+    with open(scenes_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    sentences = data.get('sentences') if isinstance(data, dict) else None
+    if not isinstance(sentences, list):
+        raise ValueError(f"No sentences list in: {scenes_path}")
+    return [sentence.get('script', '') for sentence in sentences]
+
+
+def _positive_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def validate_batch(scenes: list, next_index: int, sentences: list[str] = None) -> list[dict]:
+    """
+    Check a batch of scenes against the script_output.json schema.
+
+    Args:
+        scenes: Scene dicts of one batch, in order
+        next_index: Index the first scene must have
+        sentences: Optional scenes.json sentence texts to compare scripts with
+
+    Returns:
+        The scenes, with only the known keys, in output key order
+
+    Raises:
+        ValueError: Listing every problem found in the batch
+    """
+    if not isinstance(scenes, list) or not scenes:
+        raise ValueError("A batch must be a non-empty JSON array of scenes")
+
+    errors = []
+    checked = []
+    for offset, scene in enumerate(scenes):
+        expected = next_index + offset
+        if not isinstance(scene, dict):
+            errors.append(f"item {offset + 1}: not an object")
+            continue
+        label = f"scene {scene.get('index', f'#{offset + 1}')}"
+
+        if scene.get('index') != expected:
+            errors.append(f"{label}: index must be {expected}")
+        script = scene.get('script')
+        if not isinstance(script, str) or not script.strip():
+            errors.append(f"{label}: script must be a non-empty string")
+        elif sentences is not None:
+            if expected > len(sentences):
+                errors.append(f"{label}: scenes.json has only {len(sentences)} sentences")
+            elif script.strip() != sentences[expected - 1].strip():
+                errors.append(f"{label}: script differs from scenes.json sentence {expected}")
+        prompt = scene.get('prompt')
+        if not isinstance(prompt, str) or not prompt.strip():
+            errors.append(f"{label}: prompt must be a non-empty string")
+
+        image_count = scene.get('image_count')
+        word_count = scene.get('word_count')
+        if image_count is not None and not _positive_int(image_count):
+            errors.append(f"{label}: image_count must be a positive integer")
+        if word_count is not None and not _positive_int(word_count):
+            errors.append(f"{label}: word_count must be a positive integer")
+        elif _positive_int(image_count) and word_count is not None \
+                and image_count != math.ceil(word_count / WORDS_PER_IMAGE):
+            errors.append(f"{label}: image_count must be ceil(word_count / {WORDS_PER_IMAGE}) = "
+                          f"{math.ceil(word_count / WORDS_PER_IMAGE)}")
+
+        checked.append({'index': expected, **{key: scene[key] for key in OUTPUT_KEYS if key in scene}})
+
+    if errors:
+        raise ValueError("Invalid batch:\n  " + "\n  ".join(errors))
+    return checked
+
+
+def read_journal(project_folder: str) -> tuple[list[dict], int, int]:
+    """
+    Read all complete batches from the journal.
+
+    Returns:
+        Tuple of (scenes in order, number of batches, byte length of the
+        complete lines; anything after it is a torn final write)
+
+    Raises:
+        ValueError: If a complete line is not valid JSON or breaks the
+            index sequence (the journal was edited or mixed up)
+    """
+    path = os.path.join(project_folder, JOURNAL_FILENAME)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0, 0
+
+    # Only newline-terminated lines are complete; a crash can cut the last one
+    valid = data.rfind(b'\n') + 1
+    scenes = []
+    batches = 0
+    for line_no, line in enumerate(data[:valid].splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"{JOURNAL_FILENAME} line {line_no} is corrupt: {e}") from None
+        batch = record.get('scenes') if isinstance(record, dict) else None
+        scenes.extend(validate_batch(batch, len(scenes) + 1))
+        batches += 1
+    return scenes, batches, valid
+
+
+def append_batch(project_folder: str, scenes: list) -> dict:
+    """
+    Validate a batch and append it to the journal with fsync.
+
+    Args:
+        project_folder: Project folder
+        scenes: Scene dicts of the batch (see validate_batch)
+
+    Returns:
+        Dict with batch (number), start and end (first/last scene index)
+        and total (scenes journaled so far)
+    """
+    journaled, batches, valid = read_journal(project_folder)
+    checked = validate_batch(scenes, len(journaled) + 1, load_sentences(project_folder))
+
+    record = {'batch': batches + 1, 'scenes': checked}
+    line = (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+    path = os.path.join(project_folder, JOURNAL_FILENAME)
+    created = not os.path.exists(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        # Drop a torn line left by a crash, then append after the last complete one
+        os.ftruncate(fd, valid)
+        os.lseek(fd, valid, os.SEEK_SET)
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    if created:
+        _fsync_dir(project_folder)
+
+    return {
+        'batch': batches + 1,
+        'start': checked[0]['index'],
+        'end': checked[-1]['index'],
+        'total': len(journaled) + len(checked)
+    }
+
+
+def _fsync_dir(folder: str):
+    """Persist a directory entry change (no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def journal_status(project_folder: str) -> dict:
+    """
+    Progress recorded in the journal.
+
+    Returns:
+        Dict with batches, scenes (journaled), expected (scenes.json
+        sentence count, or None) and next_index (first scene still to do)
+    """
+    scenes, batches, _ = read_journal(project_folder)
+    sentences = load_sentences(project_folder)
+    return {
+        'batches': batches,
+        'scenes': len(scenes),
+        'expected': len(sentences) if sentences is not None else None,
+        'next_index': len(scenes) + 1
+    }
+
+
+def compact_journal(project_folder: str, partial: bool = False) -> str:
+    """
+    Write the journaled scenes to script_output.json in one atomic rename.
+
+    Args:
+        project_folder: Project folder
+        partial: Allow fewer scenes than scenes.json has sentences
+
+    Returns:
+        Path to script_output.json
+
+    Raises:
+        ValueError: If the journal is empty or incomplete (without partial)
+    """
+    scenes, _, _ = read_journal(project_folder)
+    if not scenes:
+        raise ValueError(f"No journaled scenes in: {os.path.join(project_folder, JOURNAL_FILENAME)}")
+
+    sentences = load_sentences(project_folder)
+    if sentences is not None and len(scenes) != len(sentences) and not partial:
+        raise ValueError(f"Journal has {len(scenes)} of {len(sentences)} scenes; "
+                         f"continue from scene {len(scenes) + 1} or use --partial")
+
+    output = [{key: scene[key] for key in OUTPUT_KEYS if key in scene} for scene in scenes]
+
+    path = os.path.join(project_folder, OUTPUT_FILENAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(project_folder)
+
+    if not partial:
+        os.remove(os.path.join(project_folder, JOURNAL_FILENAME))
+    return path
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Journal prompt batches with fsync and compact them into script_output.json.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Project folder (containing scenes.json)'
+    )
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument(
+        '--append',
+        metavar='BATCH_JSON',
+        default=None,
+        help='Validate a batch (JSON array of scenes, - for stdin) and append it to the journal'
+    )
+    action.add_argument(
+        '--status',
+        action='store_true',
+        help='Print how many scenes are journaled and where to continue'
+    )
+    action.add_argument(
+        '--compact',
+        action='store_true',
+        help=f'Write the journal to {OUTPUT_FILENAME} (atomic rename) and remove it'
+    )
+    parser.add_argument(
+        '--partial',
+        action='store_true',
+        help='With --compact: allow an incomplete journal and keep it for further batches'
+    )
+
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.project_folder):
+        print(f"Error: Project folder not found: {args.project_folder}")
+        sys.exit(1)
+
+    try:
+        if args.append:
+            if args.append == '-':
+                scenes = json.load(sys.stdin)
+            else:
+                with open(args.append, 'r', encoding='utf-8') as f:
+                    scenes = json.load(f)
+            result = append_batch(args.project_folder, scenes)
+            print(f"Batch {result['batch']} saved: scenes {result['start']}-{result['end']} "
+                  f"({result['total']} journaled)")
+        elif args.status:
+            status = journal_status(args.project_folder)
+            expected = status['expected'] if status['expected'] is not None else '?'
+            print(f"Journaled: {status['scenes']}/{expected} scenes in {status['batches']} batch(es)")
+            if status['expected'] is not None and status['scenes'] >= status['expected']:
+                print("All scenes journaled; run --compact")
+            else:
+                print(f"Next scene: {status['next_index']}")
+        else:
+            path = compact_journal(args.project_folder, args.partial)
+            print(f"Saved: {path}")
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON - {e}")
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Integer-microsecond timeline shared by the batch data and subtitle writers.
+
+Every boundary of the draft is derived from the probed audio durations in
+one place, in integer microseconds (CapCut's native time unit):
+
+- scene boundaries: cumulative sum of the scene durations
+- image boundaries: each scene split evenly across its image_count images
+- subtitle boundaries: each scene split across its subtitle segments in
+  proportion to their word counts
+
+Because the arithmetic is exact integer math, images_batch.json,
+audios_batch.json and subtitles.srt can never drift apart, however long
+the project. With NumPy installed, each window of at least
+NUMPY_MIN_SCENES scenes is laid out with vectorized cumulative sums; smaller
+windows, or any window without NumPy, use a pure-Python loop that computes
+the same integers. NumPy is imported on first use, so short runs never pay
+for the import.
+
+Requirements:
+    pip install numpy  (optional, speeds up very long projects)
+"""
+
+import itertools
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+US_PER_SECOND = 1_000_000
+US_PER_MS = 1_000
+
+# Below this many scenes the Python loop beats importing NumPy
+NUMPY_MIN_SCENES = 256
+
+_numpy = None
+
+
+class SceneTiming(NamedTuple):
+    """Boundaries of one scene in microseconds."""
+    start: int
+    end: int
+    images: list[tuple[int, int]]
+    subtitles: list[tuple[int, int]]
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+
+def to_us(seconds: float) -> int:
+    """Convert seconds to integer microseconds."""
+    return round(seconds * US_PER_SECOND)
+
+
+def to_seconds(us: int) -> float:
+    """Convert integer microseconds to seconds."""
+    return us / US_PER_SECOND
+
+
+def _weights(word_counts: list[int]) -> list[int]:
+    """Segment weights; segments of a scene without words share it evenly."""
+    return word_counts if sum(word_counts) > 0 else [1] * len(word_counts)
+
+
+def _layout_python(durations_us: list[int], image_counts: list[int],
+                   segment_words: list[list[int]], start_us: int) -> list[SceneTiming]:
+    timings = []
+    scene_start = start_us
+    for duration, image_count, words in zip(durations_us, image_counts, segment_words):
+        images = [
+            (scene_start + j * duration // image_count, scene_start + (j + 1) * duration // image_count)
+            for j in range(image_count)
+        ]
+
+        weights = _weights(words)
+        total = sum(weights)
+        subtitles = []
+        done = 0
+        for weight in weights:
+            subtitles.append((scene_start + duration * done // total,
+                              scene_start + duration * (done + weight) // total))
+            done += weight
+
+        timings.append(SceneTiming(scene_start, scene_start + duration, images, subtitles))
+        scene_start += duration
+    return timings
+
+
+def load_numpy():
+    """The numpy module, imported on first use, or None if it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def _layout_numpy(np, durations_us: list[int], image_counts: list[int],
+                  segment_words: list[list[int]], start_us: int) -> list[SceneTiming]:
+    n = len(durations_us)
+    durations = np.asarray(durations_us, dtype=np.int64)
+    ends = start_us + np.cumsum(durations)
+    starts = ends - durations
+
+    # Images: slot j of a scene with k images spans [j*d//k, (j+1)*d//k)
+    counts = np.asarray(image_counts, dtype=np.int64)
+    image_offsets = np.concatenate(([0], np.cumsum(counts)))
+    image_scene = np.repeat(np.arange(n), counts)
+    slot = np.arange(image_offsets[-1]) - image_offsets[:-1][image_scene]
+    d = durations[image_scene]
+    k = counts[image_scene]
+    image_starts = (starts[image_scene] + slot * d // k).tolist()
+    image_ends = (starts[image_scene] + (slot + 1) * d // k).tolist()
+
+    # Subtitles: cumulative word counts within each scene
+    weights = [_weights(words) for words in segment_words]
+    seg_counts = np.asarray([len(w) for w in weights], dtype=np.int64)
+    seg_offsets = np.concatenate(([0], np.cumsum(seg_counts)))
+    seg_scene = np.repeat(np.arange(n), seg_counts)
+    flat = np.asarray(list(itertools.chain.from_iterable(weights)), dtype=np.int64)
+    cum = np.cumsum(flat)
+    scene_base = np.concatenate(([0], cum))[seg_offsets[:-1]]
+    done_after = cum - scene_base[seg_scene]
+    done_before = done_after - flat
+    totals = done_after[seg_offsets[1:] - 1] if len(flat) else np.zeros(n, dtype=np.int64)
+    d = durations[seg_scene]
+    t = totals[seg_scene]
+    sub_starts = (starts[seg_scene] + d * done_before // t).tolist()
+    sub_ends = (starts[seg_scene] + d * done_after // t).tolist()
+
+    image_offsets = image_offsets.tolist()
+    seg_offsets = seg_offsets.tolist()
+    starts = starts.tolist()
+    ends = ends.tolist()
+    return [
+        SceneTiming(
+            starts[i], ends[i],
+            list(zip(image_starts[image_offsets[i]:image_offsets[i + 1]],
+                     image_ends[image_offsets[i]:image_offsets[i + 1]])),
+            list(zip(sub_starts[seg_offsets[i]:seg_offsets[i + 1]],
+                     sub_ends[seg_offsets[i]:seg_offsets[i + 1]]))
+        )
+        for i in range(n)
+    ]
+
+
+def layout_scenes(durations_us: list[int], image_counts: list[int],
+                  segment_words: list[list[int]], start_us: int = 0) -> list[SceneTiming]:
+    """
+    Compute scene, image and subtitle boundaries for consecutive scenes.
+
+    Args:
+        durations_us: Scene durations in microseconds
+        image_counts: Images per scene
+        segment_words: Word count of each subtitle segment, per scene
+        start_us: Timeline position of the first scene
+
+    Returns:
+        One SceneTiming per scene
+    """
+    if len(durations_us) >= NUMPY_MIN_SCENES:
+        np = load_numpy()
+        if np is not None:
+            return _layout_numpy(np, durations_us, image_counts, segment_words, start_us)
+    return _layout_python(durations_us, image_counts, segment_words, start_us)
+
+
+def iter_timeline(scenes: Iterable[dict], durations: Iterable[float], start_scene: int = 0,
+                  start_us: int = 0, segment_fn: Callable[[dict], list[str]] = None,
+                  window: int = None) -> Iterator[tuple[dict, SceneTiming, list[str]]]:
+    """
+    Lay out scenes on the timeline, one window at a time.
+
+    Scenes and durations may be lazy iterables (see --stream); both are aligned
+    with scene 0, scenes before start_scene are skipped, and iteration stops
+    when either runs out (an exhausted durations iterable never consumes an
+    extra scene).
+
+    Args:
+        scenes: Scene dicts from script_output.json
+        durations: Scene audio durations in seconds
+        start_scene: 0-based scene to start from
+        start_us: Timeline position in microseconds where start_scene begins
+        segment_fn: Optional function returning a scene's subtitle segments
+            (without it each scene is a single segment)
+        window: Scenes laid out per vectorized pass (default: all at once)
+
+    Yields:
+        (scene, SceneTiming, segments) per scene, in order
+    """
+    durations = iter(durations)
+    scenes = iter(scenes)
+    for _ in range(start_scene):
+        if next(durations, None) is None or next(scenes, None) is None:
+            return
+
+    pairs = zip(durations, scenes)
+    while True:
+        chunk = list(itertools.islice(pairs, window)) if window else list(pairs)
+        if not chunk:
+            return
+
+        chunk_scenes = [scene for _, scene in chunk]
+        segments = [
+            segment_fn(scene) if segment_fn else [scene.get('script', '')]
+            for scene in chunk_scenes
+        ]
+        timings = layout_scenes(
+            [to_us(duration) for duration, _ in chunk],
+            [scene.get('image_count', 1) for scene in chunk_scenes],
+            [[len(segment.split()) for segment in scene_segments] for scene_segments in segments],
+            start_us
+        )
+        yield from zip(chunk_scenes, timings, segments)
+
+        start_us = timings[-1].end
+        if not window:
+            return
+
+
+def timeline_offset(durations: Iterable[float], start_us: int = 0) -> int:
+    """Timeline position in microseconds after the given scene durations."""
+    return start_us + sum(to_us(duration) for duration in durations)
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Verify audio completeness for video projects.
+
+This script reads script_output.json from a project folder, checks that
+audio/ holds one audio_XXX file per scene (audio_001.mp3, audio_002.mp3, ...)
+and validates every present file in parallel:
+
+- the file is not empty
+- MP3 files start with a valid MPEG frame sync (see mp3_frames.py) and
+  are not shorter than their Xing/Info or VBRI header's byte count (a write
+  cut short still carries the full duration in that header)
+- the clip is not far too short for its script: shorter than the script
+  read at --max-wps words per second (CJK characters count as half a word)
+
+Missing, empty, unparseable, truncated and too-short files are reported together with
+the script they should contain.
+
+By default, outputs a missing_audio.json file to the project folder for use
+with text_to_speech_batch to regenerate missing audio. Its call_plan groups
+the missing indexes into contiguous start_index ranges of at most 10
+sentences (text_to_speech_batch has no output_indexes), see regen_plan.py.
+
+Usage:
+    python verify_audio.py <project_folder> [--format mp3] [--max-wps 5]
+
+Example:
+    python verify_audio.py /path/to/project
+    python verify_audio.py /path/to/project --max-wps 4  # Stricter duration check
+    python verify_audio.py ./my_video_project --no-output  # Don't write JSON file
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+from .audio_durations import DEFAULT_WORKERS, DurationCache, probe_with_mutagen
+from .mp3_frames import read_mp3_info
+from .project_index import ProjectIndex, scan_project
+from .regen_plan import describe_call, plan_batches
+
+# Faster than any TTS voice reads, even at speed 2.0
+MAX_WORDS_PER_SECOND = 5.0
+
+_CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]')
+_WORD_RE = re.compile(r"[A-Za-z0-9]+(?:['’][A-Za-z]+)*")
+
+
+def get_expected_file(index: int, audio_format: str = 'mp3') -> str:
+    """
+    Generate the expected audio file name for a 1-based scene index.
+
+    Args:
+        index: The 1-based index of the scene
+        audio_format: Audio file extension (default: mp3)
+
+    Returns:
+        Expected file name, e.g. audio_003.mp3
+    """
+    return f"audio_{index:03d}.{audio_format}"
+
+
+def min_duration(script: str, max_wps: float = MAX_WORDS_PER_SECOND) -> float:
+    """
+    Shortest plausible duration for a script, in seconds.
+
+    Args:
+        script: Scene script text
+        max_wps: Fastest plausible speaking rate in words per second
+
+    Returns:
+        Minimum duration in seconds (0 for empty scripts)
+    """
+    cjk_chars = len(_CJK_RE.findall(script))
+    words = len(_WORD_RE.findall(_CJK_RE.sub(' ', script)))
+    return (words + cjk_chars / 2) / max_wps
+
+
+def check_audio(path: str) -> tuple[str, float]:
+    """
+    Check one audio file's structure and read its duration.
+
+    Args:
+        path: Path to the audio file
+
+    Returns:
+        (reason, duration): reason is None if the file looks intact;
+        duration is None if it could not be read
+    """
+    try:
+        if os.path.getsize(path) == 0:
+            return 'empty file', None
+
+        if path.lower().endswith('.mp3'):
+            info = read_mp3_info(path)
+            if info is None:
+                return 'no MPEG frame sync', None
+            # The header's duration is the whole stream's even when the file
+            # was cut short, so compare its byte count with what is there
+            if info.stream_size and info.audio_size < info.stream_size:
+                return f'truncated: {info.audio_size} of {info.stream_size} bytes', None
+            return None, info.duration
+
+        try:
+            return None, probe_with_mutagen(path)
+        except ImportError:
+            # Without mutagen only the size check applies to non-MP3 formats
+            return None, None
+        except Exception:
+            return 'unreadable audio', None
+    except OSError as e:
+        return f'unreadable ({e.strerror})', None
+
+
+def too_short_reason(duration: float, script: str, max_wps: float = MAX_WORDS_PER_SECOND) -> str:
+    """
+    Reject a clip that is implausibly short for its script.
+
+    Returns:
+        Reason string, or None if the duration is plausible
+    """
+    shortest = min_duration(script, max_wps)
+    if duration < shortest:
+        return f'too short: {duration:.2f}s, expected at least {shortest:.2f}s'
+    return None
+
+
+def verify_audio(project_folder: str, project_index: ProjectIndex = None,
+                 script_data: list[dict] = None, audio_format: str = 'mp3',
+                 max_wps: float = MAX_WORDS_PER_SECOND, workers: int = DEFAULT_WORKERS,
+                 use_cache: bool = True) -> dict:
+    """
+    Verify audio completeness in a project folder.
+
+    Args:
+        project_folder: Path to the project folder
+        project_index: Optional pre-scanned project index (scanned if omitted)
+        script_data: Optional pre-loaded script_output.json entries
+        audio_format: Audio file extension (default: mp3)
+        max_wps: Fastest plausible speaking rate in words per second
+        workers: Concurrent file checks (default: 8)
+        use_cache: Record durations of intact files in the duration cache (default: True)
+
+    Returns:
+        Dictionary containing:
+        - expected_count: Total expected audio file count
+        - actual_count: Intact audio files found
+        - missing: List of dicts with index, audio_file, script and reason
+          ('missing', or why the present file was rejected)
+        - invalid_count: Number of present but rejected files
+        - extra_files: audio_XXX files beyond the last scene
+        - all_complete: Boolean indicating if all audio is present and intact
+    """
+    script_path = os.path.join(project_folder, 'script_output.json')
+    audio_folder = os.path.join(project_folder, 'audio')
+
+    if script_data is None and not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script output not found: {script_path}")
+    if not os.path.exists(audio_folder):
+        raise FileNotFoundError(f"Audio folder not found: {audio_folder}")
+
+    # Load script data
+    if script_data is None:
+        with open(script_path, 'r', encoding='utf-8') as f:
+            script_data = json.load(f)
+
+    # Get existing files in audio folder (single scandir pass)
+    if project_index is None:
+        project_index = scan_project(project_folder)
+    existing_files = project_index.audio
+
+    expected = [get_expected_file(i, audio_format) for i in range(1, len(script_data) + 1)]
+    present = [existing_files[name] for name in expected if name in existing_files]
+
+    # Check every present file in one parallel pass
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        checks = dict(zip(
+            (entry.name for entry in present),
+            executor.map(lambda e: check_audio(e.path), present)
+        ))
+
+    cache = DurationCache(project_folder) if use_cache else None
+
+    actual_count = 0
+    missing = []
+
+    for i, (entry, audio_file) in enumerate(zip(script_data, expected), start=1):
+        script = entry.get('script', '')
+
+        if audio_file not in checks:
+            reason = 'missing'
+            duration = None
+        else:
+            reason, duration = checks[audio_file]
+            if reason is None and duration is not None:
+                reason = too_short_reason(duration, script, max_wps)
+                if reason is None and cache is not None:
+                    file_entry = existing_files[audio_file]
+                    cache.store(file_entry.path, duration, file_entry.stat)
+
+        if reason is None:
+            actual_count += 1
+        else:
+            item = {
+                'index': i,
+                'audio_file': audio_file,
+                'script': script,
+                'reason': reason
+            }
+            if duration is not None:
+                item['duration_seconds'] = round(duration, 3)
+            missing.append(item)
+
+    if cache is not None:
+        cache.save()
+
+    extra_files = sorted(
+        entry.name for (scene_num, ext), entry in project_index.audio_slots.items()
+        if ext == audio_format and scene_num > len(script_data)
+    )
+
+    return {
+        'expected_count': len(expected),
+        'actual_count': actual_count,
+        'missing': missing,
+        'invalid_count': sum(1 for item in missing if item['reason'] != 'missing'),
+        'extra_files': extra_files,
+        'all_complete': len(missing) == 0
+    }
+
+
+def plan_regeneration(result: dict) -> list[dict]:
+    """
+    Pack the missing audio into the fewest text_to_speech_batch calls.
+
+    Args:
+        result: Result dictionary from verify_audio()
+
+    Returns:
+        List of planned start_index calls from regen_plan.plan_batches()
+    """
+    missing = [
+        {'index': item['index'], 'complete': True, 'outputs': [(item['index'], item['audio_file'])]}
+        for item in result['missing']
+    ]
+    return plan_batches(missing, allow_output_indexes=False)
+
+
+def print_report(result: dict, project_folder: str):
+    """
+    Print a formatted verification report.
+
+    Args:
+        result: Result dictionary from verify_audio()
+        project_folder: Path to the project folder for display
+    """
+    print(f"🔍 验证音频完整性")
+    print("=" * 40)
+    print(f"项目文件夹: {project_folder}")
+    print(f"预期音频数: {result['expected_count']}")
+    print(f"有效音频数: {result['actual_count']}")
+    print()
+
+    if result['all_complete']:
+        print("✅ 所有音频已生成完毕！")
+    else:
+        print(f"⚠️ 缺失或无效的音频:")
+        print()
+
+        for item in result['missing']:
+            print(f"  - Index {item['index']}: {item['audio_file']} ({item['reason']})")
+            print(f"    Script: \"{item['script']}\"")
+            print()
+
+        print(f"缺失总数: {len(result['missing'])} 个音频")
+        if result['invalid_count']:
+            print(f"其中无效: {result['invalid_count']} 个（需先删除无效文件，否则批量工具会跳过已存在的文件）")
+
+        plan = plan_regeneration(result)
+        print()
+        print(f"📦 补充生成计划: {len(plan)} 次 text_to_speech_batch 调用")
+        for call in plan:
+            print(f"  - {describe_call(call)}")
+
+    if result['extra_files']:
+        print()
+        print(f"多余的音频文件（超出脚本条数）: {', '.join(result['extra_files'])}")
+
+
+def output_json(result: dict):
+    """
+    Output result as JSON to stdout.
+
+    Args:
+        result: Result dictionary from verify_audio()
+    """
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def save_missing_json(result: dict, project_folder: str) -> str:
+    """
+    Save missing audio info to a JSON file for use with text_to_speech_batch.
+
+    Args:
+        result: Result dictionary from verify_audio()
+        project_folder: Path to the project folder
+
+    Returns:
+        Path to the saved JSON file
+    """
+    output_path = os.path.join(project_folder, 'missing_audio.json')
+
+    # Format for text_to_speech_batch compatibility
+    output_data = {
+        "generated_at": datetime.now().isoformat(),
+        "project_folder": project_folder,
+        "summary": {
+            "expected_count": result['expected_count'],
+            "actual_count": result['actual_count'],
+            "missing_count": len(result['missing']),
+            "invalid_count": result['invalid_count']
+        },
+        "missing_scripts": [
+            {
+                "index": item['index'],
+                "script": item['script'],
+                "audio_file": item['audio_file'],
+                "reason": item['reason']
+            }
+            for item in result['missing']
+        ],
+        "call_plan": plan_regeneration(result)
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output_data, f, ensure_ascii=False, indent=2)
+
+    return output_path
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Verify audio completeness for video projects.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder containing script_output.json and audio/'
+    )
+    parser.add_argument(
+        '--json', '-j',
+        action='store_true',
+        help='Output result as JSON to stdout instead of formatted report'
+    )
+    parser.add_argument(
+        '--no-output',
+        action='store_true',
+        help='Do not write missing_audio.json file to project folder'
+    )
+    parser.add_argument(
+        '--format', '-f',
+        default='mp3',
+        help='Audio file extension (default: mp3)'
+    )
+    parser.add_argument(
+        '--max-wps',
+        type=float,
+        default=MAX_WORDS_PER_SECOND,
+        help=f'Flag clips shorter than their script read at this many words per second '
+             f'(default: {MAX_WORDS_PER_SECOND:g})'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent file checks (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not record durations in the audio duration cache (.audio_durations.json)'
+    )
+
+    args = parser.parse_args(argv)
+
+    # Resolve to absolute path
+    project_folder = os.path.abspath(args.project_folder)
+
+    # Check if project folder exists
+    if not os.path.isdir(project_folder):
+        print(f"Error: Project folder not found: {project_folder}")
+        sys.exit(1)
+
+    try:
+        result = verify_audio(
+            project_folder,
+            audio_format=args.format.lower().lstrip('.'),
+            max_wps=args.max_wps,
+            workers=args.workers,
+            use_cache=not args.no_cache
+        )
+
+        if args.json:
+            output_json(result)
+        else:
+            print_report(result, project_folder)
+
+            # Save missing_audio.json if there is missing audio (unless --no-output)
+            if not result['all_complete'] and not args.no_output:
+                output_path = save_missing_json(result, project_folder)
+                print()
+                print(f"📄 缺失信息已保存到: {output_path}")
+                print("   可使用此文件配合 text_to_speech_batch 补充生成缺失音频")
+
+        # Exit with non-zero status if audio is missing
+        if not result['all_complete']:
+            sys.exit(1)
+
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON - {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Verify image completeness for video projects.
+
+This script reads script_output.json from a project folder,
+checks if all expected images exist in the images/ directory,
+and reports any missing images with their index and original prompt.
+
+With --deep, every present image is also checked structurally (PNG
+signature, IHDR chunk and IEND trailer, see image_integrity.py); zero-byte
+or truncated files are reported as corrupt and treated as missing.
+
+By default, outputs a missing_images.json file to the project folder
+for use with prompt_to_image_batch to regenerate missing images. Its
+call_plan lists the fewest batch calls (at most 10 items each) that cover
+every missing image, see regen_plan.py.
+
+With --profile, a timing span per stage (JSON load, directory scan,
+integrity checks, comparison, report writing) and per checked image is
+written as Chrome trace JSON and summarized (see profiling.py).
+
+Usage:
+    python verify_images.py <project_folder> [--deep] [--profile]
+
+Example:
+    python verify_images.py /path/to/project
+    python verify_images.py /path/to/project --deep  # Also detect corrupt/truncated PNGs
+    python verify_images.py ./my_video_project --no-output  # Don't write JSON file
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from .image_integrity import DEFAULT_WORKERS, IntegrityCache, check_images
+from .profiling import add_profile_arguments, hot, profile_run, profile_trace, span
+from .project_index import ProjectIndex, scan_project
+from .regen_plan import describe_call, output_index, plan_batches
+
+
+def get_expected_files(index: int, image_count: int, image_format: str = 'png') -> list[str]:
+    """
+    Generate expected file names based on index and image_count.
+
+    Naming rules:
+    - Single image (image_count=1): image_003.png (no suffix)
+    - Multiple images (image_count>1): image_001_01.png, image_001_02.png, ...
+
+    Args:
+        index: The 1-based index of the prompt
+        image_count: Number of images expected for this prompt
+        image_format: Image file extension (default: png)
+
+    Returns:
+        List of expected file names
+    """
+    if image_count == 1:
+        return [f"image_{index:03d}.{image_format}"]
+    else:
+        return [f"image_{index:03d}_{i:02d}.{image_format}" for i in range(1, image_count + 1)]
+
+
+def verify_images(project_folder: str, project_index: ProjectIndex = None,
+                  script_data: list[dict] = None, deep: bool = False,
+                  workers: int = DEFAULT_WORKERS, use_cache: bool = True) -> dict:
+    """
+    Verify image completeness in a project folder.
+
+    Args:
+        project_folder: Path to the project folder
+        project_index: Optional pre-scanned project index (scanned if omitted)
+        script_data: Optional pre-loaded script_output.json entries
+        deep: Also validate the structure of every present image
+        workers: Concurrent integrity checks in deep mode (default: 8)
+        use_cache: Reuse/update the integrity cache in deep mode (default: True)
+
+    Returns:
+        Dictionary containing:
+        - expected_count: Total expected image count
+        - actual_count: Actual image count found (intact images only in deep mode)
+        - missing: List of dicts with index, missing_files, and prompt
+          (missing_files includes corrupt files; corrupt_files maps them to a reason)
+        - corrupt_count: Number of corrupt images found (0 unless deep)
+        - all_complete: Boolean indicating if all images are present
+    """
+    script_path = os.path.join(project_folder, 'script_output.json')
+    images_folder = os.path.join(project_folder, 'images')
+
+    if script_data is None and not os.path.exists(script_path):
+        raise FileNotFoundError(f"Script output not found: {script_path}")
+    if not os.path.exists(images_folder):
+        raise FileNotFoundError(f"Images folder not found: {images_folder}")
+
+    # Load script data
+    if script_data is None:
+        with span('load_script'), open(script_path, 'r', encoding='utf-8') as f:
+            script_data = json.load(f)
+
+    # Get existing files in images folder (single scandir pass)
+    if project_index is None:
+        with span('scan_project'):
+            project_index = scan_project(project_folder)
+    existing_files = project_index.images
+
+    expected = [
+        get_expected_files(i, entry.get('image_count', 1))
+        for i, entry in enumerate(script_data, start=1)
+    ]
+
+    # Deep mode: validate every present expected image in one parallel pass
+    corrupt = {}
+    if deep:
+        cache = IntegrityCache(project_folder) if use_cache else None
+        present = [
+            existing_files[name] for names in expected for name in names
+            if name in existing_files
+        ]
+        with span('check_integrity', files=len(present)):
+            corrupt = check_images(present, cache, workers)
+        if cache is not None:
+            with span('save_integrity_cache'):
+                cache.save()
+
+    # Check each prompt's expected images
+    expected_count = 0
+    actual_count = 0
+    missing = []
+
+    with hot('compare'):
+        for i, (entry, expected_files) in enumerate(zip(script_data, expected), start=1):
+            image_count = entry.get('image_count', 1)
+            prompt = entry.get('prompt', '')
+            script = entry.get('script', '')
+
+            expected_count += len(expected_files)
+
+            missing_files = []
+            corrupt_files = {}
+            for expected_file in expected_files:
+                if expected_file in corrupt:
+                    missing_files.append(expected_file)
+                    corrupt_files[expected_file] = corrupt[expected_file]
+                elif expected_file in existing_files:
+                    actual_count += 1
+                else:
+                    missing_files.append(expected_file)
+
+            if missing_files:
+                item = {
+                    'index': i,
+                    'missing_files': missing_files,
+                    'prompt': prompt,
+                    'script': script,
+                    'expected_count': image_count,
+                    'missing_count': len(missing_files)
+                }
+                if corrupt_files:
+                    item['corrupt_files'] = corrupt_files
+                missing.append(item)
+
+    return {
+        'expected_count': expected_count,
+        'actual_count': actual_count,
+        'missing': missing,
+        'corrupt_count': len(corrupt),
+        'all_complete': len(missing) == 0
+    }
+
+
+def plan_regeneration(result: dict) -> list[dict]:
+    """
+    Pack the missing images into the fewest prompt_to_image_batch calls.
+
+    Scenes with every image missing can be regenerated from their original
+    prompt with start_index; partially missing scenes need one single-image
+    prompt per file with output_indexes (see regen_plan.py).
+
+    Args:
+        result: Result dictionary from verify_images()
+
+    Returns:
+        List of planned calls from regen_plan.plan_batches()
+    """
+    missing = []
+    for item in result['missing']:
+        image_count = item['expected_count']
+        expected_files = get_expected_files(item['index'], image_count)
+        missing.append({
+            'index': item['index'],
+            'complete': item['missing_count'] == image_count,
+            'outputs': [
+                (output_index(item['index'], position, image_count), name)
+                for position, name in enumerate(expected_files, start=1)
+                if name in item['missing_files']
+            ]
+        })
+    return plan_batches(missing)
+
+
+def print_report(result: dict, project_folder: str):
+    """
+    Print a formatted verification report.
+
+    Args:
+        result: Result dictionary from verify_images()
+        project_folder: Path to the project folder for display
+    """
+    print(f"🔍 验证图片完整性")
+    print("=" * 40)
+    print(f"项目文件夹: {project_folder}")
+    print(f"预期图片数: {result['expected_count']}")
+    print(f"实际图片数: {result['actual_count']}")
+    print()
+
+    if result['all_complete']:
+        print("✅ 所有图片已生成完毕！")
+    else:
+        total_missing = sum(m['missing_count'] for m in result['missing'])
+        print(f"⚠️ 缺失的图片:")
+        print()
+
+        for item in result['missing']:
+            print(f"  - Index {item['index']}: {', '.join(item['missing_files'])}")
+            for name, reason in item.get('corrupt_files', {}).items():
+                print(f"    Corrupt: {name} ({reason})")
+            # Truncate prompt if too long
+            prompt_preview = item['prompt'][:100] + '...' if len(item['prompt']) > 100 else item['prompt']
+            print(f"    Script: \"{item['script']}\"")
+            print(f"    Prompt: \"{prompt_preview}\"")
+            print()
+
+        print(f"缺失总数: {total_missing} 张图片 (来自 {len(result['missing'])} 个提示词)")
+        if result.get('corrupt_count'):
+            print(f"其中损坏: {result['corrupt_count']} 张（需先删除损坏文件，否则批量工具会跳过已存在的文件）")
+
+        plan = plan_regeneration(result)
+        print()
+        print(f"📦 补充生成计划: {len(plan)} 次 prompt_to_image_batch 调用")
+        for call in plan:
+            print(f"  - {describe_call(call)}")
+
+
+def output_json(result: dict):
+    """
+    Output result as JSON to stdout.
+
+    Args:
+        result: Result dictionary from verify_images()
+    """
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def save_missing_json(result: dict, project_folder: str) -> str:
+    """
+    Save missing images info to a JSON file for use with prompt_to_image_batch.
+
+    Args:
+        result: Result dictionary from verify_images()
+        project_folder: Path to the project folder
+
+    Returns:
+        Path to the saved JSON file
+    """
+    output_path = os.path.join(project_folder, 'missing_images.json')
+
+    # Format for prompt_to_image_batch compatibility
+    output_data = {
+        "generated_at": datetime.now().isoformat(),
+        "project_folder": project_folder,
+        "summary": {
+            "expected_count": result['expected_count'],
+            "actual_count": result['actual_count'],
+            "missing_count": result['expected_count'] - result['actual_count'],
+            "missing_prompts_count": len(result['missing']),
+            "corrupt_count": result.get('corrupt_count', 0)
+        },
+        "missing_prompts": [
+            {
+                "index": item['index'],
+                "prompt": item['prompt'],
+                "script": item['script'],
+                "expected_count": item['expected_count'],
+                "missing_files": item['missing_files'],
+                "missing_count": item['missing_count'],
+                **({"corrupt_files": item['corrupt_files']} if 'corrupt_files' in item else {})
+            }
+            for item in result['missing']
+        ],
+        "call_plan": plan_regeneration(result)
+    }
+
+    with span('write_missing_json'), open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output_data, f, ensure_ascii=False, indent=2)
+
+    return output_path
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Verify image completeness for video projects.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder containing script_output.json and images/'
+    )
+    parser.add_argument(
+        '--json', '-j',
+        action='store_true',
+        help='Output result as JSON to stdout instead of formatted report'
+    )
+    parser.add_argument(
+        '--no-output',
+        action='store_true',
+        help='Do not write missing_images.json file to project folder'
+    )
+    parser.add_argument(
+        '--deep',
+        action='store_true',
+        help='Also validate PNG signature, IHDR and IEND of every present image'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent integrity checks in --deep mode (default: {DEFAULT_WORKERS})'
+    )
+    add_profile_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    # Resolve to absolute path
+    project_folder = os.path.abspath(args.project_folder)
+
+    # Check if project folder exists
+    if not os.path.isdir(project_folder):
+        print(f"Error: Project folder not found: {project_folder}")
+        sys.exit(1)
+
+    with profile_run(profile_trace(args), 'verify_images', project_folder, args.cprofile):
+        try:
+            result = verify_images(project_folder, deep=args.deep, workers=args.workers)
+
+            if args.json:
+                output_json(result)
+            else:
+                print_report(result, project_folder)
+
+                # Save missing_images.json if there are missing images (unless --no-output)
+                if not result['all_complete'] and not args.no_output:
+                    output_path = save_missing_json(result, project_folder)
+                    print()
+                    print(f"📄 缺失信息已保存到: {output_path}")
+                    print("   可使用此文件配合 prompt_to_image_batch 补充生成缺失图片")
+
+            # Exit with non-zero status if images are missing
+            if not result['all_complete']:
+                sys.exit(1)
+
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON - {e}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Watch a project's audio/ and images/ folders while assets are generated.
+
+Instead of re-running verify_images.py / verify_audio.py in a loop (each run
+relists and rechecks the whole project), the watcher scans the project
+once, then keeps the in-memory state current from file events:
+
+- Linux: inotify (via ctypes, no extra dependencies); a file counts once it
+  is closed after writing or renamed into place, so half-written files are
+  never reported as present
+- elsewhere, or with --poll: a periodic scandir diff
+
+Each event rechecks only the affected file (PNG structure with --deep, MP3
+frame sync and plausible duration for audio), updates the completeness
+counts and rewrites missing_images.json / missing_audio.json (same format
+as the verify scripts, including the regeneration call plan). Once the
+last asset lands the reports are removed and, with --refresh-batch,
+images_batch.json and audios_batch.json are rebuilt from the in-memory
+index.
+
+Changes to script_output.json are not picked up; restart the watcher.
+
+Usage:
+    python watch_project.py <project_folder> [--deep] [--refresh-batch] [--exit-on-complete]
+
+Example:
+    python watch_project.py /path/to/project
+    python watch_project.py /path/to/project --deep --refresh-batch --exit-on-complete
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+
+from .image_integrity import validate_png
+from .project_index import scan_folder, scan_project
+from .verify_audio import MAX_WORDS_PER_SECOND, check_audio, too_short_reason, verify_audio
+from .verify_audio import save_missing_json as save_missing_audio_json
+from .verify_images import get_expected_files, verify_images
+from .verify_images import save_missing_json as save_missing_images_json
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class InotifyWatcher:
+    """
+    inotify-based watcher for a few folders (Linux only).
+
+    read() returns (folder, name) pairs for changed files; name is None when
+    the kernel queue overflowed and the folder must be rescanned.
+    """
+
+    def __init__(self, folders: list[str]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self.folders = {}
+        for folder in folders:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, os.strerror(errno), folder)
+            self.folders[wd] = folder
+
+    def read(self, timeout: float) -> list[tuple[str, str]]:
+        """Wait up to timeout seconds and return the changed files."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        data = b''
+        while True:
+            try:
+                chunk = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            data += chunk
+
+        changes = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changes.extend((folder, None) for folder in self.folders.values())
+            elif wd in self.folders and name:
+                changes.append((self.folders[wd], name))
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher that diffs scandir snapshots every interval seconds."""
+
+    def __init__(self, folders: list[str], interval: float = DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+        self.snapshots = {folder: self._snapshot(folder) for folder in folders}
+
+    @staticmethod
+    def _snapshot(folder: str) -> dict:
+        return {name: (entry.size, entry.mtime_ns) for name, entry in scan_folder(folder).items()}
+
+    def read(self, timeout: float) -> list[tuple[str, str]]:
+        time.sleep(min(timeout, self.interval))
+        changes = []
+        for folder, old in self.snapshots.items():
+            new = self._snapshot(folder)
+            changes.extend(
+                (folder, name) for name in old.keys() | new.keys()
+                if old.get(name) != new.get(name)
+            )
+            self.snapshots[folder] = new
+        return changes
+
+    def close(self):
+        pass
+
+
+def open_watcher(folders: list[str], poll: bool = False,
+                 interval: float = DEFAULT_POLL_INTERVAL):
+    """Use inotify where available, otherwise fall back to polling."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(folders)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(folders, interval)
+
+
+class ProjectState:
+    """
+    In-memory completeness state of a project, updated file by file.
+
+    The initial state comes from one verify_images() / verify_audio() pass;
+    afterwards update() rechecks only the file an event refers to.
+    """
+
+    def __init__(self, project_folder: str, deep: bool = False,
+                 max_wps: float = MAX_WORDS_PER_SECOND):
+        self.project_folder = project_folder
+        self.deep = deep
+        self.max_wps = max_wps
+
+        with open(os.path.join(project_folder, 'script_output.json'), 'r', encoding='utf-8') as f:
+            self.script_data = json.load(f)
+
+        self.index = scan_project(project_folder)
+
+        # expected file name -> 1-based scene index
+        self.image_scenes = {
+            name: i
+            for i, entry in enumerate(self.script_data, start=1)
+            for name in get_expected_files(i, entry.get('image_count', 1))
+        }
+        self.audio_scenes = {f"audio_{i:03d}.mp3": i for i in range(1, len(self.script_data) + 1)}
+
+        # expected file name -> reason ('missing' or why the file was rejected)
+        images = verify_images(project_folder, self.index, self.script_data, deep=deep)
+        self.missing_images = {}
+        for item in images['missing']:
+            corrupt = item.get('corrupt_files', {})
+            for name in item['missing_files']:
+                self.missing_images[name] = corrupt.get(name, 'missing')
+
+        audio = verify_audio(project_folder, self.index, self.script_data, max_wps=max_wps)
+        self.missing_audio = {item['audio_file']: item['reason'] for item in audio['missing']}
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing_images and not self.missing_audio
+
+    def counts(self) -> tuple[int, int, int, int]:
+        """(images present, images expected, audio present, audio expected)."""
+        return (
+            len(self.image_scenes) - len(self.missing_images), len(self.image_scenes),
+            len(self.audio_scenes) - len(self.missing_audio), len(self.audio_scenes)
+        )
+
+    def update(self, folder: str, name: str = None) -> bool:
+        """
+        Apply a file event (or rescan the folder if name is None).
+
+        Returns:
+            True if the completeness state changed
+        """
+        is_images = folder == self.index.images_folder
+        names = self.index.update(folder, name)
+        if name is None:
+            # Rescan: recheck every expected file, including ones now gone
+            names = list(self.image_scenes if is_images else self.audio_scenes)
+
+        changed = False
+        for file_name in names:
+            if is_images and file_name in self.image_scenes:
+                changed |= self._set(self.missing_images, file_name, self._check_image(file_name))
+            elif not is_images and file_name in self.audio_scenes:
+                changed |= self._set(self.missing_audio, file_name, self._check_audio(file_name))
+        return changed
+
+    @staticmethod
+    def _set(missing: dict, name: str, reason: str) -> bool:
+        if reason is None:
+            return missing.pop(name, None) is not None
+        changed = missing.get(name) != reason
+        missing[name] = reason
+        return changed
+
+    def _check_image(self, name: str) -> str:
+        entry = self.index.images.get(name)
+        if entry is None:
+            return 'missing'
+        return validate_png(entry.path) if self.deep else None
+
+    def _check_audio(self, name: str) -> str:
+        entry = self.index.audio.get(name)
+        if entry is None:
+            return 'missing'
+        reason, duration = check_audio(entry.path)
+        if reason is None and duration is not None:
+            script = self.script_data[self.audio_scenes[name] - 1].get('script', '')
+            reason = too_short_reason(duration, script, self.max_wps)
+        return reason
+
+    def image_result(self) -> dict:
+        """Current state in the verify_images() result format."""
+        by_scene = {}
+        for name in self.missing_images:
+            by_scene.setdefault(self.image_scenes[name], []).append(name)
+
+        missing = []
+        for i in sorted(by_scene):
+            entry = self.script_data[i - 1]
+            image_count = entry.get('image_count', 1)
+            missing_files = [name for name in get_expected_files(i, image_count) if name in by_scene[i]]
+            item = {
+                'index': i,
+                'missing_files': missing_files,
+                'prompt': entry.get('prompt', ''),
+                'script': entry.get('script', ''),
+                'expected_count': image_count,
+                'missing_count': len(missing_files)
+            }
+            corrupt = {name: self.missing_images[name] for name in missing_files
+                       if self.missing_images[name] != 'missing'}
+            if corrupt:
+                item['corrupt_files'] = corrupt
+            missing.append(item)
+
+        present, expected, _, _ = self.counts()
+        return {
+            'expected_count': expected,
+            'actual_count': present,
+            'missing': missing,
+            'corrupt_count': sum(1 for reason in self.missing_images.values() if reason != 'missing'),
+            'all_complete': not missing
+        }
+
+    def audio_result(self) -> dict:
+        """Current state in the verify_audio() result format."""
+        missing = [
+            {
+                'index': self.audio_scenes[name],
+                'audio_file': name,
+                'script': self.script_data[self.audio_scenes[name] - 1].get('script', ''),
+                'reason': reason
+            }
+            for name, reason in sorted(self.missing_audio.items(), key=lambda item: self.audio_scenes[item[0]])
+        ]
+        _, _, present, expected = self.counts()
+        return {
+            'expected_count': expected,
+            'actual_count': present,
+            'missing': missing,
+            'invalid_count': sum(1 for item in missing if item['reason'] != 'missing'),
+            'all_complete': not missing
+        }
+
+
+def write_reports(state: ProjectState):
+    """Rewrite (or remove, once complete) missing_images.json and missing_audio.json."""
+    for result, save, file_name in (
+        (state.image_result(), save_missing_images_json, 'missing_images.json'),
+        (state.audio_result(), save_missing_audio_json, 'missing_audio.json')
+    ):
+        if result['all_complete']:
+            path = os.path.join(state.project_folder, file_name)
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            save(result, state.project_folder)
+
+
+def refresh_batch(state: ProjectState, use_cache: bool = True) -> tuple[str, str]:
+    """Rebuild images_batch.json / audios_batch.json from the in-memory index."""
+    from .audio_durations import resolve_durations
+    from .prepare_batch_data import build_batch_data, get_scene_audio, save_batch_data
+
+    audio_entries = get_scene_audio(state.index)
+    durations = resolve_durations(state.project_folder, audio_entries[:len(state.script_data)], use_cache)
+    result = build_batch_data(
+        state.script_data, [entry.path for entry in audio_entries], durations, state.index
+    )
+    return save_batch_data(result, state.project_folder)
+
+
+def print_progress(state: ProjectState):
+    images, expected_images, audio, expected_audio = state.counts()
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 图片 {images}/{expected_images}  "
+          f"音频 {audio}/{expected_audio}", flush=True)
+
+
+def watch(project_folder: str, deep: bool = False, refresh: bool = False,
+          exit_on_complete: bool = False, write_output: bool = True, poll: bool = False,
+          interval: float = DEFAULT_POLL_INTERVAL, max_wps: float = MAX_WORDS_PER_SECOND):
+    """
+    Watch a project until interrupted (or until complete with exit_on_complete).
+
+    Args:
+        project_folder: Path to the project folder
+        deep: Validate PNG structure of arriving images
+        refresh: Rebuild the batch JSON files once every asset is present
+        exit_on_complete: Stop once every asset is present
+        write_output: Keep missing_images.json / missing_audio.json up to date
+        poll: Use the polling watcher even where inotify is available
+        interval: Polling interval in seconds
+        max_wps: Fastest plausible speaking rate in words per second
+    """
+    images_folder = os.path.join(project_folder, 'images')
+    audio_folder = os.path.join(project_folder, 'audio')
+    # The generation tools create these folders anyway; they must exist to be watched
+    os.makedirs(images_folder, exist_ok=True)
+    os.makedirs(audio_folder, exist_ok=True)
+
+    # Watch before the initial scan: a file finished while the scan runs then
+    # still arrives as an event (updating an already counted file is harmless)
+    watcher = open_watcher([images_folder, audio_folder], poll, interval)
+    try:
+        state = ProjectState(project_folder, deep, max_wps)
+        mode = 'inotify' if isinstance(watcher, InotifyWatcher) else f'polling every {interval:g}s'
+
+        print(f"👀 监视项目: {project_folder} ({mode})")
+        print_progress(state)
+        if write_output:
+            write_reports(state)
+
+        refreshed = False
+        while True:
+            if state.complete and not refreshed:
+                print("✅ 所有图片和音频已生成完毕！")
+                if refresh:
+                    for path in refresh_batch(state):
+                        print(f"📄 已更新: {path}")
+                refreshed = True
+                if exit_on_complete:
+                    return
+
+            changes = watcher.read(interval)
+            changed = False
+            for folder, name in changes:
+                changed |= state.update(folder, name)
+
+            if changed:
+                print_progress(state)
+                if write_output:
+                    write_reports(state)
+                if not state.complete:
+                    refreshed = False
+    finally:
+        watcher.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Watch audio/ and images/ and keep completeness reports current as assets arrive.'
+    )
+    parser.add_argument(
+        'project_folder',
+        help='Path to the project folder containing script_output.json'
+    )
+    parser.add_argument(
+        '--deep',
+        action='store_true',
+        help='Validate PNG signature, IHDR and IEND of every image'
+    )
+    parser.add_argument(
+        '--refresh-batch',
+        action='store_true',
+        help='Rebuild images_batch.json and audios_batch.json once every asset is present'
+    )
+    parser.add_argument(
+        '--exit-on-complete',
+        action='store_true',
+        help='Stop watching once every asset is present'
+    )
+    parser.add_argument(
+        '--no-output',
+        action='store_true',
+        help='Do not write missing_images.json / missing_audio.json'
+    )
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='Poll the folders instead of using inotify'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f'Polling interval in seconds (default: {DEFAULT_POLL_INTERVAL})'
+    )
+    parser.add_argument(
+        '--max-wps',
+        type=float,
+        default=MAX_WORDS_PER_SECOND,
+        help=f'Fastest plausible speaking rate in words per second (default: {MAX_WORDS_PER_SECOND})'
+    )
+
+    args = parser.parse_args()
+
+    project_folder = os.path.abspath(args.project_folder)
+    if not os.path.isfile(os.path.join(project_folder, 'script_output.json')):
+        print(f"Error: Script output not found: {os.path.join(project_folder, 'script_output.json')}")
+        sys.exit(1)
+
+    try:
+        watch(
+            project_folder,
+            deep=args.deep,
+            refresh=args.refresh_batch,
+            exit_on_complete=args.exit_on_complete,
+            write_output=not args.no_output,
+            poll=args.poll,
+            interval=args.interval,
+            max_wps=args.max_wps
+        )
+    except KeyboardInterrupt:
+        print()
+        print("已停止监视")
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON - {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
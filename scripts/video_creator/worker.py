@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Long-lived worker that answers verify / prepare / srt requests over stdio.
+
+During one image or draft session the same project is verified, refilled,
+verified again, then prepared and subtitled; run as separate processes,
+every call pays interpreter startup, imports, a full directory scan, the
+script_output.json parse and the duration cache load. The worker keeps one
+session per project in memory instead:
+
+- the ProjectIndex of images/ and audio/: a folder whose mtime changed is
+  rescanned, otherwise only its known files are re-stat'ed and the changed
+  ones updated (so files rewritten in place are picked up too)
+- script_output.json, reloaded when its size or mtime changes
+- the audio DurationCache, so unchanged files are never probed again
+
+Protocol: one JSON-RPC 2.0 request per line on stdin, one response per line
+on stdout. Anything the scripts print while handling a request goes to
+stderr, so stdout carries only responses. The worker exits on end of input
+or a "shutdown" request.
+
+Methods (params mirror the script options):
+    verify    project_folder, deep, workers, no_output
+    prepare   project_folder, output_dir, workers, prepared_images, narration
+    srt       project_folder, max_words, output, workers, narration
+    forget    project_folder      (drop the cached session)
+    shutdown
+
+Usage:
+    python worker.py
+
+Example:
+    echo '{"jsonrpc": "2.0", "id": 1, "method": "verify", "params": {"project_folder": "./p"}}' \\
+        | python worker.py
+"""
+
+import contextlib
+import json
+import os
+import sys
+
+from .audio_durations import DEFAULT_WORKERS, DurationCache
+from .generate_srt import generate_srt
+from .prepare_batch_data import prepare_batch_data, save_batch_data
+from .profiling import span
+from .project_index import scan_project
+from .verify_images import save_missing_json, verify_images
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+REQUEST_FAILED = -32000
+
+
+class RequestError(Exception):
+    """A request that cannot be answered; carries its JSON-RPC error code."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def _dir_mtime(folder: str) -> int:
+    """Directory mtime in ns, or None if the folder does not exist."""
+    try:
+        return os.stat(folder).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class ProjectSession:
+    """
+    Cached state of one project, refreshed from mtimes before each request.
+
+    Attributes:
+        index: ProjectIndex of images/ and audio/
+        script_data: Parsed script_output.json (None until first needed)
+        durations: The project's DurationCache
+    """
+
+    def __init__(self, project_folder: str):
+        self.project_folder = project_folder
+        self.script_path = os.path.join(project_folder, 'script_output.json')
+        # Record the mtimes before scanning: a file added during the scan
+        # then shows up as a changed folder on the next refresh
+        self.folder_mtimes = {
+            folder: _dir_mtime(folder)
+            for folder in (os.path.join(project_folder, 'images'), os.path.join(project_folder, 'audio'))
+        }
+        with span('scan_project'):
+            self.index = scan_project(project_folder)
+        self.durations = DurationCache(project_folder)
+        self.script_data = None
+        self._script_signature = None
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the disk.
+
+        Returns:
+            Number of files re-read (a rescanned folder counts all its files)
+        """
+        changed = 0
+        for folder, files in ((self.index.images_folder, self.index.images),
+                              (self.index.audio_folder, self.index.audio)):
+            mtime = _dir_mtime(folder)
+            if mtime != self.folder_mtimes[folder]:
+                # Files were added, removed or renamed: rescan the folder
+                self.folder_mtimes[folder] = mtime
+                changed += len(self.index.update(folder))
+                continue
+            for name, entry in list(files.items()):
+                try:
+                    stat = os.stat(entry.path)
+                except FileNotFoundError:
+                    stat = None
+                if stat is None or (stat.st_size, stat.st_mtime_ns) != (entry.size, entry.mtime_ns):
+                    changed += len(self.index.update(folder, name))
+        return changed
+
+    def load_script(self) -> list[dict]:
+        """script_output.json, parsed again only when its size or mtime changed."""
+        try:
+            stat = os.stat(self.script_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Script output not found: {self.script_path}") from None
+
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if signature != self._script_signature:
+            with span('load_script'), open(self.script_path, 'r', encoding='utf-8') as f:
+                self.script_data = json.load(f)
+            self._script_signature = signature
+        return self.script_data
+
+
+class Worker:
+    """Dispatches requests to per-project sessions."""
+
+    def __init__(self):
+        self.sessions = {}
+        self.running = True
+
+    def session(self, params: dict) -> ProjectSession:
+        """Get (or start) the session for params['project_folder'], refreshed."""
+        folder = params.get('project_folder')
+        if not isinstance(folder, str):
+            raise RequestError(INVALID_PARAMS, "project_folder is required")
+        folder = os.path.abspath(folder)
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"Project folder not found: {folder}")
+
+        session = self.sessions.get(folder)
+        if session is None:
+            session = self.sessions[folder] = ProjectSession(folder)
+        else:
+            with span('refresh'):
+                session.refresh()
+        return session
+
+    def verify(self, params: dict) -> dict:
+        session = self.session(params)
+        result = verify_images(
+            session.project_folder, session.index, session.load_script(),
+            deep=params.get('deep', False), workers=params.get('workers', DEFAULT_WORKERS)
+        )
+        if not result['all_complete'] and not params.get('no_output', False):
+            result['missing_json'] = save_missing_json(result, session.project_folder)
+        return result
+
+    def prepare(self, params: dict) -> dict:
+        session = self.session(params)
+        result = prepare_batch_data(
+            session.project_folder,
+            workers=params.get('workers', DEFAULT_WORKERS),
+            prepared_images=params.get('prepared_images', False),
+            narration=params.get('narration', False),
+            project_index=session.index,
+            script_output=session.load_script(),
+            cache=session.durations
+        )
+        output_dir = params.get('output_dir') or session.project_folder
+        images_batch_path, audios_batch_path = save_batch_data(result, output_dir)
+        return {
+            'stats': result['stats'],
+            'warnings': result['warnings'],
+            'paths': [images_batch_path, audios_batch_path]
+        }
+
+    def srt(self, params: dict) -> dict:
+        session = self.session(params)
+        output_path, total_entries, split_count = generate_srt(
+            session.project_folder,
+            max_words=params.get('max_words', 12),
+            output_path=params.get('output'),
+            workers=params.get('workers', DEFAULT_WORKERS),
+            narration=params.get('narration', False),
+            project_index=session.index,
+            script_data=session.load_script(),
+            cache=session.durations
+        )
+        return {'path': output_path, 'total_entries': total_entries, 'split_count': split_count}
+
+    def forget(self, params: dict) -> dict:
+        folder = os.path.abspath(params.get('project_folder') or '')
+        return {'forgotten': self.sessions.pop(folder, None) is not None}
+
+    def shutdown(self, params: dict) -> dict:
+        self.running = False
+        return {}
+
+    METHODS = ('verify', 'prepare', 'srt', 'forget', 'shutdown')
+
+    def handle(self, line: str) -> dict:
+        """
+        Answer one request line.
+
+        Returns:
+            JSON-RPC response dict, or None for a notification (no id)
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': str(e)}}
+
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                raise RequestError(INVALID_REQUEST, "Expected an object with a method")
+            method = request['method']
+            if method not in self.METHODS:
+                raise RequestError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+            params = request.get('params') or {}
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "params must be an object")
+
+            # Keep stdout for responses; the scripts' own messages go to stderr
+            with contextlib.redirect_stdout(sys.stderr):
+                result = getattr(self, method)(params)
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except RequestError as e:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': str(e)}}
+        except Exception as e:
+            # A bad project (or a missing optional dependency such as mutagen)
+            # fails this request only; the session keeps serving
+            response = {
+                'jsonrpc': '2.0', 'id': request_id,
+                'error': {'code': REQUEST_FAILED, 'message': str(e), 'data': type(e).__name__}
+            }
+
+        if isinstance(request, dict) and 'id' not in request and 'error' not in response:
+            return None
+        return response
+
+
+def serve(stdin=None, stdout=None):
+    """Read requests from stdin until end of input or shutdown."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    worker = Worker()
+
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = worker.handle(line)
+        if response is not None:
+            stdout.write(json.dumps(response, ensure_ascii=False) + '\n')
+            stdout.flush()
+        if not worker.running:
+            break
+
+
+def main(argv: list[str] = None, prog: str = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Serve verify / prepare / srt requests as JSON-RPC lines on stdin/stdout, '
+                    'keeping project indexes and audio durations warm between requests.'
+    )
+    parser.parse_args(argv)
+
+    try:
+        serve()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
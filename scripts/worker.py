@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+"""Run video_creator.worker (this path is kept so existing commands keep working)."""
+
+from video_creator.worker import main
+
+if __name__ == '__main__':
+    main()
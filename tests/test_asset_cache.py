@@ -0,0 +1,42 @@
+"""Shared cache tests for asset_cache.py."""
+
+import os
+
+from video_creator.asset_cache import AssetCache, audio_key
+
+KEY = audio_key('hello', 'voice', 1.0, 'mp3')
+
+
+def test_hits_are_copies_by_default(tmp_path):
+    cache = AssetCache(str(tmp_path / 'cache'))
+    cache.store(KEY, b'audio data', '.mp3')
+    target = tmp_path / 'audio_001.mp3'
+
+    assert cache.fetch(KEY, str(target))
+
+    # Rewriting the project file in place leaves the cached object intact
+    with open(target, 'r+b') as f:
+        f.write(b'XXXXX')
+    other = tmp_path / 'audio_002.mp3'
+    assert cache.fetch(KEY, str(other))
+    assert other.read_bytes() == b'audio data'
+    assert cache.stats['hits'] == 2
+
+
+def test_object_changed_through_hardlink_is_evicted(tmp_path):
+    cache = AssetCache(str(tmp_path / 'cache'), hardlink=True)
+    cache.store(KEY, b'audio data', '.mp3')
+    target = tmp_path / 'audio_001.mp3'
+    assert cache.fetch(KEY, str(target))
+    assert os.path.samefile(target, cache.object_path(KEY, '.mp3'))
+    cache.save()
+
+    # An external tool rewrites the hardlinked project file in place
+    with open(target, 'r+b') as f:
+        f.write(b'XXXXX')
+
+    reloaded = AssetCache(str(tmp_path / 'cache'), hardlink=True)
+    assert not reloaded.fetch(KEY, str(tmp_path / 'audio_002.mp3'))
+    assert not os.path.exists(reloaded.object_path(KEY, '.mp3'))
+    assert not (tmp_path / 'audio_002.mp3').exists()
+    assert reloaded.stats['misses'] == 1
@@ -0,0 +1,66 @@
+"""Duration cache tests for audio_durations.py."""
+
+import os
+
+from video_creator.audio_durations import DurationCache
+
+# MPEG-1 Layer III, 32 kbps, 44.1 kHz, no Xing header: the duration is the
+# constant bitrate estimate, 8 * size / 32000
+FRAME = b'\xff\xfb\x10\x00' + b'\x00' * 100
+FRAME_SECONDS = 8 * len(FRAME) / 32000
+
+
+def write_mp3(path, frames: int, mtime_ns: int = None):
+    path.write_bytes(FRAME * frames)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_unchanged_file_is_not_probed_again(tmp_path):
+    path = write_mp3(tmp_path / 'audio_001.mp3', 100)
+
+    cache = DurationCache(str(tmp_path))
+    assert abs(cache.get_duration(path) - 100 * FRAME_SECONDS) < 1e-9
+    cache.save()
+
+    reloaded = DurationCache(str(tmp_path))
+    assert abs(reloaded.get_duration(path) - 100 * FRAME_SECONDS) < 1e-9
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+def test_size_change_invalidates_entry(tmp_path):
+    path = write_mp3(tmp_path / 'audio_001.mp3', 100, mtime_ns=10**18)
+    cache = DurationCache(str(tmp_path))
+    cache.get_duration(path)
+
+    # Same mtime, different size
+    write_mp3(tmp_path / 'audio_001.mp3', 50, mtime_ns=10**18)
+
+    assert cache.lookup(path) is None
+    assert abs(cache.get_duration(path) - 50 * FRAME_SECONDS) < 1e-9
+    assert cache.misses == 2
+
+
+def test_mtime_change_invalidates_entry(tmp_path):
+    path = write_mp3(tmp_path / 'audio_001.mp3', 100, mtime_ns=10**18)
+    cache = DurationCache(str(tmp_path))
+    cache.get_duration(path)
+
+    # Same size, rewritten later
+    os.utime(path, ns=(10**18 + 1, 10**18 + 1))
+
+    assert cache.lookup(path) is None
+    cache.get_duration(path)
+    assert cache.misses == 2
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    path = write_mp3(tmp_path / 'audio_001.mp3', 10)
+    (tmp_path / '.audio_durations.json').write_text('{not json')
+
+    cache = DurationCache(str(tmp_path))
+    cache.get_duration(path)
+    cache.save()
+
+    assert DurationCache(str(tmp_path)).lookup(path) is not None
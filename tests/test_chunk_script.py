@@ -0,0 +1,27 @@
+"""Batch boundary tests for chunk_script.py."""
+
+from video_creator.chunk_script import plan_batches, text_size
+
+
+def test_batches_are_even_without_small_remainder():
+    # One paragraph of 800 CJK sentences: every cut falls inside it
+    text = ''.join('这是一个用于测试的句子'[:6 + i % 5] + '。' for i in range(800))
+
+    ranges = plan_batches(text, 2000)
+    sizes = [text_size(text[start:end]) for start, end in ranges]
+
+    assert ''.join(text[start:end] for start, end in ranges) == text
+    assert max(sizes) <= 2000
+    assert len(ranges) == -(-text_size(text) // 2000)
+    assert max(sizes) - min(sizes) < 100
+
+
+def test_whole_paragraphs_are_kept():
+    paragraphs = [' '.join(['Sentence number %d here.' % i] * 8) for i in range(40)]
+    text = '\n\n'.join(paragraphs)
+
+    ranges = plan_batches(text, 1000)
+
+    for start, end in ranges:
+        assert text[start:end].startswith('Sentence') and text[start:end].endswith('here.')
+        assert all(paragraph in paragraphs for paragraph in text[start:end].split('\n\n'))
@@ -0,0 +1,201 @@
+"""Scheduler tests for generate_assets.py against a local stub endpoint."""
+
+import asyncio
+import base64
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from video_creator import generate_assets as ga
+from video_creator.asset_cache import AssetCache
+
+AUDIO_SETTINGS = {'voice_id': 'voice', 'speed': 1.0, 'format': 'mp3'}
+IMAGE_SETTINGS = {'model': 'model', 'size': '64x64'}
+
+SCRIPT = [
+    {'script': 'one', 'prompt': 'p1'},
+    {'script': 'two', 'prompt': 'p2', 'image_count': 2},
+    {'script': 'three', 'prompt': 'p3'},
+]
+
+
+class StubServer:
+    """
+    TTS and image endpoints that fail on request before answering.
+
+    failures maps (path, text or prompt) to the statuses returned, in order,
+    before the request succeeds; requests records every request received.
+    """
+
+    def __init__(self):
+        self.failures = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                key = (self.path, payload.get('text', payload.get('prompt')))
+                with stub._lock:
+                    stub.requests.append(key)
+                    pending = stub.failures.get(key)
+                    status = pending.pop(0) if pending else 200
+
+                if status != 200:
+                    self.send_response(status)
+                    self.send_header('Retry-After', '0')
+                    self.end_headers()
+                    return
+
+                if self.path == '/tts':
+                    body = {'audio': _b64(f"audio:{payload['text']}")}
+                else:
+                    body = {'images': [_b64(f"image:{payload['prompt']}:{i}")
+                                       for i in range(payload['image_count'])]}
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _b64(text: str) -> str:
+    return base64.b64encode(text.encode('utf-8')).decode('ascii')
+
+
+@pytest.fixture
+def server():
+    stub = StubServer()
+    yield stub
+    stub.close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(ga, 'BACKOFF_BASE', 0.0)
+
+
+def make_project(folder) -> str:
+    os.makedirs(folder)
+    with open(os.path.join(folder, 'script_output.json'), 'w', encoding='utf-8') as f:
+        json.dump(SCRIPT, f)
+    return str(folder)
+
+
+def run(project, server, **kwargs):
+    return asyncio.run(ga.generate_assets(
+        project, tts_url=server.url + '/tts', image_url=server.url + '/image',
+        audio_settings=AUDIO_SETTINGS, image_settings=IMAGE_SETTINGS, rate=0, **kwargs
+    ))
+
+
+def project_files(project) -> set:
+    return {
+        os.path.join(folder, name)
+        for folder in ('audio', 'images')
+        for name in os.listdir(os.path.join(project, folder))
+    }
+
+
+EXPECTED_FILES = {
+    'audio/audio_001.mp3', 'audio/audio_002.mp3', 'audio/audio_003.mp3',
+    'images/image_001.png', 'images/image_002_01.png', 'images/image_002_02.png', 'images/image_003.png',
+}
+
+
+def test_retries_throttling_and_errors(tmp_path, server):
+    project = make_project(tmp_path / 'project')
+    server.failures = {
+        ('/tts', 'one'): [429],
+        ('/tts', 'two'): [500, 500],
+        ('/image', 'p3'): [503],
+    }
+
+    result = run(project, server)
+
+    assert result['audio']['failures'] == {}
+    assert result['images']['failures'] == {}
+    assert result['audio']['succeeded'] == 3
+    assert result['audio']['attempts'] == 6
+    assert result['audio']['throttled'] == 1
+    assert result['images']['attempts'] == 4
+    assert result['images']['throttled'] == 1
+    assert project_files(project) == EXPECTED_FILES
+    with open(os.path.join(project, 'images', 'image_002_02.png'), 'rb') as f:
+        assert f.read() == b'image:p2:1'
+
+
+def test_resume_only_requests_missing_files(tmp_path, server):
+    project = make_project(tmp_path / 'project')
+    run(project, server)
+    os.remove(os.path.join(project, 'audio', 'audio_002.mp3'))
+    server.requests.clear()
+
+    result = run(project, server)
+
+    assert server.requests == [('/tts', 'two')]
+    assert result['audio']['total'] == 1
+    assert project_files(project) == EXPECTED_FILES
+
+
+def test_cache_hits_skip_requests(tmp_path, server):
+    cache = AssetCache(str(tmp_path / 'cache'))
+    run(make_project(tmp_path / 'first'), server, cache=cache)
+    server.requests.clear()
+
+    second = make_project(tmp_path / 'second')
+    result = run(second, server, cache=AssetCache(str(tmp_path / 'cache')))
+
+    assert server.requests == []
+    assert result['audio']['cached'] == 3
+    assert result['images']['cached'] == 3
+    assert project_files(second) == EXPECTED_FILES
+
+
+def test_failed_item_does_not_stop_the_run(tmp_path, server):
+    project = make_project(tmp_path / 'project')
+    server.failures = {('/tts', 'two'): [400]}
+    # A directory in place of the target file makes the write fail
+    os.makedirs(os.path.join(project, 'images', 'image_003.png'))
+
+    result = run(project, server)
+
+    assert set(result['audio']['failures']) == {2}
+    assert set(result['images']['failures']) == {3}
+    assert result['images']['failures'][3].startswith('IsADirectoryError')
+    assert result['audio']['succeeded'] == 2
+    assert result['images']['succeeded'] == 2
+    # images/image_003.png is still the directory
+    assert project_files(project) == EXPECTED_FILES - {'audio/audio_002.mp3'}
+    assert os.path.isdir(os.path.join(project, 'images', 'image_003.png'))
+
+
+def test_server_errors_do_not_raise_concurrency(tmp_path, server):
+    server.failures = {('/tts', 'one'): [500] * 4}
+    items = ga.build_audio_items(SCRIPT[:1], str(tmp_path), AUDIO_SETTINGS)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        scheduler = ga.Scheduler(server.url + '/tts', ga.extract_audio, rate=0, concurrency=1,
+                                 max_concurrency=10, retries=3, executor=executor)
+        failures = asyncio.run(scheduler.run(items))
+
+    assert failures == {1: 'HTTP 500 Internal Server Error'}
+    assert scheduler.attempts == 4
+    assert scheduler.limiter.limit == 1
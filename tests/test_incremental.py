@@ -0,0 +1,33 @@
+"""Build state and SRT patching tests for incremental.py."""
+
+import os
+
+from video_creator.incremental import _srt_prefix, incremental_build
+from video_creator.make_synthetic_project import make_project
+
+SRT = (
+    "1\n00:00:00,000 --> 00:00:01,000\nfirst line\n\nsecond line\n\n"
+    "2\n00:00:01,000 --> 00:00:02,000\nsecond entry\n\n"
+    "3\n00:00:02,000 --> 00:00:03,000\nthird entry\n"
+)
+
+
+def test_prefix_counts_entries_not_blank_lines():
+    assert _srt_prefix(SRT, 1) == "1\n00:00:00,000 --> 00:00:01,000\nfirst line\n\nsecond line"
+    assert _srt_prefix(SRT, 2).endswith("second entry")
+    assert _srt_prefix(SRT, 5) == SRT.rstrip('\n')
+
+
+def test_outputs_rewritten_elsewhere_force_a_full_build(tmp_path):
+    project = str(tmp_path / 'project')
+    make_project(project, 12, missing_images=0, corrupt_images=0)
+    assert incremental_build(project)['full_rebuild']
+    assert not incremental_build(project)['full_rebuild']
+
+    # Another mode (e.g. prepare --narration) rewrote the batch file
+    images_batch = os.path.join(project, 'images_batch.json')
+    with open(images_batch, 'a', encoding='utf-8') as f:
+        f.write('\n')
+
+    assert incremental_build(project)['full_rebuild']
+    assert not incremental_build(project)['full_rebuild']
@@ -0,0 +1,85 @@
+"""Streaming JSON array tests for json_stream.py."""
+
+import json
+
+import pytest
+
+from video_creator.json_stream import JsonArrayWriter, iter_json_array
+
+DOCUMENT = '''
+  [ {"script": "第一句\\n含转义 \\"引号\\" 和 \\u00e9", "image_count": 3},
+    12345678901234567890, -0.5e-3, "tail \\\\", true,  null ,
+    [1, [2, [3]], {"a": []}], {"prompt": "''' + 'x' * 300 + '''"}, 9876
+  ]
+'''
+
+
+def test_writer_replaces_file_on_success(tmp_path):
+    path = tmp_path / 'images_batch.json'
+    path.write_text('[{"old":1}]')
+
+    with JsonArrayWriter(str(path)) as writer:
+        writer.write({'a': 1})
+        writer.write({'b': 2})
+
+    assert json.loads(path.read_text()) == [{'a': 1}, {'b': 2}]
+    assert not (tmp_path / 'images_batch.json.tmp').exists()
+
+
+def test_failed_run_keeps_previous_file(tmp_path):
+    path = tmp_path / 'images_batch.json'
+    path.write_text('[{"old":1}]')
+
+    with pytest.raises(RuntimeError):
+        with JsonArrayWriter(str(path)) as writer:
+            writer.write({'a': 1})
+            raise RuntimeError('probe failed')
+
+    assert path.read_text() == '[{"old":1}]'
+    assert not (tmp_path / 'images_batch.json.tmp').exists()
+
+
+def test_failed_first_run_leaves_no_file(tmp_path):
+    path = tmp_path / 'images_batch.json'
+
+    with pytest.raises(RuntimeError):
+        with JsonArrayWriter(str(path)):
+            raise RuntimeError('probe failed')
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64, 1 << 16])
+def test_tokens_split_across_chunks(tmp_path, chunk_size):
+    path = tmp_path / 'script_output.json'
+    path.write_text(DOCUMENT, encoding='utf-8')
+
+    assert list(iter_json_array(str(path), chunk_size)) == json.loads(DOCUMENT)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 1 << 16])
+def test_round_trip_with_writer(tmp_path, chunk_size):
+    items = [{'scene': i, 'text': '场景' * (i % 7), 'duration': i / 3} for i in range(200)]
+    path = tmp_path / 'audios_batch.json'
+    with JsonArrayWriter(str(path), ensure_ascii=False) as writer:
+        for item in items:
+            writer.write(item)
+
+    assert list(iter_json_array(str(path), chunk_size)) == items
+
+
+@pytest.mark.parametrize('text', [' [ ] ', '[]'])
+def test_empty_array(tmp_path, text):
+    path = tmp_path / 'empty.json'
+    path.write_text(text)
+
+    assert list(iter_json_array(str(path), 1)) == []
+
+
+@pytest.mark.parametrize('text', ['{"a": 1}', '[1 2]', '[1, 2', '[{"a": 1}, {"b":'])
+def test_malformed_arrays_raise(tmp_path, text):
+    path = tmp_path / 'bad.json'
+    path.write_text(text)
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(str(path), 2))
@@ -0,0 +1,20 @@
+"""One-pass build tests for manifest.py."""
+
+import os
+
+from video_creator.incremental import incremental_build
+from video_creator.make_synthetic_project import make_project
+from video_creator.manifest import build_manifest
+
+
+def test_missing_audio_is_found_by_name(tmp_path):
+    project = str(tmp_path / 'project')
+    make_project(project, 10, missing_images=0, corrupt_images=0)
+    os.remove(os.path.join(project, 'audio', 'audio_003.mp3'))
+
+    assert build_manifest(project)['missing_audio'] == [3]
+
+    result = incremental_build(project)
+    assert result['full_rebuild']
+    assert result['missing_audio'] == [3]
+    assert not os.path.exists(os.path.join(project, '.build_state.json'))
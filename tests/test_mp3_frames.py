@@ -0,0 +1,91 @@
+"""Frame header reader tests for mp3_frames.py."""
+
+import struct
+
+import pytest
+
+from video_creator.mp3_frames import (build_info_frame, parse_frame_header, read_mp3_info,
+                                      scan_frames, xing_offset)
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo, no padding: 417-byte frames
+FRAME_HEADER = b'\xff\xfb\x90\x00'
+FRAME = FRAME_HEADER + b'\x00' * 413
+HEADER = parse_frame_header(FRAME_HEADER)
+SAMPLES_PER_FRAME = 1152
+SAMPLE_RATE = 44100
+
+
+def id3v2_tag(payload_size: int) -> bytes:
+    size = bytes((payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b'ID3\x04\x00\x00' + size + b'\x00' * payload_size
+
+
+def xing_frame(frame_count: int, lame_delay: int = None, lame_padding: int = None) -> bytes:
+    frame = bytearray(build_info_frame(HEADER, frame_count, frame_count * len(FRAME), vbr=True))
+    if lame_delay is not None:
+        # LAME extension right after the frames/bytes fields
+        lame = xing_offset(parse_frame_header(bytes(frame))) + 16
+        frame[lame:lame + 9] = b'LAME3.100'
+        frame[lame + 9] = 0x00
+        frame[lame + 21:lame + 24] = ((lame_delay << 12) | lame_padding).to_bytes(3, 'big')
+    return bytes(frame)
+
+
+def vbri_frame(frame_count: int, byte_count: int) -> bytes:
+    frame = bytearray(FRAME)
+    struct.pack_into('>4sHHHII', frame, 36, b'VBRI', 1, 0, 75, byte_count, frame_count)
+    return bytes(frame)
+
+
+def test_cbr_estimate(tmp_path):
+    path = tmp_path / 'cbr.mp3'
+    path.write_bytes(FRAME * 250)
+
+    info = read_mp3_info(str(path))
+
+    assert info.header == HEADER
+    assert info.audio_start == 0
+    assert info.duration == pytest.approx(8 * 250 * len(FRAME) / 128000)
+    assert info.stream_size is None
+    assert scan_frames(str(path)).frame_count == 250
+
+
+def test_xing_frame_count_after_id3v2_tag(tmp_path):
+    path = tmp_path / 'xing.mp3'
+    tag = id3v2_tag(3000)
+    path.write_bytes(tag + xing_frame(321) + FRAME * 321)
+
+    info = read_mp3_info(str(path))
+
+    assert info.audio_start == len(tag)
+    assert info.duration == pytest.approx(321 * SAMPLES_PER_FRAME / SAMPLE_RATE)
+    assert info.stream_size == info.audio_size
+    # The Info frame itself is not audio
+    assert scan_frames(str(path)).frame_count == 321
+
+
+def test_lame_delay_and_padding_are_removed(tmp_path):
+    path = tmp_path / 'lame.mp3'
+    path.write_bytes(xing_frame(100, lame_delay=576, lame_padding=1000) + FRAME * 100)
+
+    info = read_mp3_info(str(path))
+
+    assert info.duration == pytest.approx((100 * SAMPLES_PER_FRAME - 576 - 1000) / SAMPLE_RATE)
+
+
+def test_vbri_frame_count(tmp_path):
+    path = tmp_path / 'vbri.mp3'
+    path.write_bytes(vbri_frame(77, 78 * len(FRAME)) + FRAME * 77)
+
+    info = read_mp3_info(str(path))
+
+    assert info.duration == pytest.approx(77 * SAMPLES_PER_FRAME / SAMPLE_RATE)
+    assert info.stream_size == 78 * len(FRAME)
+
+
+def test_no_frame_sync(tmp_path):
+    path = tmp_path / 'junk.mp3'
+    path.write_bytes(b'\x00\x01' * 2000)
+
+    assert read_mp3_info(str(path)) is None
+    assert scan_frames(str(path)) is None
@@ -0,0 +1,18 @@
+"""Call planning tests for regen_plan.py."""
+
+from video_creator.regen_plan import output_index, plan_batches
+
+
+def test_output_indexes_calls_follow_scene_order():
+    missing = [
+        {'index': 5, 'complete': False, 'outputs': [(output_index(5, 1, 2), 'image_005_01.png')]},
+        {'index': 12, 'complete': False, 'outputs': [(output_index(12, 1, 1), 'image_012.png')]},
+        {'index': 20, 'complete': True, 'outputs': [(output_index(20, 1, 1), 'image_020.png')]},
+    ]
+
+    calls = plan_batches(missing, max_batch=1)
+
+    assert [call['files'] for call in calls] == [
+        ['image_005_01.png'], ['image_012.png'], ['image_020.png']
+    ]
+    assert calls[0]['output_indexes'] == [501]
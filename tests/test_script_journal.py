@@ -0,0 +1,90 @@
+"""Journal tests for script_journal.py."""
+
+import json
+import os
+
+import pytest
+
+from video_creator.script_journal import (JOURNAL_FILENAME, OUTPUT_FILENAME, append_batch,
+                                          compact_journal, journal_status, read_journal)
+
+SENTENCES = ['First sentence here.', 'Second one.', 'Third and last sentence.']
+
+
+@pytest.fixture
+def project(tmp_path):
+    with open(tmp_path / 'scenes.json', 'w', encoding='utf-8') as f:
+        json.dump({'sentences': [{'script': text} for text in SENTENCES]}, f)
+    return str(tmp_path)
+
+
+def scene(index: int, **extra) -> dict:
+    return {'index': index, 'script': SENTENCES[index - 1], 'prompt': f'prompt {index}', **extra}
+
+
+def journal_path(project) -> str:
+    return os.path.join(project, JOURNAL_FILENAME)
+
+
+def test_torn_last_line_is_dropped_and_overwritten(project):
+    append_batch(project, [scene(1), scene(2)])
+    # A crash in the middle of the next append
+    with open(journal_path(project), 'ab') as f:
+        f.write(b'{"batch":2,"scenes":[{"index":3,"scr')
+
+    scenes, batches, _ = read_journal(project)
+    assert [s['index'] for s in scenes] == [1, 2]
+    assert batches == 1
+    assert journal_status(project)['next_index'] == 3
+
+    result = append_batch(project, [scene(3)])
+
+    assert result == {'batch': 2, 'start': 3, 'end': 3, 'total': 3}
+    with open(journal_path(project), 'rb') as f:
+        lines = f.read().split(b'\n')
+    assert lines[-1] == b''
+    assert [json.loads(line)['batch'] for line in lines[:-1]] == [1, 2]
+
+
+def test_invalid_batch_is_not_written(project):
+    append_batch(project, [scene(1)])
+    size = os.path.getsize(journal_path(project))
+
+    with pytest.raises(ValueError) as error:
+        append_batch(project, [scene(3), {'index': 3, 'script': 'Other text.', 'prompt': ''}])
+
+    message = str(error.value)
+    assert 'index must be 2' in message
+    assert 'differs from scenes.json' in message
+    assert 'prompt must be a non-empty string' in message
+    assert os.path.getsize(journal_path(project)) == size
+
+
+def test_compact_writes_output_and_removes_journal(project):
+    append_batch(project, [scene(1, word_count=12, image_count=3)])
+    append_batch(project, [scene(2), scene(3)])
+
+    path = compact_journal(project)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        output = json.load(f)
+    assert output == [
+        {'script': SENTENCES[0], 'word_count': 12, 'image_count': 3, 'prompt': 'prompt 1'},
+        {'script': SENTENCES[1], 'prompt': 'prompt 2'},
+        {'script': SENTENCES[2], 'prompt': 'prompt 3'},
+    ]
+    assert list(output[0]) == ['script', 'word_count', 'image_count', 'prompt']
+    assert not os.path.exists(journal_path(project))
+
+
+def test_incomplete_journal_needs_partial(project):
+    append_batch(project, [scene(1)])
+
+    with pytest.raises(ValueError, match='continue from scene 2'):
+        compact_journal(project)
+    assert not os.path.exists(os.path.join(project, OUTPUT_FILENAME))
+
+    compact_journal(project, partial=True)
+    # The journal is kept for the remaining batches
+    assert read_journal(project)[0][0]['index'] == 1
+    assert append_batch(project, [scene(2), scene(3)])['total'] == 3
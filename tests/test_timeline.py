@@ -0,0 +1,59 @@
+"""Layout tests for timeline.py."""
+
+import random
+
+import pytest
+
+from video_creator import timeline
+from video_creator.timeline import NUMPY_MIN_SCENES, iter_timeline, layout_scenes, timeline_offset
+
+np = pytest.importorskip('numpy')
+
+
+def random_scenes(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    durations_us = [rng.randint(1, 30_000_000) for _ in range(count)]
+    image_counts = [rng.choice([1, 1, 2, 3, 7]) for _ in range(count)]
+    # Includes scenes whose segments have no words (shared evenly)
+    segment_words = [[rng.choice([0, 1, 3, 12, 40]) for _ in range(rng.randint(1, 5))]
+                     for _ in range(count)]
+    return durations_us, image_counts, segment_words
+
+
+@pytest.mark.parametrize('count', [NUMPY_MIN_SCENES, 1000])
+@pytest.mark.parametrize('start_us', [0, 123_456_789])
+def test_numpy_and_python_layouts_are_identical(count, start_us):
+    durations_us, image_counts, segment_words = random_scenes(count)
+
+    vectorized = timeline._layout_numpy(np, durations_us, image_counts, segment_words, start_us)
+    looped = timeline._layout_python(durations_us, image_counts, segment_words, start_us)
+
+    assert vectorized == looped
+    assert all(type(value) is int for value in (vectorized[-1].end, vectorized[-1].images[-1][1]))
+
+
+def test_layout_uses_numpy_from_threshold(monkeypatch):
+    calls = []
+    monkeypatch.setattr(timeline, '_layout_python', lambda *args: calls.append('python') or [])
+    monkeypatch.setattr(timeline, '_layout_numpy', lambda *args: calls.append('numpy') or [])
+
+    layout_scenes(*random_scenes(NUMPY_MIN_SCENES - 1))
+    layout_scenes(*random_scenes(NUMPY_MIN_SCENES))
+
+    assert calls == ['python', 'numpy']
+
+
+def test_windows_continue_the_same_timeline():
+    rng = random.Random(3)
+    scenes = [{'script': ' '.join(['w'] * rng.randint(1, 20)), 'image_count': rng.randint(1, 3)}
+              for _ in range(700)]
+    durations = [rng.uniform(0.5, 20) for _ in scenes]
+
+    whole = [timing for _, timing, _ in iter_timeline(scenes, durations)]
+    windowed = [timing for _, timing, _ in iter_timeline(scenes, durations, window=NUMPY_MIN_SCENES)]
+
+    assert whole == windowed
+    assert whole[-1].end == timeline_offset(durations)
+    # Boundaries tile the timeline exactly
+    assert all(a.end == b.start for a, b in zip(whole, whole[1:]))
+    assert all(timing.images[-1][1] == timing.end for timing in whole)
@@ -0,0 +1,38 @@
+"""Audio check tests for verify_audio.py."""
+
+from video_creator.mp3_frames import build_info_frame, parse_frame_header
+from video_creator.verify_audio import check_audio
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames
+FRAME_HEADER = b'\xff\xfb\x90\x00'
+FRAME = FRAME_HEADER + b'\x00' * 413
+
+
+def write_xing_mp3(path, frame_count: int):
+    header = parse_frame_header(FRAME_HEADER)
+    frames = FRAME * frame_count
+    data = build_info_frame(header, frame_count, len(frames), vbr=True) + frames
+    path.write_bytes(data)
+    return data
+
+
+def test_intact_xing_file_passes(tmp_path):
+    path = tmp_path / 'audio_001.mp3'
+    write_xing_mp3(path, 100)
+
+    reason, duration = check_audio(str(path))
+
+    assert reason is None
+    assert duration == 100 * 1152 / 44100
+
+
+def test_truncated_xing_file_is_reported(tmp_path):
+    path = tmp_path / 'audio_001.mp3'
+    data = write_xing_mp3(path, 100)
+    # An interrupted write: the header still announces all 100 frames
+    path.write_bytes(data[:len(data) // 2])
+
+    reason, duration = check_audio(str(path))
+
+    assert reason.startswith('truncated')
+    assert duration is None
@@ -0,0 +1,44 @@
+"""Session and protocol tests for worker.py."""
+
+import json
+import os
+
+from video_creator import worker
+from video_creator.make_synthetic_project import make_project, make_png
+
+
+def test_file_added_during_initial_scan_is_picked_up(tmp_path, monkeypatch):
+    project = str(tmp_path / 'project')
+    make_project(project, 5, missing_images=0, corrupt_images=0)
+    # Folder mtimes can be coarse; make sure the late file changes them
+    for folder in ('images', 'audio'):
+        os.utime(os.path.join(project, folder), ns=(10**18, 10**18))
+    late = os.path.join(project, 'images', 'image_099.png')
+    scan_project = worker.scan_project
+
+    def scan_then_add(folder):
+        index = scan_project(folder)
+        # Lands after the scan, before the session is ready
+        with open(late, 'wb') as f:
+            f.write(make_png())
+        return index
+
+    monkeypatch.setattr(worker, 'scan_project', scan_then_add)
+    session = worker.ProjectSession(project)
+    assert 'image_099.png' not in session.index.images
+
+    session.refresh()
+
+    assert 'image_099.png' in session.index.images
+
+
+def test_failed_request_keeps_serving(tmp_path):
+    w = worker.Worker()
+    missing = json.dumps({'jsonrpc': '2.0', 'id': 1, 'method': 'verify',
+                          'params': {'project_folder': str(tmp_path / 'nope')}})
+    unknown = json.dumps({'jsonrpc': '2.0', 'id': 2, 'method': 'render'})
+
+    assert w.handle(missing)['error']['data'] == 'FileNotFoundError'
+    assert w.handle(unknown)['error']['code'] == worker.METHOD_NOT_FOUND
+    assert w.handle('{oops')['error']['code'] == worker.PARSE_ERROR
+    assert w.running